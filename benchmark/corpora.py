@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试用固定语料
+
+说明：
+- 句子取自 test.py 与各 language 模块 __main__ 中的示例
+- build_corpus 按固定随机种子拼接句子并插入数据集标签，
+  同一参数每次生成完全相同的语料，便于跨提交对比
+"""
+
+import random
+
+
+# 各语言种子句子
+SENTENCES = {
+    "ARE": [
+        "الله يسلمك، وكذلك ما أنسى # أأأ أشكر # أأأ حسن الرئيسي.",
+        "أنااا ٢٠٢٤ اه hello",
+        "<noise> والله ما أدري شو صار [breath] مع الربع",
+    ],
+    "CHN": [
+        "今天 天气不错！！！123",
+        "我们下午三点在会议室开会，请准时参加。",
+        "这个问题一二三，嗯，我再想想。",
+    ],
+    "DEU": [
+        "(Kommentar) Das ist 42!!!",
+        "Ich habe zwei Äpfel und drei Birnen gekauft.",
+        "Wir treffen uns um acht Uhr [lachen] am Bahnhof.",
+    ],
+    "DZA": [
+        "سلام، كيفاش داير؟ بغيت نخرج دابا... شنو غادي نديرو؟",
+        "كما يمتو على عضان [laugh] أنعم إيه.",
+        "هادي ٢٠ درهم، بغيت جوج كيلو ديال الطماطم، ماشي غالية بزاف؟",
+    ],
+    "EGY": [
+        "إزيك يا جماعة ده ١٢٣؟!",
+        "انت عايز ايه من الموضوع ده؟",
+        "مش عارف أقولك ايه والله",
+    ],
+    "IDN": [
+        "Pak mau pergi ga ke kantor １２３?",
+        "Harganya Rp 50000",
+        "Beratnya 2.5 kg dan panjang 100 cm",
+        "Jam 14:30 WIB di Jakarta",
+        "Ehm saya tidak tahu <unk>",
+        "Skrng lg di rmh, blm sdh",
+    ],
+    "IRQ": [
+        "أنا خوش ٢٠٢٢",
+        "شلونك اليوم؟ اااا زين الحمد لله",
+        "رحت للسوق واشتريت ٣ كيلو طماطة",
+    ],
+    "ITA": [
+        "(nota) Questo costa １２３ euro!!!",
+        "Ho comprato due mele e tre pere.",
+        "Ci vediamo alle otto [risata] in stazione.",
+    ],
+    "JPN": [
+        "（テスト）今日は ５ 回目！！！",
+        "明日は三時に会議があります。",
+        "えーと、それは一つ目の問題ですね。",
+    ],
+    "KOR": [
+        "[테스트] 오늘은 삼 번 문제",
+        "내일 오후 세 시에 회의가 있습니다.",
+        "음, 그건 잘 모르겠어요.",
+    ],
+    "MAR": [
+        "سلام، كيفاش داير؟ بغيت نخرج دابا... شنو غادي نديرو؟",
+        "والله ما بغيتش نجي، علاش جيتي متأخر؟ ٣ ساعات وانا نستناك!",
+        "واش گتشوف!! هذا؟ Darija 2025 ??? بزّاف!",
+        "لا والله، صافي كملنا، سمحلي ولكن ما بغيتش هادشي",
+    ],
+    "MYS": [
+        "Hai! Saya sgt suka makan roti canai dlm kg yg brg hrga rm50... 😋",
+        "Tak nak pergi dr kg ke kota, jgn cm org lain yg bkn tahu! ٥ minit lagi",
+        "Brg ini hrga rm50/kg terlalu tinggi, knp harga brg ni sgt mahal? 3kg = 150 ringgit",
+        "Saya tak suka ayamgoreng roticanai, cantikcantik bunga di taman!",
+    ],
+    "PHL": [
+        "Email test@test.com!!! 2024",
+        "Sobraaang saya ko 'yung regalo mo, d'yan ka lang ha?",
+        "Pumunta kami sa palengke kahapon, dalawa ang binili ko.",
+    ],
+    "SAU": [
+        "اللهم صلِّ وسلمْ على سيدِنا محمد، أهلاً وسهلاً",
+        "مبـــروووكـــ يــا شباااب",
+        "يا أخي عندَك أفضل لاعبٍ في آسيا سالم الدوسري",
+    ],
+    "THA": [
+        "วันนี้หนูตื่นตอน 7 โมง",
+        "พี่คะ หนูถึงบ้านแล้วค่าาา~ 555 😂😂",
+        "(เสียงหัวเราะ) ก็แบบว่า หนูตกใจมาก",
+    ],
+    "USA": [
+        "<noise> I paid 123 dollars!!!",
+        "uh I think we should meet at three PERIOD",
+        "Yeah, um, that sounds good to me.",
+    ],
+    "VNM": [
+        "Hoà bình, Thuỷ tinh, Qui Nhơn, Đắk Lắk",
+        "Sale 50%, Check mail, Log in",
+        "Hôm nay trời đẹp quá, mình đi chơi nhé!",
+    ],
+}
+
+# 各数据集的标注标签
+DATASET_TAGS = {
+    None: [],
+    "magicdata": ["[LAUGHTER]", "[SONANT]", "[*]", "+", "[PII]", "[MUSIC]"],
+    "dataocean": ["[breath]", "[cough]", "[laugh]", "#呃", "#erm", "[throat clear]"],
+}
+
+
+def build_corpus(
+    language: str,
+    dataset: str | None = None,
+    size: int = 2000,
+    seed: int = 0,
+) -> list[str]:
+    """
+    生成固定语料
+
+    每条由 1–3 个种子句拼接，并以 30% 概率插入一个数据集标签
+    """
+    rng = random.Random(f"{language}/{dataset}/{seed}")
+    sentences = SENTENCES[language]
+    tags = DATASET_TAGS[dataset]
+
+    corpus = []
+    for _ in range(size):
+        parts = [rng.choice(sentences) for _ in range(rng.randint(1, 3))]
+        if tags and rng.random() < 0.3:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(tags))
+        corpus.append(" ".join(parts))
+    return corpus
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+final_clean 微基准：查表实现 vs 原正则实现
+
+用法（仓库根目录）：
+    python -m benchmark.final_clean
+    python -m benchmark.final_clean --number 200000
+
+按文字类型（阿拉伯 / CJK / 拉丁）分别取 benchmark 语料，
+输出两种实现的每条耗时（微秒）与加速比，并校验输出逐字节一致。
+"""
+
+import argparse
+import timeit
+
+from benchmark.corpora import build_corpus
+from main import _final_clean_regex, final_clean
+
+
+# 文字类型 → 语料来源语言
+SCRIPTS = {
+    "arabic": ["ARE", "EGY", "MAR", "SAU"],
+    "cjk": ["CHN", "JPN", "KOR"],
+    "latin": ["DEU", "IDN", "ITA", "MYS", "USA"],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'script':<8}{'regex us':>10}{'table us':>10}{'speedup':>9}")
+    for script, languages in SCRIPTS.items():
+        texts = []
+        for language in languages:
+            texts.extend(build_corpus(language, "magicdata", size=args.size))
+
+        for text in texts:
+            assert final_clean(text) == _final_clean_regex(text), text
+
+        def run(func):
+            for text in texts:
+                func(text)
+
+        regex_us = min(timeit.repeat(lambda: run(_final_clean_regex), number=args.number, repeat=3))
+        table_us = min(timeit.repeat(lambda: run(final_clean), number=args.number, repeat=3))
+        per_call = 1e6 / (len(texts) * args.number)
+
+        print(
+            f"{script:<8}{regex_us * per_call:>10.2f}{table_us * per_call:>10.2f}"
+            f"{regex_us / table_us:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
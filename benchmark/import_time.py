@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+模块导入耗时基准
+
+用法（仓库根目录）：
+    python -m benchmark.import_time
+    python -m benchmark.import_time --modules language.VNM,language.IDN --repeat 10
+
+每个模块在全新的子进程中测量（避免已导入模块的缓存影响）：
+- import：导入该模块的耗时（已先导入 main，不计入公共部分）
+- first call：首次调用 normalize 的耗时（含延迟加载的第三方库与数据表）
+- main：子进程中 import main 本身的耗时（公共基线）
+
+各项取 --repeat 次中的最小值（毫秒）。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+# 子进程中执行的测量脚本
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+from importlib import import_module
+module = import_module({module!r})
+t2 = time.perf_counter()
+error = None
+try:
+    module.normalize("abc 123")
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+t3 = time.perf_counter()
+print(json.dumps({{"main": t1 - t0, "import": t2 - t1, "first_call": t3 - t2, "error": error}}))
+"""
+
+
+def _modules() -> list[str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    modules = []
+    for package in ("dataset", "language"):
+        for name in sorted(os.listdir(os.path.join(root, package))):
+            if name.endswith(".py") and name != "__init__.py":
+                modules.append(f"{package}.{name[:-3]}")
+    return modules
+
+
+def measure(module: str, repeat: int) -> dict:
+    """
+    在全新子进程中测量 repeat 次，各项取最小值
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best: dict = {}
+    error = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=root, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return {"module": module, "error": lines[-1] if lines else "failed"}
+        row = json.loads(completed.stdout.strip().splitlines()[-1])
+        error = row.pop("error")
+        for key, value in row.items():
+            best[key] = min(value, best.get(key, float("inf")))
+    return {"module": module, **best, "error": error}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", help="逗号分隔的模块路径，默认全部 dataset / language 模块")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="结果写入该 JSON 文件")
+    args = parser.parse_args()
+
+    modules = args.modules.split(",") if args.modules else _modules()
+
+    print(f"{'module':<20}{'import ms':>11}{'first call ms':>15}{'main ms':>10}")
+    results = []
+    for module in modules:
+        row = measure(module, args.repeat)
+        results.append(row)
+        if "import" not in row:
+            print(f"{module:<20}  {row['error']}")
+            continue
+        line = (
+            f"{module:<20}{row['import'] * 1e3:>11.1f}{row['first_call'] * 1e3:>15.1f}"
+            f"{row['main'] * 1e3:>10.1f}"
+        )
+        if row["error"]:
+            line += f"  ({row['error']})"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"written: {args.json}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+正则回溯审计（ReDoS）：找出 language / dataset 模块中随输入长度超线性增长的正则
+
+用法（仓库根目录）：
+    python -m benchmark.redos
+    python -m benchmark.redos --modules language.MYS,language.IDN --max-chars 200000
+    python -m benchmark.redos --json redos.json --strict
+
+收集对象：
+- 模块级编译正则与规则列表（如 MYS 的 NORM_RULES），先完成 _ensure_loaded
+- 函数内临时编译的正则（如 PHL 的 rf"\\b{k}\\b"）：借用 runtime/profiler.py 的 re / regex 代理，
+  对 benchmark 固定语料执行一遍流水线，记录实际编译过的全部正则
+- 按 (引擎, pattern, flags) 去重；标准库 re 与 regex 分别计时
+
+方法：
+- 对每个正则构造对抗输入：通用片段（字母、数字、数字与分隔符、空白、未闭合的括号、
+  各文字字符）与从 pattern 中取出的字面单词，重复到 --screen-chars 个字符，
+  分别以空串与 "!" 结尾（迫使匹配在末尾失败、触发回溯）
+- 筛选：每个输入用 findall 扫描一次（覆盖所有起始位置），取耗时最长的 --fit 个输入
+- 拟合：这些输入从 1000 字符按半个数量级增长到 --max-chars，
+  与 benchmark/scaling.py 相同地拟合 log(耗时) ~ log(字符数) 的斜率，
+  超过 --threshold、单次超过 --timeout 秒或未到 --max-chars 就超过其一半的标记为 SUPERLINEAR
+- 计时以 SIGALRM 限时（见 runtime/budget.py），标准库 re 的回溯同样可以中断
+
+说明：
+- 不含量词的正则（如逐词替换的 \\bword\\b）不计时，直接视为 ok，只计数不逐条输出
+- 最长输入仍不足 1 ms 的正则无法拟合，视为 ok（在该长度内不构成风险）
+- 只能发现对抗片段能触发的回溯；标记为 ok 不代表对任意输入都是线性的
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from typing import Iterable
+
+import regex
+
+from benchmark.corpora import DATASET_TAGS, SENTENCES, build_corpus
+from benchmark.scaling import STEP, fit_slope
+from main import get_normalizer
+from runtime.budget import BudgetExceeded, call_with_timeout
+from runtime.profiler import RuleProfiler
+
+
+# 通用对抗片段
+PUMPS = (
+    "a", "ab", "a ", "aa ", "a-", "a'",
+    "1", "12 ", "1.", "1,", "1.000,", "1:", "1/",
+    " ", "  \t",
+    "[", "[a", "(", "(a", "#", "+", "@", ".", "-", "*", "/",
+    "é", "ء", "ال", "가", "あ", "中", "ก",
+)
+
+# 结尾：空串（全部匹配）/ "!"（在末尾失败）
+SUFFIXES = ("", "!")
+
+# 每个正则从 pattern 中取出的字面单词数上限
+MAX_LITERALS = 4
+
+# 拟合起始长度（字符）
+MIN_CHARS = 1000
+
+_LITERAL_PATTERN = regex.compile(r"(?<!\\)\b[^\W\d_]{2,}")
+
+# 量词：* + {m,n} 与非分组开头的 ?
+_QUANTIFIER_PATTERN = regex.compile(r"(?<!\\)[*+{]|(?<![\\(])\?")
+
+
+def has_quantifier(pattern) -> bool:
+    """
+    pattern 是否含量词；不含量词的正则每个起始位置只做有限次比较，不可能超线性，不必计时
+    """
+    source = pattern.pattern
+    return not isinstance(source, str) or _QUANTIFIER_PATTERN.search(source) is not None
+
+
+class _PatternCollector(RuleProfiler):
+    """
+    借用 RuleProfiler 的模块替换：每个被包装的正则都记录下来
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.patterns: dict[tuple, dict] = {}
+
+    def wrap_pattern(self, owner: str, pattern, name: str | None = None):
+        key = (type(pattern).__module__, pattern.pattern, pattern.flags)
+        entry = self.patterns.get(key)
+        if entry is None:
+            self.patterns[key] = {"owners": [owner], "name": name, "pattern": pattern}
+        elif owner not in entry["owners"]:
+            entry["owners"].append(owner)
+        return super().wrap_pattern(owner, pattern, name)
+
+
+def _pipelines() -> list[tuple[str, str, str | None]]:
+    """
+    审计对象：(模块, language, dataset)；数据集模块搭配 USA
+    """
+    pipelines = [(f"language.{language}", language, None) for language in SENTENCES]
+    pipelines += [
+        (f"dataset.{dataset}", "USA", dataset) for dataset in DATASET_TAGS if dataset is not None
+    ]
+    return pipelines
+
+
+def collect_patterns(modules: Iterable[str] | None = None, size: int = 200) -> list[dict]:
+    """
+    收集模块中的全部正则（模块级 + 执行固定语料时临时编译的）
+
+    返回：
+        [{"owners", "name", "pattern"}, ...]；加载失败的模块跳过并输出到 stderr
+    """
+    wanted = set(modules) if modules else None
+    collector = _PatternCollector()
+
+    for module_path, language, dataset in _pipelines():
+        if wanted is not None and module_path not in wanted:
+            continue
+        try:
+            normalizer = get_normalizer(language, dataset)
+            normalizer.load()
+        except Exception as e:
+            print(f"skip {module_path}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+
+        stage = next(stage for stage in normalizer.stages if stage.name == module_path)
+        with collector.instrument([module_path]):
+            for text in build_corpus(language, dataset, size=size):
+                try:
+                    stage.func(text)
+                except Exception:
+                    continue
+
+    return list(collector.patterns.values())
+
+
+def _inputs(pattern) -> list[tuple[str, str]]:
+    """
+    对抗输入的 (片段, 结尾) 组合：通用片段 + pattern 中的字面单词
+    """
+    source = pattern.pattern if isinstance(pattern.pattern, str) else ""
+    literals = []
+    for word in _LITERAL_PATTERN.findall(source):
+        if word not in literals:
+            literals.append(word)
+    pumps = list(PUMPS)
+    for word in literals[:MAX_LITERALS]:
+        pumps += [word, word + " "]
+    return [(pump, suffix) for pump in pumps for suffix in SUFFIXES]
+
+
+def _make_input(pump: str, suffix: str, chars: int) -> str:
+    return pump * max(1, chars // len(pump)) + suffix
+
+
+def _time_findall(pattern, text: str, timeout: float, repeat: float = 0.02) -> float:
+    """
+    findall 耗时：累计不足 repeat 秒时重复执行取最快一次；超时返回 math.inf
+    """
+    best = math.inf
+    spent = 0.0
+    while best == math.inf or spent < repeat:
+        started = time.perf_counter()
+        try:
+            call_with_timeout(pattern.findall, timeout, text)
+        except BudgetExceeded:
+            return math.inf
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        spent += elapsed
+        if elapsed > 0.01:
+            break
+    return best
+
+
+def _measure(
+    pattern,
+    pump: str,
+    suffix: str,
+    max_chars: int,
+    timeout: float,
+) -> list[tuple[int, float]]:
+    """
+    按半个数量级增大输入计时，返回 [(字符数, 秒), ...]；超时的点耗时为 inf，之后停止
+    """
+    points = []
+    size = float(MIN_CHARS)
+    while size <= max_chars * 1.001:
+        chars = int(size)
+        elapsed = _time_findall(pattern, _make_input(pump, suffix, chars), timeout)
+        points.append((chars, elapsed))
+        if elapsed > timeout / 2:
+            break
+        size *= STEP
+    return points
+
+
+def audit_pattern(
+    pattern,
+    screen_chars: int = 20_000,
+    max_chars: int = 100_000,
+    timeout: float = 1.0,
+    fit: int = 3,
+    threshold: float = 1.25,
+) -> dict:
+    """
+    审计单个编译正则
+
+    返回：
+        {"slope", "verdict", "input", "points"}：slope 为各拟合输入中的最大斜率，
+        input 为对应的 (片段, 结尾)
+    """
+    if not has_quantifier(pattern):
+        return {"slope": None, "verdict": "ok", "input": None, "points": []}
+
+    screened = []
+    for pump, suffix in _inputs(pattern):
+        text = _make_input(pump, suffix, screen_chars)
+        elapsed = _time_findall(pattern, text, timeout, repeat=0.0)
+        screened.append((elapsed, pump, suffix))
+    screened.sort(key=lambda item: item[0], reverse=True)
+
+    worst = {"slope": None, "verdict": "ok", "input": None, "points": []}
+    for _, pump, suffix in screened[:fit]:
+        points = _measure(pattern, pump, suffix, max_chars, timeout)
+        # 超时，或未到 --max-chars 就已接近上限（点数不足以拟合）
+        chars, elapsed = points[-1]
+        if math.isinf(elapsed) or chars * STEP <= max_chars * 1.001:
+            return {
+                "slope": None if math.isinf(elapsed) else fit_slope(points),
+                "verdict": "SUPERLINEAR",
+                "input": [pump, suffix],
+                "points": points,
+            }
+        slope = fit_slope(points)
+        if slope is not None and (worst["slope"] is None or slope > worst["slope"]):
+            worst = {"slope": slope, "verdict": "ok", "input": [pump, suffix], "points": points}
+        elif worst["input"] is None:
+            worst.update(input=[pump, suffix], points=points)
+
+    if worst["slope"] is not None and worst["slope"] > threshold:
+        worst["verdict"] = "SUPERLINEAR"
+    return worst
+
+
+def _label(entry: dict) -> str:
+    pattern = entry["pattern"]
+    text = entry["name"] or (pattern.pattern if isinstance(pattern.pattern, str) else repr(pattern.pattern))
+    return text if len(text) <= 50 else text[:47] + "..."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", help="逗号分隔的模块，如 language.MYS,dataset.magicdata；默认全部")
+    parser.add_argument("--size", type=int, default=200, help="收集临时正则时执行的语料条数")
+    parser.add_argument("--screen-chars", type=int, default=20_000, help="筛选输入长度（字符）")
+    parser.add_argument("--max-chars", type=int, default=100_000, help="拟合最大输入长度（字符）")
+    parser.add_argument("--timeout", type=float, default=1.0, help="单次匹配上限（秒）")
+    parser.add_argument("--fit", type=int, default=3, help="每个正则参与拟合的最慢输入数")
+    parser.add_argument("--threshold", type=float, default=1.25, help="判定超线性的斜率")
+    parser.add_argument("--json", help="结果写入该 JSON 文件")
+    parser.add_argument("--strict", action="store_true", help="存在超线性正则时以状态码 1 退出")
+    args = parser.parse_args()
+
+    modules = args.modules.split(",") if args.modules else None
+    entries = collect_patterns(modules, size=args.size)
+    print(f"patterns: {len(entries)}", file=sys.stderr)
+
+    print(f"{'slope':>7}{'chars':>9}{'seconds':>9}  {'verdict':<12}{'module':<20}pattern  [input]")
+    results = []
+    flagged = []
+    static = 0
+    for entry in entries:
+        pattern = entry["pattern"]
+        if not has_quantifier(pattern):
+            static += 1
+            continue
+        result = audit_pattern(
+            pattern, args.screen_chars, args.max_chars, args.timeout, args.fit, args.threshold,
+        )
+        chars, seconds = result["points"][-1]
+        slope = result["slope"]
+        slope_text = f"{slope:.2f}" if slope is not None else "-"
+        seconds_text = "timeout" if math.isinf(seconds) else f"{seconds:.3f}"
+        owner = entry["owners"][0]
+        print(
+            f"{slope_text:>7}{chars:>9}{seconds_text:>9}  {result['verdict']:<12}{owner:<20}"
+            f"{_label(entry)}  {result['input']!r}"
+        )
+        if result["verdict"] == "SUPERLINEAR":
+            flagged.append(f"{owner}:{_label(entry)}")
+
+        results.append({
+            "modules": entry["owners"],
+            "name": entry["name"],
+            "engine": "re" if type(pattern).__module__ == "re" else "regex",
+            "pattern": pattern.pattern,
+            "flags": pattern.flags,
+            "slope": slope,
+            "verdict": result["verdict"],
+            "input": result["input"],
+            "points": [
+                {"chars": n, "seconds": None if math.isinf(t) else t} for n, t in result["points"]
+            ],
+        })
+
+    print(f"\nwithout quantifiers (skipped): {static}", file=sys.stderr)
+    if flagged:
+        print(f"\nsuperlinear ({len(flagged)}):", file=sys.stderr)
+        for label in flagged:
+            print(f"  {label}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"threshold": args.threshold, "timeout": args.timeout, "results": results},
+                f, ensure_ascii=False, indent=2,
+            )
+        print(f"written: {args.json}", file=sys.stderr)
+
+    if args.strict and flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
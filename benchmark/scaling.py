@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+输入长度伸缩测试：找出随输入长度超线性增长的阶段
+
+用法（仓库根目录）：
+    python -m benchmark.scaling
+    python -m benchmark.scaling --targets language.IDN,probe.PHL.protect_special_content
+    python -m benchmark.scaling --max-bytes 1000000 --budget 2 --json scaling.json
+
+测试对象：
+- 流水线各阶段：dataset.magicdata、dataset.dataocean、每个 language.XXX、final_clean
+- 重点函数（probe）：怀疑为超线性的内部函数，如 IDN 按匹配逐次 text.replace 的
+  _convert_currencies_tsv 等、PHL 按 URL 逐次切片重建的 protect_special_content、
+  MYS 可能回溯的叠词正则 REDUPLICATION_PATTERN
+
+方法：
+- 将该对象对应语言的种子句重复拼接为一条长文本（模拟长会议转写），
+  长度从 100 B 按半个数量级递增到 --max-bytes（默认 10 MB）
+- 在 log(耗时) ~ log(字节数) 上做最小二乘拟合，斜率约 1 为线性，约 2 为平方级；
+  斜率超过 --threshold 的对象标记为 SUPERLINEAR
+- 单次耗时超过 --budget 秒（或按当前斜率预计超过）后停止增大输入，只用已测点拟合
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from importlib import import_module
+from typing import Callable
+
+from benchmark.corpora import SENTENCES, build_corpus
+from main import final_clean, get_normalizer
+
+
+# 参与拟合的最小单次耗时（太短的点受计时噪声影响大）
+MIN_FIT_SECONDS = 1e-3
+
+# 输入长度每步放大倍数（半个数量级）
+STEP = math.sqrt(10)
+
+
+# probe 名称 → (模块, 属性, 额外种子句, 调用方式)
+# 额外种子句保证输入中确实含有该函数处理的内容（金额、日期、URL 等）
+PROBES: dict[str, tuple[str, str, list[str], Callable | None]] = {
+    "probe.IDN._convert_currencies_tsv": (
+        "language.IDN", "_convert_currencies_tsv", ["Harganya Rp 50.000 dan $ 20"], None,
+    ),
+    "probe.IDN._convert_measurements_tsv": (
+        "language.IDN", "_convert_measurements_tsv", ["Beratnya 2.5 kg dan panjang 100 cm"], None,
+    ),
+    "probe.IDN._convert_timezones_tsv": (
+        "language.IDN", "_convert_timezones_tsv", ["Jam 14:30 WIB di Jakarta"], None,
+    ),
+    "probe.IDN._convert_dates": (
+        "language.IDN", "_convert_dates", ["rapat pada (12/05/2024) dan (3/4)"], None,
+    ),
+    "probe.PHL.protect_special_content": (
+        "language.PHL", "protect_special_content",
+        ["Bisitahin https://example.com/page?id=1 o mag-email sa juan@example.com"],
+        lambda func, text: func(text, []),
+    ),
+    "probe.MYS.REDUPLICATION_PATTERN": (
+        "language.MYS", "REDUPLICATION_PATTERN", ["cantikcantik bunga budakbudak"],
+        lambda pattern, text: pattern.sub(r"\1-\1", text),
+    ),
+}
+
+
+def make_text(seeds: list[str], nbytes: int) -> str:
+    """
+    重复拼接种子句，得到约 nbytes 字节（UTF-8）的长文本
+    """
+    block = " ".join(seeds) + " "
+    block_bytes = len(block.encode("utf-8"))
+    repeats = max(1, math.ceil(nbytes / block_bytes))
+    text = block * repeats
+    # 按字符比例截断到目标字节数附近
+    return text[: max(1, len(text) * nbytes // (block_bytes * repeats))]
+
+
+def _targets() -> dict[str, tuple[Callable[[str], object], list[str]]]:
+    """
+    全部测试对象：名称 → (单参数调用函数, 种子句)
+    """
+    targets = {}
+
+    for dataset in ("magicdata", "dataocean"):
+        stage = get_normalizer("USA", dataset).stages[0]
+        targets[stage.name] = (stage.func, build_corpus("USA", dataset, size=20))
+
+    for language in SENTENCES:
+        try:
+            stage = get_normalizer(language).stages[0]
+        except Exception as e:
+            print(f"skip language.{language}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        targets[stage.name] = (stage.func, SENTENCES[language])
+
+    all_sentences = [s for sentences in SENTENCES.values() for s in sentences]
+    targets["final_clean"] = (final_clean, all_sentences)
+
+    for name, (module_path, attr, extra, call) in PROBES.items():
+        try:
+            module = import_module(module_path)
+        except Exception as e:
+            print(f"skip {name}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        obj = getattr(module, attr)
+        language = module_path.rsplit(".", 1)[1]
+        func = obj if call is None else (lambda text, obj=obj, call=call: call(obj, text))
+        targets[name] = (func, SENTENCES[language] + extra)
+
+    return targets
+
+
+def _time_once(func: Callable[[str], object], text: str) -> float:
+    """
+    最快一次耗时：短输入多次取最小，长输入只测一次
+    """
+    best = float("inf")
+    spent = 0.0
+    while spent < 0.2 or best == float("inf"):
+        started = time.perf_counter()
+        try:
+            func(text)
+        except Exception:
+            pass
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        spent += elapsed
+        if elapsed > 0.05:
+            break
+    return best
+
+
+def fit_slope(points: list[tuple[int, float]]) -> float | None:
+    """
+    log(耗时) ~ log(字节数) 最小二乘斜率；有效点不足 3 个时返回 None
+    """
+    points = [(n, t) for n, t in points if t >= MIN_FIT_SECONDS]
+    if len(points) < 3:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov / var if var else None
+
+
+def measure(
+    func: Callable[[str], object],
+    seeds: list[str],
+    min_bytes: int,
+    max_bytes: int,
+    budget: float,
+) -> list[tuple[int, float]]:
+    """
+    按半个数量级递增输入长度计时，返回 [(字节数, 秒), ...]
+    """
+    points = []
+    size = float(min_bytes)
+    while size <= max_bytes * 1.001:
+        nbytes = int(size)
+
+        # 按已测斜率预估本次耗时，超出预算则停止
+        if points:
+            slope = max(1.0, fit_slope(points) or 1.0)
+            last_bytes, last_time = points[-1]
+            if last_time * (nbytes / last_bytes) ** slope > budget:
+                break
+
+        elapsed = _time_once(func, make_text(seeds, nbytes))
+        points.append((nbytes, elapsed))
+        if elapsed > budget:
+            break
+        size *= STEP
+    return points
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", help="逗号分隔的测试对象名称，默认全部")
+    parser.add_argument("--min-bytes", type=int, default=100)
+    parser.add_argument("--max-bytes", type=int, default=10_000_000)
+    parser.add_argument("--budget", type=float, default=5.0, help="单次耗时上限（秒）")
+    parser.add_argument("--threshold", type=float, default=1.25, help="判定超线性的斜率")
+    parser.add_argument("--json", help="结果写入该 JSON 文件")
+    args = parser.parse_args()
+
+    targets = _targets()
+    names = args.targets.split(",") if args.targets else list(targets)
+    unknown = [name for name in names if name not in targets]
+    if unknown:
+        parser.error(f"未知测试对象: {unknown}，可选: {list(targets)}")
+
+    print(f"{'target':<40}{'slope':>7}{'max bytes':>11}{'seconds':>9}  verdict")
+    results = []
+    flagged = []
+    for name in names:
+        func, seeds = targets[name]
+        points = measure(func, seeds, args.min_bytes, args.max_bytes, args.budget)
+        slope = fit_slope(points)
+        if slope is None:
+            verdict = "n/a"
+        elif slope > args.threshold:
+            verdict = "SUPERLINEAR"
+            flagged.append(name)
+        else:
+            verdict = "ok"
+
+        last_bytes, last_time = points[-1]
+        slope_text = f"{slope:.2f}" if slope is not None else "-"
+        print(f"{name:<40}{slope_text:>7}{last_bytes:>11}{last_time:>9.3f}  {verdict}")
+        results.append({
+            "target": name,
+            "slope": slope,
+            "verdict": verdict,
+            "points": [{"bytes": n, "seconds": t} for n, t in points],
+        })
+
+    if flagged:
+        print(f"\nsuperlinear (slope > {args.threshold}): {', '.join(flagged)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"threshold": args.threshold, "results": results}, f, indent=2)
+        print(f"written: {args.json}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
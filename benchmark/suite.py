@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+全组合基准测试：每个 language × (None, magicdata, dataocean)
+
+用法（仓库根目录）：
+    python -m benchmark.suite
+    python -m benchmark.suite --languages IDN,MYS --size 5000 --json results.json
+    python -m benchmark.suite --json new.json --compare old.json
+
+每个组合在固定语料（benchmark/corpora.py，种子句取自 test.py 与各模块 __main__ 示例）上
+逐条调用 get_normalizer 流水线，输出：
+- 吞吐：条/秒、MB/s（按输入 UTF-8 字节数）
+- 单条延迟：p50 / p99（微秒）
+- 失败条数
+
+--json 写出机器可读结果（含 git 提交、Python / regex 版本与运行参数），
+--compare 与之前的 JSON 对比吞吐变化，便于跨提交比较。
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import regex
+
+from benchmark.corpora import DATASET_TAGS, SENTENCES, build_corpus
+from main import get_normalizer
+
+
+def _git_info() -> dict:
+    """
+    当前仓库的提交与是否有未提交修改；不在 git 仓库中时为 None
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=root, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    commit = git("rev-parse", "HEAD")
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": commit, "dirty": bool(status) if status is not None else None}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """
+    最近秩百分位（sorted_values 已升序）
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def bench_combo(
+    language: str,
+    dataset: str | None,
+    size: int,
+    repeat: int,
+) -> dict:
+    """
+    测试单个 (language, dataset) 组合
+
+    - 先完整执行一遍作为预热（导入、正则编译、缓存填充）
+    - 吞吐取 repeat 次中最快的一次，延迟分位数基于全部 repeat 次的单条耗时
+    """
+    texts = build_corpus(language, dataset, size=size)
+    total_bytes = sum(len(text.encode("utf-8")) for text in texts)
+    normalizer = get_normalizer(language, dataset)
+
+    errors = 0
+    for text in texts:
+        try:
+            normalizer(text)
+        except Exception:
+            errors += 1
+
+    perf_counter = time.perf_counter
+    latencies = []
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        for text in texts:
+            call_started = perf_counter()
+            try:
+                normalizer(text)
+            except Exception:
+                pass
+            latencies.append(perf_counter() - call_started)
+        best = min(best, perf_counter() - started)
+
+    latencies.sort()
+    return {
+        "language": language,
+        "dataset": dataset,
+        "utterances": len(texts),
+        "bytes": total_bytes,
+        "errors": errors,
+        "seconds": best,
+        "utts_per_s": len(texts) / best,
+        "mb_per_s": total_bytes / best / 1e6,
+        "p50_us": _percentile(latencies, 50) * 1e6,
+        "p99_us": _percentile(latencies, 99) * 1e6,
+    }
+
+
+def run_suite(
+    languages: list[str],
+    datasets: list[str | None],
+    size: int,
+    repeat: int,
+) -> list[dict]:
+    results = []
+    for language in languages:
+        for dataset in datasets:
+            try:
+                results.append(bench_combo(language, dataset, size, repeat))
+            except Exception as e:
+                # 模块加载失败（如缺少可选依赖）时记录原因，不中断整个测试
+                results.append({
+                    "language": language,
+                    "dataset": dataset,
+                    "error": f"{type(e).__name__}: {e}",
+                })
+    return results
+
+
+def _combo_key(row: dict) -> str:
+    return f"{row['language']}/{row['dataset']}"
+
+
+def _print_table(results: list[dict], baseline: dict[str, dict] | None) -> None:
+    header = (
+        f"{'combo':<16}{'utts/s':>10}{'MB/s':>8}{'p50 us':>9}{'p99 us':>9}{'errors':>7}"
+    )
+    if baseline is not None:
+        header += f"{'vs base':>9}"
+    print(header)
+
+    for row in results:
+        key = _combo_key(row)
+        if "error" in row:
+            print(f"{key:<16}  {row['error']}")
+            continue
+        line = (
+            f"{key:<16}{row['utts_per_s']:>10.0f}{row['mb_per_s']:>8.2f}"
+            f"{row['p50_us']:>9.1f}{row['p99_us']:>9.1f}{row['errors']:>7}"
+        )
+        if baseline is not None:
+            old = baseline.get(key)
+            if old and old.get("utts_per_s"):
+                line += f"{row['utts_per_s'] / old['utts_per_s']:>8.2f}x"
+            else:
+                line += f"{'-':>9}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--languages", default=",".join(SENTENCES))
+    parser.add_argument("--datasets", default="none," + ",".join(d for d in DATASET_TAGS if d))
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="结果写入该 JSON 文件")
+    parser.add_argument("--compare", help="与之前写出的 JSON 结果对比吞吐")
+    args = parser.parse_args()
+
+    languages = args.languages.split(",")
+    datasets = [None if d == "none" else d for d in args.datasets.split(",")]
+
+    results = run_suite(languages, datasets, args.size, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {_combo_key(row): row for row in json.load(f)["results"]}
+
+    _print_table(results, baseline)
+
+    if args.json:
+        report = {
+            "meta": {
+                "git": _git_info(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": sys.version.split()[0],
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "regex": regex.__version__,
+                "size": args.size,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"written: {args.json}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
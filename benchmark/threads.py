@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+线程池后端 vs 进程池后端 基准测试
+
+用法（仓库根目录）：
+    python -m benchmark.threads --jobs 4 --size 5000
+    python -m benchmark.threads --languages ARE,IDN,VNM --dataset magicdata
+
+输出每种语言的串行 / 线程池 / 进程池吞吐（条/秒）及相对串行的加速比。
+进程池在计时前先预热一次，排除进程启动成本。
+"""
+
+import argparse
+import time
+
+from benchmark.corpora import SENTENCES, build_corpus
+from main import normalize_batch
+from runtime.threads import gil_enabled
+
+
+def _throughput(texts, language, dataset, jobs, backend, repeat):
+    """
+    返回最好一次的吞吐（条/秒）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        normalize_batch(texts, language, dataset, jobs=jobs, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--languages", default=",".join(SENTENCES))
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"GIL enabled: {gil_enabled()} | jobs: {args.jobs} | size: {args.size}")
+    print(f"{'lang':<6}{'serial/s':>12}{'thread/s':>12}{'process/s':>12}{'thread x':>10}{'process x':>10}")
+
+    for language in args.languages.split(","):
+        texts = build_corpus(language, args.dataset, size=args.size)
+
+        # 预热：加载模块、启动进程池并让 worker 预加载 Normalizer
+        normalize_batch(texts[:100], language, args.dataset, jobs=args.jobs, chunksize=10)
+        normalize_batch(texts[:100], language, args.dataset, jobs=args.jobs, chunksize=10, backend="thread")
+
+        serial = _throughput(texts, language, args.dataset, 1, "process", args.repeat)
+        thread = _throughput(texts, language, args.dataset, args.jobs, "thread", args.repeat)
+        process = _throughput(texts, language, args.dataset, args.jobs, "process", args.repeat)
+
+        print(
+            f"{language:<6}{serial:>12.0f}{thread:>12.0f}{process:>12.0f}"
+            f"{thread / serial:>10.2f}{process / serial:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
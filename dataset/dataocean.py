@@ -26,6 +26,8 @@ DataOcean 数据集专用文本规范化规则
 
 import regex as re
 
+from runtime.guards import Guard
+
 
 # DataOcean 中的声学事件标签
 DATAOCEAN_EVENT_PATTERN = re.compile(
@@ -45,6 +47,9 @@ DATAOCEAN_EVENT_PATTERN = re.compile(
 # DataOcean 填充词：以 # 开头的连续非空白字符
 FILLER_MARK_PATTERN = re.compile(r"#\S+")
 
+# 触发条件：事件标签以 [ 开头、填充词以 # 开头，不含二者的文本可跳过本阶段
+GUARD = Guard(chars="[#")
+
 
 def normalize(text: str) -> str:
     """
@@ -21,6 +21,8 @@ MagicData 数据集专用文本规范化规则
 
 import regex as re
 
+from runtime.guards import Guard
+
 
 # MagicData 中出现的噪声 / 事件标签正则
 MAGICDATA_PATTERN = re.compile(
@@ -38,6 +40,12 @@ MAGICDATA_PATTERN = re.compile(
     flags=re.IGNORECASE | re.VERBOSE,
 )
 
+# 拼接模式安全：只匹配固定标签字面量，不会跨越行分隔哨兵（见 main.CONCAT_SENTINEL）
+CONCAT_SAFE = True
+
+# 触发条件：所有标签都以 + 或 [ 开头，不含二者的文本可跳过本阶段
+GUARD = Guard(chars="+[")
+
 
 def normalize(text: str) -> str:
     """
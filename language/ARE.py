@@ -1,5 +1,62 @@
 import regex as re
 
+from runtime.guards import Guard, guarded
+
+
+# 预编译正则（模块级编译一次；regex 对 str 匹配时默认释放 GIL，可多线程并发）
+
+# Tashkeel (发音符号)
+# Unicode 范围 U+0617–U+061A (Quranic annotation), U+064B–U+0652 (Standard Tashkeel)
+TASHKEEL_PATTERN = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
+
+# 波斯语字母
+PERSIAN_PE_PATTERN = re.compile('پ')  # Persian Pe to Arabic Ba
+PERSIAN_VE_PATTERN = re.compile('ڤ')  # Persian Ve to Arabic Fa
+
+# Hamza 的各种形式
+HAMZA_ALIF_PATTERN = re.compile(r'[أإآ]')  # Hamza on Alif variants
+HAMZA_WAW_PATTERN = re.compile(r'[ؤ]')     # Hamza on Waw
+HAMZA_YEH_PATTERN = re.compile(r'[ئ]')     # Hamza on Yeh
+
+# 犹豫/思考词（如 "ااا" 或 "أأأ" 等，已统一为 "ا"）
+HESITATION_PATTERN = re.compile(r'ااا+')
+
+# Alef Maksura (ى)
+ALEF_MAKSURA_PATTERN = re.compile(r'ى')
+
+# Tatweel (ـ)
+TATWEEL_PATTERN = re.compile(r'ـ')
+
+# 零宽不连接符 (ZWNJ)
+ZWNJ_PATTERN = re.compile(r'\u200c')
+
+# <> 、[]及其内部的字符（标签）
+# <[^>]*> 匹配 < 和 > 之间的任何内容（不包括 >）
+ANGLE_TAG_PATTERN = re.compile(r'<[^>]*>')
+SQUARE_TAG_PATTERN = re.compile(r'\[[^]]*\]')
+
+# 所有标点符号（Unicode 类别 P）和符号（Unicode 类别 S）
+# \p{P} 匹配所有标点符号
+# \p{S} 匹配所有符号
+PUNCT_PATTERN = re.compile(r'[\p{P}\p{S}]')
+
+# 连续空白
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 东方阿拉伯数字转换为西方阿拉伯数字
+EASTERN_TO_WESTERN_NUMERALS = {
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'
+}
+
+
+@guarded(Guard(chars="".join(EASTERN_TO_WESTERN_NUMERALS)))
+def _convert_numerals(text: str) -> str:
+    """东方阿拉伯数字转换为西方阿拉伯数字（不含东方数字的文本直接跳过）"""
+    for eastern, western in EASTERN_TO_WESTERN_NUMERALS.items():
+        text = text.replace(eastern, western)
+    return text
+
 
 def normalize(text: str) -> str:
     """
@@ -23,55 +80,45 @@ def normalize(text: str) -> str:
         规范化后的文本
     """
     # 移除 Tashkeel (发音符号)
-    # Unicode 范围 U+0617–U+061A (Quranic annotation), U+064B–U+0652 (Standard Tashkeel)
-    patt_tashkeel = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
-    text = re.sub(patt_tashkeel, '', text)
+    text = TASHKEEL_PATTERN.sub('', text)
 
     # 规范化波斯语字母
-    text = re.sub('پ', 'ب', text)  # Persian Pe to Arabic Ba
-    text = re.sub('ڤ', 'ف', text)  # Persian Ve to Arabic Fa
+    text = PERSIAN_PE_PATTERN.sub('ب', text)  # Persian Pe to Arabic Ba
+    text = PERSIAN_VE_PATTERN.sub('ف', text)  # Persian Ve to Arabic Fa
 
     # 规范化 Hamza 的各种形式为 Alif
-    text = re.sub(r'[أإآ]', 'ا', text)  # Hamza on Alif variants
-    text = re.sub(r'[ؤ]', 'و', text)    # Hamza on Waw
-    text = re.sub(r'[ئ]', 'ي', text)    # Hamza on Yeh
+    text = HAMZA_ALIF_PATTERN.sub('ا', text)  # Hamza on Alif variants
+    text = HAMZA_WAW_PATTERN.sub('و', text)   # Hamza on Waw
+    text = HAMZA_YEH_PATTERN.sub('ي', text)   # Hamza on Yeh
 
     # 过滤犹豫/思考词（如 "ااا" 或 "أأأ" 等，已统一为 "ا"）
-    text = re.sub(r'ااا+', '', text)
+    text = HESITATION_PATTERN.sub('', text)
 
     # 规范化 Alef Maksura (ى) 为 Yeh (ي)
-    text = re.sub(r'ى', 'ي', text)
+    text = ALEF_MAKSURA_PATTERN.sub('ي', text)
 
     # 移除 Tatweel (ـ)
-    text = re.sub(r'ـ', '', text)
+    text = TATWEEL_PATTERN.sub('', text)
 
     # 移除零宽不连接符 (ZWNJ)
-    text = re.sub(r'\u200c', '', text)
+    text = ZWNJ_PATTERN.sub('', text)
 
     # 移除 <> 、[]及其内部的字符（标签）
-    # <[^>]*> 匹配 < 和 > 之间的任何内容（不包括 >）
-    text = re.sub(r'<[^>]*>', '', text)
-    text = re.sub(r'\[[^]]*\]', '', text)
+    text = ANGLE_TAG_PATTERN.sub('', text)
+    text = SQUARE_TAG_PATTERN.sub('', text)
     
     # 移除所有标点符号（Unicode 类别 P）和符号（Unicode 类别 S）
-    # \p{P} 匹配所有标点符号
-    # \p{S} 匹配所有符号
-    text = re.sub(r'[\p{P}\p{S}]', '', text)
+    text = PUNCT_PATTERN.sub('', text)
 
     # 东方阿拉伯数字转换为西方阿拉伯数字
-    eastern_to_western_numerals = {
-        '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4', 
-        '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'
-    }
-    for eastern, western in eastern_to_western_numerals.items():
-        text = text.replace(eastern, western)
+    text = _convert_numerals(text)
 
     # 规范化空格（多个空格替换为单个空格，并去除首尾空格）
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
 
     return text
 
 
 if __name__ == "__main__":
     text = "الله يسلمك، وكذلك ما أنسى # أأأ أشكر # أأأ حسن الرئيسي."
-    print(normalize(text))
\ No newline at end of file
+    print(normalize(text))
@@ -72,6 +72,39 @@ def arabic_text_normalize(text):
     return ' '.join(filtered)
 
 
+# 预编译正则（模块级编译一次，避免每次调用都走 regex 的模式缓存查找）
+
+# 指定的阿拉伯 / ASCII 标点
+PUNCT_CHARS_PATTERN = re.compile(r'[\u060C\u061B\u061F\u066A-\u066D\u06D4\.\,\!\?\:\;\-\_\(\)\[\]\"\'\/\\،؛؟…“”«»]')
+
+# Arabic diacritical marks (Fatha, Damma, etc.)
+DIACRITICS_PATTERN = re.compile(r"[\u064B-\u0652]")
+
+# allow only arabics & numbers
+NON_ARABIC_PATTERN = re.compile(r"[^\p{Arabic}0-9]+")
+
+# multiple whitespace characters
+MULTI_SPACE_PATTERN = re.compile(r"\s\s+")
+
+# punctuation and symbols
+PUNCT_SYMBOL_PATTERN = re.compile(r"[\p{P}\p{S}]")
+
+# Normalize Hamzas and Maddas
+PERSIAN_PE_PATTERN = re.compile("پ")
+PERSIAN_VE_PATTERN = re.compile("ڤ")
+ALIF_MADDA_PATTERN = re.compile(r"[آ]")
+ALIF_HAMZA_PATTERN = re.compile(r"[أإ]")
+HAMZA_WAW_PATTERN = re.compile(r"[ؤ]")
+HAMZA_YEH_PATTERN = re.compile(r"[ئ]")
+HAMZA_PATTERN = re.compile(r"[ء]")
+
+# tatweel
+TATWEEL_PATTERN = re.compile(r'\u0640')
+
+# tatweel, and unseen char
+EXTRA_MARKS_PATTERN = re.compile(r'\u0640\u0651\u0653\u0654\u0655\u061C\u066B\u066C\u0671')
+
+
 def normalize(text: str) -> str:
     """
     https://github.com/Natural-Language-Processing-Elm/open_universal_arabic_asr_leaderboard/blob/main/eval.py
@@ -85,20 +118,19 @@ def normalize(text: str) -> str:
     # punctuation = r'[!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~،؛؟]'
     # text = re.sub(punctuation, "", text)
 
-    text = re.sub(r'[\u060C\u061B\u061F\u066A-\u066D\u06D4\.\,\!\?\:\;\-\_\(\)\[\]\"\'\/\\،؛؟…“”«»]', '', text)
+    text = PUNCT_CHARS_PATTERN.sub('', text)
 
     # Remove diacritics
-    diacritics = r"[\u064B-\u0652]"  # Arabic diacritical marks (Fatha, Damma, etc.)
-    text = re.sub(diacritics, "", text)
+    text = DIACRITICS_PATTERN.sub("", text)
     
     # allow only arabics & numbers
-    text = re.sub(r"[^\p{Arabic}0-9]+", " ", text).strip()
+    text = NON_ARABIC_PATTERN.sub(" ", text).strip()
 
     # Normalize multiple whitespace characters into a single space
-    text = re.sub(r"\s\s+", " ", text)
+    text = MULTI_SPACE_PATTERN.sub(" ", text)
 
     # Remove punctuation and symbols
-    text = re.sub(r"[\p{P}\p{S}]", "", text)
+    text = PUNCT_SYMBOL_PATTERN.sub("", text)
 
     """
     Normalize Hamzas and Maddas
@@ -106,15 +138,15 @@ def normalize(text: str) -> str:
     we only adopt it in evaluation,
     instead of training text
     """
-    text = re.sub("پ", "ب", text)
-    text = re.sub("ڤ", "ف", text)
-    text = re.sub(r"[آ]", "ا", text)
-    text = re.sub(r"[أإ]", "ا", text)
-    text = re.sub(r"[ؤ]", "و", text)
-    text = re.sub(r"[ئ]", "ي", text)
-    text = re.sub(r"[ء]", "", text)
+    text = PERSIAN_PE_PATTERN.sub("ب", text)
+    text = PERSIAN_VE_PATTERN.sub("ف", text)
+    text = ALIF_MADDA_PATTERN.sub("ا", text)
+    text = ALIF_HAMZA_PATTERN.sub("ا", text)
+    text = HAMZA_WAW_PATTERN.sub("و", text)
+    text = HAMZA_YEH_PATTERN.sub("ي", text)
+    text = HAMZA_PATTERN.sub("", text)
 
-    text = re.sub(r'\u0640', '', text)      # remove tatweel
+    text = TATWEEL_PATTERN.sub('', text)      # remove tatweel
 
     # Transliterate Eastern Arabic numerals to Western Arabic numerals
     fullwidth_digits = str.maketrans(
@@ -129,7 +161,7 @@ def normalize(text: str) -> str:
     )
     text = text.translate(eastern_arabic_digits)
 
-    text = re.sub(r'\u0640\u0651\u0653\u0654\u0655\u061C\u066B\u066C\u0671', '', text)  
+    text = EXTRA_MARKS_PATTERN.sub('', text)  
     """
     \u0640: tatweel
     \u0651: consonant emphasis
@@ -1,16 +1,18 @@
 import re
-import sys
+import threading
 import unicodedata
 import os
 from typing import Dict, Pattern
 
-# --- 依赖库检查 ---
+from runtime.guards import Guard, guarded
+
+# --- 依赖库 ---
 # num2words库用于数字转印尼语词汇，ASR评测中核心依赖
-try:
-    from num2words import num2words
-except ImportError:
-    print("错误: 未找到库 'num2words'。请执行: pip install num2words")
-    sys.exit(1)
+# 与TSV数据一样在首次调用 normalize 时才加载（见 _ensure_loaded），
+# 导入本模块不产生额外开销；缺少依赖时抛出 ImportError，不退出进程
+REQUIRES = ("num2words",)
+
+num2words = None
 
 # =========================================================================
 # TSV数据加载和初始化
@@ -36,10 +38,71 @@ def _load_tsv(filepath: str) -> Dict[str, str]:
         print(f"警告: 加载TSV文件失败 {filepath}: {e}")
     return mapping
 
-# 从TSV文件加载数据 (基于ref_code/text_process.py逻辑)
-CURRENCY_MAP = _load_tsv(_get_tsv_path('currency.tsv'))
-MEASUREMENT_MAP = _load_tsv(_get_tsv_path('measurements.tsv'))
-TIMEZONE_MAP = _load_tsv(_get_tsv_path('timezones.tsv'))
+# 从TSV文件加载的数据 (基于ref_code/text_process.py逻辑) 及据此构建的正则，
+# 由 _ensure_loaded 在首次使用时填充
+CURRENCY_MAP: Dict[str, str] = {}
+MEASUREMENT_MAP: Dict[str, str] = {}
+TIMEZONE_MAP: Dict[str, str] = {}
+CURRENCY_PATTERN: Pattern | None = None
+MEASUREMENT_PATTERN: Pattern | None = None
+TIMEZONE_PATTERN: Pattern | None = None
+
+_LOADED = False
+_LOAD_LOCK = threading.Lock()
+
+
+def _ensure_loaded() -> None:
+    """
+    按需加载 num2words 与TSV数据，并预编译货币 / 度量衡 / 时区正则（只执行一次）
+
+    异常:
+        ImportError: 未安装 num2words
+    """
+    global num2words, CURRENCY_MAP, MEASUREMENT_MAP, TIMEZONE_MAP
+    global CURRENCY_PATTERN, MEASUREMENT_PATTERN, TIMEZONE_PATTERN, _LOADED
+
+    if _LOADED:
+        return
+
+    with _LOAD_LOCK:
+        if _LOADED:
+            return
+
+        try:
+            from num2words import num2words as _num2words
+        except ImportError as e:
+            raise ImportError("未找到库 'num2words'。请执行: pip install num2words") from e
+
+        currency_map = _load_tsv(_get_tsv_path('currency.tsv'))
+        measurement_map = _load_tsv(_get_tsv_path('measurements.tsv'))
+        timezone_map = _load_tsv(_get_tsv_path('timezones.tsv'))
+
+        # 货币模式 (基于TSV数据中的所有货币符号)
+        currency_symbols = '|'.join(re.escape(symbol) for symbol in currency_map.keys())
+        CURRENCY_PATTERN = re.compile(
+            rf'({currency_symbols})?\s*([\d\.,]+)\s*(ribu|juta|miliar|triliun)?',
+            re.IGNORECASE
+        )
+
+        # 度量衡模式 (基于TSV数据中的所有单位)
+        measurement_symbols = '|'.join(re.escape(symbol) for symbol in measurement_map.keys())
+        MEASUREMENT_PATTERN = re.compile(
+            rf'([\d\.,]+)\s*({measurement_symbols})',
+            re.IGNORECASE
+        )
+
+        # 时区模式
+        timezone_symbols = '|'.join(re.escape(symbol) for symbol in timezone_map.keys())
+        TIMEZONE_PATTERN = re.compile(
+            rf'(\d{{1,2}})[.:](\d{{1,2}})\s+({timezone_symbols})',
+            re.IGNORECASE
+        )
+
+        CURRENCY_MAP = currency_map
+        MEASUREMENT_MAP = measurement_map
+        TIMEZONE_MAP = timezone_map
+        num2words = _num2words
+        _LOADED = True
 
 # =========================================================================
 # 印尼语ASR文本规范化模块
@@ -106,7 +169,13 @@ NUMBER_PATTERN: Pattern = re.compile(r"(\d+)")
 DATE_PATTERN: Pattern = re.compile(r"\((\d{1,2})/(\d{1,2})(?:/(\d+))?\)")
 URL_PATTERN: Pattern = re.compile(r"https?://[^\s]+")
 
+# 各处理函数的触发条件（@guarded）：文本中不含触发字符时函数必为恒等变换，直接跳过
+# - 噪音标签: 以 [ ( { < + * 开头
+# - 货币 / 度量衡 / 时区 / 数字: 至少包含一个数字（[\d.,]+ 中无数字时金额解析失败，原样保留）
+# - 日期: (DD/MM) 格式必须包含 (
+
 
+@guarded(Guard(chars="[({<+*"))
 def _remove_asr_noise(text: str) -> str:
     """
     移除ASR输出中的噪音标记和非语言标签
@@ -166,6 +235,7 @@ def _preprocess_unicode(text: str) -> str:
     return text
 
 
+@guarded(Guard(pattern=r"\d"))
 def _convert_currencies_tsv(text: str) -> str:
     """
     基于TSV数据的货币处理 (集成currency.tsv的35种货币映射)
@@ -182,14 +252,9 @@ def _convert_currencies_tsv(text: str) -> str:
     返回:
         货币转换为印尼语完整表达的文本
     """
-    # 构建货币模式 (基于TSV数据中的所有货币符号)
-    currency_symbols = '|'.join(re.escape(symbol) for symbol in CURRENCY_MAP.keys())
-    currency_pattern = re.compile(
-        rf'({currency_symbols})?\s*([\d\.,]+)\s*(ribu|juta|miliar|triliun)?',
-        re.IGNORECASE
-    )
-
-    currency_matches = currency_pattern.finditer(text)
+    # 货币模式在 _ensure_loaded 中按TSV数据预编译
+    _ensure_loaded()
+    currency_matches = CURRENCY_PATTERN.finditer(text)
 
     for match in currency_matches:
         currency_symbol = match.group(1) or ""
@@ -234,6 +299,7 @@ def _convert_currencies_tsv(text: str) -> str:
     return text
 
 
+@guarded(Guard(pattern=r"\d"))
 def _convert_measurements_tsv(text: str) -> str:
     """
     基于TSV数据的度量衡处理 (集成measurements.tsv的114种单位映射)
@@ -250,14 +316,9 @@ def _convert_measurements_tsv(text: str) -> str:
     返回:
         度量衡转换为印尼语表达的文本
     """
-    # 构建度量衡模式 (基于TSV数据中的所有单位)
-    measurement_symbols = '|'.join(re.escape(symbol) for symbol in MEASUREMENT_MAP.keys())
-    measurement_pattern = re.compile(
-        rf'([\d\.,]+)\s*({measurement_symbols})',
-        re.IGNORECASE
-    )
-
-    measurement_matches = measurement_pattern.finditer(text)
+    # 度量衡模式在 _ensure_loaded 中按TSV数据预编译
+    _ensure_loaded()
+    measurement_matches = MEASUREMENT_PATTERN.finditer(text)
 
     for match in measurement_matches:
         amount_str = match.group(1)
@@ -288,6 +349,7 @@ def _convert_measurements_tsv(text: str) -> str:
     return text
 
 
+@guarded(Guard(pattern=r"\d"))
 def _convert_timezones_tsv(text: str) -> str:
     """
     基于TSV数据的时区处理 (集成timezones.tsv的时区映射)
@@ -304,14 +366,9 @@ def _convert_timezones_tsv(text: str) -> str:
     返回:
         时区转换为印尼语表达的文本
     """
-    # 构建时区模式
-    timezone_symbols = '|'.join(re.escape(symbol) for symbol in TIMEZONE_MAP.keys())
-    timezone_pattern = re.compile(
-        rf'(\d{{1,2}})[.:](\d{{1,2}})\s+({timezone_symbols})',
-        re.IGNORECASE
-    )
-
-    timezone_matches = timezone_pattern.finditer(text)
+    # 时区模式在 _ensure_loaded 中按TSV数据预编译
+    _ensure_loaded()
+    timezone_matches = TIMEZONE_PATTERN.finditer(text)
 
     for match in timezone_matches:
         try:
@@ -344,6 +401,7 @@ def _convert_timezones_tsv(text: str) -> str:
     return text
 
 
+@guarded(Guard(pattern=r"\d"))
 def _convert_numbers(text: str) -> str:
     """
     将文本中的数字转换为印尼语词汇
@@ -371,10 +429,12 @@ def _convert_numbers(text: str) -> str:
         except (ValueError, TypeError):
             return num_str
     
+    _ensure_loaded()
     text = NUMBER_PATTERN.sub(_number_to_indonesian, text)
     return text
 
 
+@guarded(Guard(chars="("))
 def _convert_dates(text: str) -> str:
     """
     处理日期表达式，转换为印尼语日期表达
@@ -389,6 +449,7 @@ def _convert_dates(text: str) -> str:
     返回:
         日期转换为印尼语表达的文本
     """
+    _ensure_loaded()
     date_matches = DATE_PATTERN.finditer(text)
     
     for match in date_matches:
@@ -470,6 +531,9 @@ def normalize(text: str) -> str:
         - measurements.tsv: 114种度量衡单位到印尼语映射
         - timezones.tsv: 印尼语和国际时区映射
     """
+    # 首次调用时加载 num2words 与TSV数据
+    _ensure_loaded()
+
     # 步骤1: 预理检查
     if not text or text.strip() == "":
         return ""
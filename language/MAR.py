@@ -1,5 +1,107 @@
 import regex as re
 
+from runtime.tables import ReplacementTable
+
+
+# 预编译正则（模块级编译一次，避免每次调用都走 regex 的模式缓存查找）
+
+# 指定的阿拉伯 / ASCII 标点
+PUNCT_CHARS_PATTERN = re.compile(r'[\u060C\u061B\u061F\u066A-\u066D\u06D4\.\,\!\?\:\;\-\_\(\)\[\]\"\'\/\\،؛؟…“”«»]')
+
+# Arabic diacritical marks (Fatha, Damma, etc.)
+DIACRITICS_PATTERN = re.compile(r"[\u064B-\u0652]")
+
+# allow only arabics & numbers
+NON_ARABIC_PATTERN = re.compile(r"[^\p{Arabic}0-9]+")
+
+# multiple whitespace characters
+MULTI_SPACE_PATTERN = re.compile(r"\s\s+")
+
+# punctuation and symbols
+PUNCT_SYMBOL_PATTERN = re.compile(r"[\p{P}\p{S}]")
+
+# tatweel, and unseen char
+EXTRA_MARKS_PATTERN = re.compile(r'\u0640\u0651\u0653\u0654\u0655\u061C\u066B\u066C\u0671')
+
+# 摩洛哥方言常见变体统一（持续补充中，越常用越靠前）
+# 这些替换顺序很重要，先处理长的再处理短的
+NORM_MAP = {
+    # 经典阿拉伯语 → 摩洛哥口语常见变形
+    "إن شاء الله": "انشاءالله",
+    "إن شاءالله": "انشاءالله",
+    "ما شاء الله": "ماشاءالله",
+    
+    # 常见缩写/连音
+    "والله": "واللاه", "ولا": "ولاه", "بالله": "بلااه",
+    "علاش": "علاه",   # 很多转写系统写成 علاش
+    "علاش": "علىاش",  # 另一种常见写法也统一
+    
+    # 疑问词统一
+    "اشمن": "شنو", "أشمن": "شنو", "اش": "شنو",
+    "اشناهو": "شنو", "اشنو": "شنو",
+    "علاش": "علاه", "علا ش": "علاه",
+    "فين": "فين",   # 本身就统一
+    "كيفاش": "كيفاه", "كيفاش": "كيفاه",
+    "كيف": "كيفاه",
+    
+    # 常见动词/助动词
+    "غادي": "غادي",  # 保持
+    "بغيت": "بغيت", "بغا": "بغى",
+    "كنت": "كنت", "كان": "كان",
+    
+    # 人称代词后缀统一（非常常见）
+    "ني": "نى", "ني ": "نى ",   # -ni → نى
+    "ك": "ك",                   # -k 保持
+    "ه": "ه", "ها": "ها",       # -ha
+    "نا": "نا",                 # -na
+    
+    # 常见词变形统一（根据实际语料库频率可继续加）
+    "هاد": "هاد", "هادي": "هادي",
+    "دابا": "دابا", "دبا": "دابا",
+    "بزاف": "بزاف", "بزاف": "بزّاف",
+    "شوية": "شوية", "شويّة": "شوية",
+    "واخا": "واخا", "واخا": "واخّا",
+    "صافي": "صافي",
+    "لالّاه": "لا",   # “لا والله” 常被写成 لالاه
+    "سمح": "سمحلي", "سمحلي": "سمحلي",
+    
+
+    # ق often written as گ (Moroccan)
+    "گ": "ق",
+
+    # ڭ → ق (Moroccan letter for /g/)
+    "ڭ": "ق",
+
+    # چ → ش or ك depending on region; 常统一为 ش
+    "چ": "ش",
+
+    # ّ (shadda) often removed
+    "ّ": "",
+
+    # Normalize Alef forms
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+
+    # taa marbuta → ha
+    "ة": "ه",
+
+    # yaa variations
+    "ى": "ي",
+
+    # Common Darija particles
+    "ماغاديش": "ما غاديش",
+    "غادي": "غادي",
+    "بزاف": "بزاف",  # keep
+    "شحال": "شحال",
+    "علاش": "علاش",
+    "فين": "فين",
+    "عافاك": "عافاك",
+}
+
+# 按键长度倒序替换（避免短词先替换导致长词出错）；排序只在模块加载时做一次
+NORM_REPLACEMENTS = ReplacementTable.longest_first(NORM_MAP)
+
 
 def normalize(text: str) -> str:
     """
@@ -14,20 +116,19 @@ def normalize(text: str) -> str:
     # punctuation = r'[!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~،؛؟]'
     # text = re.sub(punctuation, "", text)
 
-    text = re.sub(r'[\u060C\u061B\u061F\u066A-\u066D\u06D4\.\,\!\?\:\;\-\_\(\)\[\]\"\'\/\\،؛؟…“”«»]', '', text)
+    text = PUNCT_CHARS_PATTERN.sub('', text)
 
     # Remove diacritics
-    diacritics = r"[\u064B-\u0652]"  # Arabic diacritical marks (Fatha, Damma, etc.)
-    text = re.sub(diacritics, "", text)
+    text = DIACRITICS_PATTERN.sub("", text)
 
     # allow only arabics & numbers
-    text = re.sub(r"[^\p{Arabic}0-9]+", " ", text).strip()
+    text = NON_ARABIC_PATTERN.sub(" ", text).strip()
 
     # Normalize multiple whitespace characters into a single space
-    text = re.sub(r"\s\s+", " ", text)
+    text = MULTI_SPACE_PATTERN.sub(" ", text)
 
     # Remove punctuation and symbols
-    text = re.sub(r"[\p{P}\p{S}]", "", text)
+    text = PUNCT_SYMBOL_PATTERN.sub("", text)
 
     """
     Normalize Hamzas and Maddas
@@ -56,7 +157,7 @@ def normalize(text: str) -> str:
     )
     text = text.translate(eastern_arabic_digits)
 
-    text = re.sub(r'\u0640\u0651\u0653\u0654\u0655\u061C\u066B\u066C\u0671', '', text)  
+    text = EXTRA_MARKS_PATTERN.sub('', text)  
     """
     \u0640: tatweel
     \u0651: consonant emphasis
@@ -69,85 +170,8 @@ def normalize(text: str) -> str:
     \u0671: Alif Wasla (used in Quran)
     """    
 
-    #    摩洛哥方言常见变体统一（持续补充中，越常用越靠前）
-    #    这些替换顺序很重要，先处理长的再处理短的
-    norm_map = {
-        # 经典阿拉伯语 → 摩洛哥口语常见变形
-        "إن شاء الله": "انشاءالله",
-        "إن شاءالله": "انشاءالله",
-        "ما شاء الله": "ماشاءالله",
-        
-        # 常见缩写/连音
-        "والله": "واللاه", "ولا": "ولاه", "بالله": "بلااه",
-        "علاش": "علاه",   # 很多转写系统写成 علاش
-        "علاش": "علىاش",  # 另一种常见写法也统一
-        
-        # 疑问词统一
-        "اشمن": "شنو", "أشمن": "شنو", "اش": "شنو",
-        "اشناهو": "شنو", "اشنو": "شنو",
-        "علاش": "علاه", "علا ش": "علاه",
-        "فين": "فين",   # 本身就统一
-        "كيفاش": "كيفاه", "كيفاش": "كيفاه",
-        "كيف": "كيفاه",
-        
-        # 常见动词/助动词
-        "غادي": "غادي",  # 保持
-        "بغيت": "بغيت", "بغا": "بغى",
-        "كنت": "كنت", "كان": "كان",
-        
-        # 人称代词后缀统一（非常常见）
-        "ني": "نى", "ني ": "نى ",   # -ni → نى
-        "ك": "ك",                   # -k 保持
-        "ه": "ه", "ها": "ها",       # -ha
-        "نا": "نا",                 # -na
-        
-        # 常见词变形统一（根据实际语料库频率可继续加）
-        "هاد": "هاد", "هادي": "هادي",
-        "دابا": "دابا", "دبا": "دابا",
-        "بزاف": "بزاف", "بزاف": "بزّاف",
-        "شوية": "شوية", "شويّة": "شوية",
-        "واخا": "واخا", "واخا": "واخّا",
-        "صافي": "صافي",
-        "لالّاه": "لا",   # “لا والله” 常被写成 لالاه
-        "سمح": "سمحلي", "سمحلي": "سمحلي",
-        
-
-        # ق often written as گ (Moroccan)
-        "گ": "ق",
-
-        # ڭ → ق (Moroccan letter for /g/)
-        "ڭ": "ق",
-
-        # چ → ش or ك depending on region; 常统一为 ش
-        "چ": "ش",
-
-        # ّ (shadda) often removed
-        "ّ": "",
-
-        # Normalize Alef forms
-        "أ": "ا",
-        "إ": "ا",
-        "آ": "ا",
-
-        # taa marbuta → ha
-        "ة": "ه",
-
-        # yaa variations
-        "ى": "ي",
-
-        # Common Darija particles
-        "ماغاديش": "ما غاديش",
-        "غادي": "غادي",
-        "بزاف": "بزاف",  # keep
-        "شحال": "شحال",
-        "علاش": "علاش",
-        "فين": "فين",
-        "عافاك": "عافاك",
-    }
-    
-    # 按键长度倒序替换（避免短词先替换导致长词出错）
-    for arabic_word, normalized in sorted(norm_map.items(), key=lambda x: len(x[0]), reverse=True):
-        text = text.replace(arabic_word, normalized)
+    # 摩洛哥方言常见变体统一（按键长度倒序替换，顺序在模块加载时确定）
+    text = NORM_REPLACEMENTS(text)
 
     return text
 
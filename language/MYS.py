@@ -62,6 +62,23 @@ VALID_CHARS_PATTERN = re.compile(r"[^\p{Latin}0-9\s]+")
 EASTERN_ARABIC_DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
 FULLWIDTH_DIGITS = str.maketrans("０１２３４５６７８９", "0123456789")
 
+# 缩写 + 拼写变体按长度倒序预编译（按单词边界替换，避免部分匹配）
+NORM_RULES = [
+    (re.compile(rf"\b{re.escape(word)}\b"), normalized)
+    for word, normalized in sorted(
+        {**MALAY_ABBREV_MAP, **MALAY_SPELL_VARIANTS}.items(),
+        key=lambda x: len(x[0]),
+        reverse=True,
+    )
+]
+
+# 其余预编译正则
+WHITESPACE_PATTERN = re.compile(r"\s+")
+REDUPLICATION_PATTERN = re.compile(r"(\b\w+)\1\b")
+RM_AMOUNT_PATTERN = re.compile(r"rm(\d+)")
+RINGGIT_PATTERN = re.compile(r"(\d+) ringgit")
+NUMBER_UNIT_PATTERN = re.compile(r"(\d+)([a-z]+)")
+
 
 def normalize(text: str) -> str:
     """
@@ -92,34 +109,32 @@ def normalize(text: str) -> str:
     text = text.translate(FULLWIDTH_DIGITS)
 
     # Step 4: 清理多余空格（多次清理确保彻底）
-    text = re.sub(r"\s+", " ", text).strip()
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
 
     # Step 5: 统一为小写（马来语大小写不敏感，降低ASR词汇量）
     text = text.lower()
 
     # Step 6: 标准化缩写（按长度倒序替换，避免短词覆盖长词）
-    combined_norm_map = {**MALAY_ABBREV_MAP, **MALAY_SPELL_VARIANTS}
-    for word, normalized in sorted(combined_norm_map.items(), key=lambda x: len(x[0]), reverse=True):
+    for pattern, normalized in NORM_RULES:
         # 按单词边界替换（避免部分匹配，如 "km" 不替换 "kmkm"）
         # 修复原版本直接replace的部分匹配问题
-        pattern = re.compile(rf"\b{re.escape(word)}\b")
         text = pattern.sub(normalized, text)
 
     # Step 7: 修复重复词连字符（马来语核心特征，确保语义不丢失）
     # 匹配连续重复单词（如 "besarbesar" → "besar-besar"）
-    text = re.sub(r"(\b\w+)\1\b", r"\1-\1", text)
+    text = REDUPLICATION_PATTERN.sub(r"\1-\1", text)
 
     # Step 8: 处理货币单位（马来语ASR高频场景）
     # RM → 保留，统一空格（如 "rm50" → "rm 50"）
-    text = re.sub(r"rm(\d+)", r"rm \1", text)
+    text = RM_AMOUNT_PATTERN.sub(r"rm \1", text)
     # "ringgit" → 统一为 "rm"（ASR词汇表统一）
-    text = re.sub(r"(\d+) ringgit", r"rm \1", text)
+    text = RINGGIT_PATTERN.sub(r"rm \1", text)
 
     # Step 9: 处理度量单位（统一空格，如 "2kg" → "2 kg"）
-    text = re.sub(r"(\d+)([a-z]+)", r"\1 \2", text)
+    text = NUMBER_UNIT_PATTERN.sub(r"\1 \2", text)
 
     # Step 10: 最终空格清理
-    text = re.sub(r"\s+", " ", text).strip()
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
 
     return text
 
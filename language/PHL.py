@@ -2,6 +2,8 @@ import re
 import unicodedata
 from typing import Dict, List
 
+from runtime.guards import Guard, guarded
+
 
 # ===============================
 # 菲律宾语数字 → 阿拉伯数字 映射
@@ -61,6 +63,8 @@ def normalize(text: str) -> str:
     return text
 
 
+# 触发条件：URL 以 http 开头，电子邮件必含 @
+@guarded(Guard(literals=("http", "@")))
 def protect_special_content(text: str, protected_spans: List) -> str:
     """保护URL和电子邮件"""
     for pattern in [r'https?://\S+', r'\b[\w.-]+@[\w.-]+\.\w+\b']:
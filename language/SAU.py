@@ -1,5 +1,31 @@
 import regex as re
 
+# 预编译正则（模块级编译一次，避免每次调用都走 regex 的模式缓存查找）
+
+# punctuation and symbols
+PUNCT_SYMBOL_PATTERN = re.compile(r"[\p{P}\p{S}]")
+
+# diacritics
+DIACRITICS_PATTERN = re.compile(r"[\u064b-\u0652]")
+
+# similar chars
+ALIF_PATTERN = re.compile(r"[إأآٱ]")
+ALEF_MAKSURA_PATTERN = re.compile(r"ى")
+TA_MARBUTA_PATTERN = re.compile(r"ة")
+HAMZA_WAW_PATTERN = re.compile(r"ؤ")
+HAMZA_YEH_PATTERN = re.compile(r"ئ]")
+
+# tatweel
+TATWEEL_PATTERN = re.compile(r"ـ")
+
+# whitespace
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 拼接模式安全：全部为字符级替换与空白压缩（不 strip），
+# 不会改写或跨越行分隔哨兵（见 main.CONCAT_SENTINEL）
+CONCAT_SAFE = True
+
+
 # -----------------------------
 # saudi normalization
 # -----------------------------
@@ -8,23 +34,23 @@ def normalize(text: str) -> str:
         return ""
 
     # Remove punctuation
-    text = re.sub(r"[\p{P}\p{S}]", "", text)
+    text = PUNCT_SYMBOL_PATTERN.sub("", text)
 
     # Remove diacritics
-    text = re.sub(r"[\u064b-\u0652]", "", text)
+    text = DIACRITICS_PATTERN.sub("", text)
 
     # Normalize similar chars
-    text = re.sub(r"[إأآٱ]", "ا", text)
-    text = re.sub(r"ى", "ي", text)
-    text = re.sub(r"ة", "ه", text)
-    text = re.sub(r"ؤ", "و", text)
-    text = re.sub(r"ئ]", "ي", text)
+    text = ALIF_PATTERN.sub("ا", text)
+    text = ALEF_MAKSURA_PATTERN.sub("ي", text)
+    text = TA_MARBUTA_PATTERN.sub("ه", text)
+    text = HAMZA_WAW_PATTERN.sub("و", text)
+    text = HAMZA_YEH_PATTERN.sub("ي", text)
 
     # Remove tatweel
-    text = re.sub(r"ـ", "", text)
+    text = TATWEEL_PATTERN.sub("", text)
 
     # Normalize whitespace
-    text = re.sub(r"\s+", " ", text)
+    text = WHITESPACE_PATTERN.sub(" ", text)
 
     return text
 
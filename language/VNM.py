@@ -1,19 +1,47 @@
 import re
-import sys
+import threading
 import unicodedata
 
-# --- 依赖库检查 ---
-try:
-    from underthesea import text_normalize as underthesea_normalize
-except ImportError:
-    print("错误: 未找到库 'underthesea'。请执行: pip install underthesea")
-    sys.exit(1)
+# --- 依赖库 ---
+# underthesea 导入耗时较长，与 num2words 一起在首次调用 normalize 时才加载（见 _ensure_loaded）；
+# 缺少依赖时抛出 ImportError，不退出进程
+REQUIRES = ("underthesea", "num2words")
 
-try:
-    from num2words import num2words
-except ImportError:
-    print("错误: 未找到库 'num2words'。请执行: pip install num2words")
-    sys.exit(1)
+underthesea_normalize = None
+num2words = None
+
+_LOAD_LOCK = threading.Lock()
+
+
+def _ensure_loaded() -> None:
+    """
+    按需加载 underthesea 与 num2words（只执行一次）
+
+    异常:
+        ImportError: 未安装 underthesea 或 num2words
+    """
+    global underthesea_normalize, num2words
+
+    if num2words is not None:
+        return
+
+    with _LOAD_LOCK:
+        if num2words is not None:
+            return
+
+        try:
+            from underthesea import text_normalize as _underthesea_normalize
+        except ImportError as e:
+            raise ImportError("未找到库 'underthesea'。请执行: pip install underthesea") from e
+
+        try:
+            from num2words import num2words as _num2words
+        except ImportError as e:
+            raise ImportError("未找到库 'num2words'。请执行: pip install num2words") from e
+
+        underthesea_normalize = _underthesea_normalize
+        # num2words 最后赋值：非 None 即表示全部加载完成
+        num2words = _num2words
 
 
 def _convert_numbers(text: str) -> str:
@@ -21,6 +49,7 @@ def _convert_numbers(text: str) -> str:
     将文本中的数字转换为越南语读音。
     在转换结果前后添加空格，防止与周围字母粘连 (如 '4G' -> 'bốn g')。
     """
+    _ensure_loaded()
     return re.sub(r"\d+", lambda x: " " + num2words(int(x.group()), lang="vi") + " ", text)
 
 
@@ -58,6 +87,9 @@ def normalize(text: str) -> str:
     4. 数字转文本
     5. 移除标点并转小写
     """
+    # 首次调用时加载依赖库
+    _ensure_loaded()
+
     if not text:
         return ""
 
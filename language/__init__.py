@@ -4,40 +4,21 @@ language 模块入口
 
 职责：
 - 根据三字母语言代码（如 ARE / IRQ / JPN）
-  加载对应语言文件中的 normalize(text) 函数
+  获取对应语言文件中的 normalize(text) 函数
 - 不做 pipeline
 - 不做全局规则
+
+说明：
+- 模块加载统一走 main.get_normalizer 的进程级注册表，
+  这里只返回其中的 language 阶段，不再单独 import
 """
 
-import importlib
 from typing import Callable
 
 
-def _load_language_normalizer(lang_code: str) -> Callable[[str], str]:
-    """
-    动态加载 language/{LANG}.py 中的 normalize 函数
-
-    参数：
-        lang_code (str): 三字母语言代码（已转为大写）
-
-    返回：
-        Callable[[str], str]: normalize 函数
-    """
-    module_path = f"text_norm.language.{lang_code}"
-
-    module = importlib.import_module(module_path)
-
-    if not hasattr(module, "normalize"):
-        raise AttributeError(
-            f"{module_path}.py 必须定义 normalize(text: str) -> str"
-        )
-
-    return module.normalize
-
-
 def get_language_normalizer(lang_code: str) -> Callable[[str], str]:
     """
-    获取指定语言的 normalize 函数
+    获取指定语言的 normalize 函数（仅 language 层，不含 final_clean）
 
     示例：
         normalize = get_language_normalizer("ARE")
@@ -50,7 +31,15 @@ def get_language_normalizer(lang_code: str) -> Callable[[str], str]:
     if len(lang_code) != 3:
         raise ValueError("lang_code 必须是 3 位语言代码，例如 'ARE'")
 
+    # 延迟导入：main 在加载 language.X 时会先导入本包
+    from main import get_normalizer
+
     # 强制使用大写模块名
     lang_code = lang_code.upper()
 
-    return _load_language_normalizer(lang_code)
+    normalizer = get_normalizer(lang_code)
+    for stage in normalizer.stages:
+        if stage.name == f"language.{lang_code}":
+            return stage
+
+    raise LookupError(f"language.{lang_code} 不在流水线中")
@@ -14,10 +14,31 @@ text_norm 主入口文件
 - 标点与空格清理 **只能在最后一步**
 """
 
+# 命令行入口为 python -m runtime.cli；python -m main 直接转交给它。
+# 放在所有导入之前：作为 __main__ 执行时不运行本模块其余部分，
+# 由 runtime.cli 以 main 的名义导入一次（否则同一模块会以两个名字各加载一遍）
+if __name__ == "__main__":
+    import sys
+
+    from runtime.cli import main as _cli_main
+
+    sys.exit(_cli_main())
+
+from collections import OrderedDict
 from importlib import import_module
+from importlib.util import find_spec
+from time import perf_counter
 from typing import Callable
+import sys
+import threading
+
 import regex as re
 
+from runtime.budget import Degraded, default_budget, make_budget
+from runtime.cache import MISSING, make_cache
+from runtime.charclass import build_punct_table
+from runtime.guards import Guard, apply_guard, register_guard
+
 
 # =============================
 # 最终统一清理（最后一步）
@@ -26,6 +47,45 @@ import regex as re
 # Unicode 感知的标点 + 符号正则
 PUNCT_PATTERN = re.compile(r"[\p{P}\p{S}]")
 
+# 连续空白
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 码位分类表：标点 / 符号 → 空格，其余保持不变
+# （与 PUNCT_PATTERN 逐码位一致，首次调用 final_clean 时构建，并缓存在磁盘，见 runtime/charclass.py；
+#  导入 main 时不构建，避免每个进程的导入都付出约 110 万项的建表开销）
+_PUNCT_TABLES = None
+_PUNCT_TABLES_LOCK = threading.Lock()
+
+
+def _punct_tables() -> tuple:
+    """
+    返回 (标点查找表, 空白差异字符正则)，首次调用时构建
+
+    空白差异字符：str.isspace() 与 regex \\s 判断不一致的字符（如 \\x1c-\\x1f）
+    """
+    global _PUNCT_TABLES
+
+    if _PUNCT_TABLES is None:
+        with _PUNCT_TABLES_LOCK:
+            if _PUNCT_TABLES is None:
+                table, mismatch = build_punct_table()
+                pattern = re.compile(
+                    "[" + re.escape(mismatch) + "]" if mismatch else "(?!)"
+                )
+                _PUNCT_TABLES = (table, pattern)
+
+    return _PUNCT_TABLES
+
+
+def _final_clean_regex(text: str) -> str:
+    """
+    final_clean 的正则实现（三遍扫描），作为查表实现的参照与回退路径
+    """
+    text = PUNCT_PATTERN.sub(" ", text)
+    text = text.strip()
+    text = WHITESPACE_PATTERN.sub(" ", text)
+    return text
+
 
 def final_clean(text: str) -> str:
     """
@@ -35,11 +95,52 @@ def final_clean(text: str) -> str:
     1. 删除所有标点和符号字符
     2. 去除首尾空白
     3. 将连续空白压缩为单个空格
+
+    实现：
+    - 查表替换标点 / 符号（str.translate），再按空白切分并以单个空格拼接，
+      均在 C 层线性完成，输出与 _final_clean_regex 逐字节一致
+    - 含空白差异字符时回退到正则实现（差异字符均不可打印，先用 isprintable 预筛）
     """
-    text = PUNCT_PATTERN.sub(" ", text)
-    text = text.strip()
-    text = re.sub(r"\s+", " ", text)
-    return text
+    try:
+        printable = text.isprintable()
+    except AttributeError:
+        # 非 str 输入交给正则实现，保持原有的异常类型
+        return _final_clean_regex(text)
+
+    table, mismatch_pattern = _PUNCT_TABLES or _punct_tables()
+    if not printable and mismatch_pattern.search(text):
+        return _final_clean_regex(text)
+    return " ".join(text.translate(table).split())
+
+
+# =============================
+# 拼接模式（整批文本拼成一个字符串执行）
+# =============================
+
+# 行分隔哨兵：Unicode 私用区字符（类别 Co），
+# 不属于标点 / 符号 / 空白 / 字母数字，声明 CONCAT_SAFE 的阶段不会改写或跨越它
+CONCAT_SENTINEL = "\ue000"
+
+# 哨兵两侧的空白（含 str.strip 视为空白、但 \s 不匹配的 \x1c-\x1f）
+_SENTINEL_EDGE_PATTERN = re.compile(r"[\s\x1c-\x1f]*\ue000[\s\x1c-\x1f]*")
+
+
+def final_clean_joined(text: str) -> str:
+    """
+    final_clean 的拼接模式版本
+
+    text 为多条文本以 CONCAT_SENTINEL 拼接的结果，
+    输出按哨兵切分后与逐条执行 final_clean 完全一致
+    """
+    table, mismatch_pattern = _PUNCT_TABLES or _punct_tables()
+    if not text.isprintable() and mismatch_pattern.search(text):
+        text = PUNCT_PATTERN.sub(" ", text)
+        text = WHITESPACE_PATTERN.sub(" ", text)
+    else:
+        text = " ".join(text.translate(table).split())
+    # 每条文本的首尾空白（等价于逐条 strip）
+    text = _SENTINEL_EDGE_PATTERN.sub(CONCAT_SENTINEL, text)
+    return text.strip()
 
 
 # =============================
@@ -51,15 +152,378 @@ def _load_normalizer(module_path: str) -> Callable[[str], str]:
     动态加载指定模块中的 normalize 函数
 
     参数：
-        module_path (str): 模块路径，如 text_norm.dataset.magicdata
+        module_path (str): 模块路径，如 dataset.magicdata、language.ARE
 
     返回：
         Callable: normalize(text: str) -> str
     """
     module = import_module(module_path)
+
+    if not hasattr(module, "normalize"):
+        raise AttributeError(
+            f"{module_path}.py 必须定义 normalize(text: str) -> str"
+        )
+
     return module.normalize
 
 
+def _check_requires(module_path: str, requires: tuple[str, ...]) -> None:
+    """
+    检查模块声明的第三方依赖（REQUIRES）是否已安装（只查找，不导入）
+
+    依赖较重的模块在首次调用 normalize 时才导入依赖（见模块内 _ensure_loaded），
+    此处提前检查，使缺少依赖的语言在 get_normalizer 时即报错
+    """
+    missing = []
+    for name in requires:
+        try:
+            found = find_spec(name) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            missing.append(name)
+
+    if missing:
+        raise ImportError(
+            f"{module_path} 需要未安装的库: {', '.join(missing)}。"
+            f"请执行: pip install {' '.join(missing)}"
+        )
+
+
+def _load_stage(module_path: str) -> "Stage":
+    """
+    加载模块并构建阶段
+
+    模块可声明 CONCAT_SAFE = True，表示 normalize 可直接作用于
+    以 CONCAT_SENTINEL 拼接的整批文本（不改写、不跨越哨兵，且逐段等价）
+
+    模块可声明 GUARD = Guard(...)，文本不含触发字符时跳过该阶段（见 runtime.guards）
+
+    模块可声明 REQUIRES = ("库名", ...)，缺少时抛出 ImportError
+    """
+    func = _load_normalizer(module_path)
+    module = import_module(module_path)
+    _check_requires(module_path, getattr(module, "REQUIRES", ()))
+    joined = func if getattr(module, "CONCAT_SAFE", False) else None
+    guard = getattr(module, "GUARD", None)
+    if guard is not None:
+        register_guard(module_path, guard)
+    return Stage(module_path, func, joined=joined, guard=guard)
+
+
+# =============================
+# 流水线阶段与 Normalizer 对象
+# =============================
+
+class Stage:
+    """
+    流水线中的单个处理阶段
+
+    属性：
+        name (str): 阶段名称，如 "dataset.magicdata"、"language.ARE"、"final_clean"
+        func (Callable[[str], str]): 该阶段实际执行的函数
+        joined (Callable[[str], str] | None): 拼接模式下对整批拼接字符串执行的函数；
+            None 表示该阶段不支持拼接模式，只能逐条执行
+        guard (Guard | None): 触发条件；设置后 func / joined 均先检查 guard，
+            不满足时原样返回（拼接模式下对整批拼接字符串检查一次）
+    """
+
+    __slots__ = ("name", "func", "joined", "guard")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[str], str],
+        joined: Callable[[str], str] | None = None,
+        guard: Guard | None = None,
+    ):
+        if guard is not None:
+            func = apply_guard(guard, func)
+            if joined is not None:
+                joined = apply_guard(guard, joined)
+        self.name = name
+        self.func = func
+        self.joined = joined
+        self.guard = guard
+
+    def __call__(self, text: str) -> str:
+        return self.func(text)
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+class Normalizer:
+    """
+    文本规范化流水线对象
+
+    与旧版闭包不同：
+    - 同一 (language, dataset) 在进程内只构建一次（见 get_normalizer 注册表）
+    - 可被 pickle：只序列化 (language, dataset)，
+      在 multiprocessing / ProcessPoolExecutor 子进程中按 key 重新获取
+    - stages 列表可直接查看实际执行的阶段
+
+    执行顺序（严格）：
+        1. dataset.normalize（可选）
+        2. language.normalize
+        3. final_clean（标点删除 + 空格压缩）
+    """
+
+    def __init__(self, language: str, dataset: str | None = None):
+        self.language = language
+        self.dataset = dataset
+        self.stages = self._build_stages()
+        # 输出缓存（runtime.cache.LRUCache），None 表示不缓存；见 set_cache
+        self.cache = None
+        # 阶段统计（runtime.stats.PipelineStats），None 表示未开启；见 enable_stats
+        self._stats = None
+        # 单条时间预算（runtime.budget.Budget），None 表示不限制；见 set_budget
+        self._budget = make_budget(default_budget())
+        # 各阶段模块的延迟资源是否已加载；见 load
+        self._loaded = False
+
+    def _build_stages(self) -> list[Stage]:
+        """
+        按固定顺序构建阶段列表
+        """
+        stages = []
+
+        # 如果指定了数据集，则先加载对应的 dataset 规范化函数
+        if self.dataset is not None:
+            stages.append(_load_stage(f"dataset.{self.dataset}"))
+
+        # 加载语言规范化函数
+        stages.append(_load_stage(f"language.{self.language}"))
+
+        # 最后执行统一清理（标点 + 空格）
+        stages.append(Stage("final_clean", final_clean, joined=final_clean_joined))
+
+        return stages
+
+    @property
+    def key(self) -> tuple[str, str | None]:
+        """
+        注册表 key：(language, dataset)
+        """
+        return (self.language, self.dataset)
+
+    def __call__(self, text: str) -> str:
+        """
+        依次执行所有阶段（启用缓存时先查缓存）
+        """
+        cache = self.cache
+        if cache is None or type(text) is not str:
+            return self._run(text)
+
+        result = cache.get(text)
+        if result is MISSING:
+            result = self._run(text)
+            # 降级输出不缓存（见 runtime/budget.py）
+            if type(result) is not Degraded:
+                cache.put(text, result)
+        return result
+
+    def _run(self, text: str) -> str:
+        if self._budget is not None:
+            if not self._loaded:
+                # 延迟加载（导入第三方库、读取数据表）不计入预算：
+                # 导入过程中被中断会在 sys.modules 中留下初始化一半的模块
+                self.load()
+            return self._budget.run(self._run_stages, text)
+        return self._run_stages(text)
+
+    def _run_stages(self, text: str) -> str:
+        if self._stats is not None:
+            return self._run_timed(text)
+        for stage in self.stages:
+            text = stage.func(text)
+        return text
+
+    def _run_timed(self, text: str) -> str:
+        stats = self._stats
+        for stage in self.stages:
+            started = perf_counter()
+            result = stage.func(text)
+            stats.record(stage.name, perf_counter() - started, text, result)
+            text = result
+        return text
+
+    # ---------- 阶段统计 ----------
+
+    def enable_stats(self, detail: bool = False) -> None:
+        """
+        开启阶段统计（已开启时保留已有计数）
+
+        参数：
+            detail (bool): 同时统计各阶段模块内的私有函数（如 IDN 的 _convert_currencies_tsv）
+        """
+        from runtime.stats import PipelineStats
+
+        stats = self._stats or PipelineStats()
+        if detail:
+            stats.restore()
+            for stage in self.stages:
+                if stage.name != "final_clean":
+                    stats.instrument_module(stage.name)
+        self._stats = stats
+
+    def disable_stats(self) -> None:
+        """
+        关闭阶段统计并撤销 detail 模式的函数替换（计数随之丢弃）
+        """
+        stats = self._stats
+        self._stats = None
+        if stats is not None:
+            stats.restore()
+
+    def stats(self) -> dict[str, dict]:
+        """
+        返回各阶段统计
+
+        返回：
+            {阶段名: {"calls", "total", "max", "mean", "chars_in", "chars_out"}}，
+            未开启时为空 dict；guard 跳过次数见 guard_stats()
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.snapshot()
+
+    def reset_stats(self) -> None:
+        """
+        清零阶段统计（不关闭）
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def set_cache(self, cache) -> None:
+        """
+        启用、替换或关闭输出缓存
+
+        参数：
+            cache: True（默认上限）/ int（最多条数）/ runtime.cache.LRUCache / False（关闭）
+                   True / int 与当前缓存的条数上限相同时保留当前缓存（含已缓存结果与计数）
+        """
+        self.cache = make_cache(cache, self.cache)
+
+    # ---------- 时间预算 ----------
+
+    def set_budget(self, budget) -> None:
+        """
+        启用、替换或关闭单条时间预算（见 runtime/budget.py）
+
+        参数：
+            budget: 秒数（float / int）/ runtime.budget.Budget / None、False 或 0（关闭）
+                    超时的调用改走降级路径：只执行 final_clean，输出为 Degraded
+                    秒数与当前预算相同时保留当前预算（含超时计数）
+        """
+        self._budget = make_budget(budget, self._budget)
+
+    def budget_stats(self) -> dict:
+        """
+        返回时间预算计数
+
+        返回：
+            {"budget", "calls", "timeouts", "overruns", "unguarded", "samples"}，
+            未启用时为空 dict
+        """
+        if self._budget is None:
+            return {}
+        return self._budget.snapshot()
+
+    def __reduce__(self):
+        # 子进程中通过 get_normalizer 按 key 重建（命中子进程自己的注册表）
+        return (get_normalizer, self.key)
+
+    def load(self) -> None:
+        """
+        立即加载各阶段模块的延迟资源（第三方库、数据表，见模块内 _ensure_loaded）
+        以及 final_clean 的标点查找表，而不是等到首次调用
+        """
+        for stage in self.stages:
+            if stage.name == "final_clean":
+                _punct_tables()
+                continue
+            ensure_loaded = getattr(import_module(stage.name), "_ensure_loaded", None)
+            if ensure_loaded is not None:
+                ensure_loaded()
+        self._loaded = True
+
+    def _source_modules(self) -> list[str]:
+        """
+        决定本流水线行为的模块：各阶段模块 + final_clean 所在的 main 及其依赖
+        """
+        modules = [stage.name for stage in self.stages if stage.name != "final_clean"]
+        modules += [__name__, "runtime.charclass", "runtime.guards", "runtime.tables"]
+        return modules
+
+    def fingerprint(self) -> str:
+        """
+        流水线指纹：覆盖各阶段模块源码、模块级正则与映射表、引用的 TSV 数据
+        以及第三方依赖版本（详见 runtime/fingerprint.py）
+
+        任一内容变化时指纹随之改变，持久化缓存据此自动失效；
+        按 (language, dataset) 在进程内缓存，规则热更新后需 clear_registry()
+        """
+        from runtime.fingerprint import get_fingerprint
+
+        return get_fingerprint(self.key, self._source_modules())
+
+    def guard_stats(self) -> dict[str, dict]:
+        """
+        返回本流水线各阶段 guard 的调用 / 跳过计数（未声明 guard 的阶段不列出）
+
+        计数挂在 guard 上，同一模块被多个 Normalizer 共用时计数合并
+        """
+        stats = {}
+        for stage in self.stages:
+            guard = stage.guard
+            if guard is None:
+                continue
+            stats[stage.name] = {
+                "calls": guard.calls,
+                "skips": guard.skips,
+                "skip_ratio": guard.skips / guard.calls if guard.calls else 0.0,
+            }
+        return stats
+
+    def __repr__(self) -> str:
+        return f"Normalizer(language={self.language!r}, dataset={self.dataset!r})"
+
+
+# =============================
+# 进程级注册表
+# =============================
+
+# 最多缓存的 (language, dataset) 组合数，超出后淘汰最久未使用的
+REGISTRY_MAXSIZE = 64
+
+_REGISTRY: "OrderedDict[tuple[str, str | None], Normalizer]" = OrderedDict()
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _registry_key(
+    language: str,
+    dataset: str | None = None,
+) -> tuple[str, str | None]:
+    """
+    统一 key 格式：语言代码大写，数据集名称小写
+    """
+    if dataset is not None:
+        dataset = dataset.lower()
+    return (language.upper(), dataset)
+
+
+def clear_registry() -> None:
+    """
+    清空进程级注册表（主要用于测试或热更新规则后重新加载）
+    """
+    with _REGISTRY_LOCK:
+        _REGISTRY.clear()
+
+    if "runtime.fingerprint" in sys.modules:
+        sys.modules["runtime.fingerprint"].clear_fingerprints()
+
+
 # =============================
 # 对外统一接口
 # =============================
@@ -67,52 +531,81 @@ def _load_normalizer(module_path: str) -> Callable[[str], str]:
 def get_normalizer(
     language: str,
     dataset: str | None = None,
-) -> Callable[[str], str]:
+    cache=None,
+    budget=None,
+) -> Normalizer:
     """
-    获取文本规范化函数
+    获取文本规范化对象
 
     执行顺序（严格）：
         1. dataset.normalize（可选）
         2. language.normalize
         3. final_clean（标点删除 + 空格压缩）
 
+    同一 (language, dataset) 在进程内返回同一个 Normalizer 实例，
+    注册表大小受 REGISTRY_MAXSIZE 限制（LRU 淘汰）。
+
     参数：
         language (str): 三字母语言代码，如 "ARE"、"IRQ"
         dataset (str | None): 数据集名称，如 "magicdata"、"dataocean"
+        cache: 输出缓存设置，作用于共享的 Normalizer 实例
+            None          保持当前设置（默认不缓存）
+            True / int    启用 LRU 缓存（默认上限 / 最多条数）
+            LRUCache      使用给定的 runtime.cache.LRUCache
+            False         关闭缓存
+        budget: 单条时间预算（秒），同样作用于共享实例
+            None          保持当前设置（默认读取环境变量 TEXTNORM_BUDGET，未设置时不限制）
+            float / int   每条调用的时间上限，超时改走降级路径（见 runtime/budget.py）
+            False / 0     关闭
 
     返回：
-        Callable[[str], str]: 可直接调用的 normalize 函数
+        Normalizer: 可直接调用的 normalize 对象，normalize(text) -> str
     """
+    key = _registry_key(language, dataset)
 
-    # 语言代码统一转为大写
-    language = language.upper()
+    with _REGISTRY_LOCK:
+        normalizer = _REGISTRY.get(key)
+        if normalizer is not None:
+            _REGISTRY.move_to_end(key)
+        else:
+            normalizer = Normalizer(*key)
+            _REGISTRY[key] = normalizer
 
-    # 加载语言规范化函数
-    language_normalize = _load_normalizer(
-        f"language.{language}"
-    )
+            # 超出上限时淘汰最久未使用的组合
+            while len(_REGISTRY) > REGISTRY_MAXSIZE:
+                _REGISTRY.popitem(last=False)
 
-    # 如果指定了数据集，则加载对应的 dataset 规范化函数
-    dataset_normalize = None
-    if dataset is not None:
-        dataset_normalize = _load_normalizer(
-            f"dataset.{dataset.lower()}"
-        )
+    if cache is not None:
+        normalizer.set_cache(cache)
+    if budget is not None:
+        normalizer.set_budget(budget)
 
-    def normalize(text: str) -> str:
-        """
-        实际执行的文本规范化函数
-        """
-        # 先执行数据集规范化（如果有）
-        if dataset_normalize is not None:
-            text = dataset_normalize(text)
+    return normalizer
 
-        # 再执行语言规范化
-        text = language_normalize(text)
 
-        # 最后执行统一清理（标点 + 空格）
-        text = final_clean(text)
+# =============================
+# 扩展接口（按需加载）
+# =============================
+
+# 批量、并行等执行层接口实现在 runtime 包中，
+# 首次访问时才导入，避免 import main 时引入进程池等开销
+_LAZY_EXPORTS = {
+    "normalize_batch": "runtime.pool",
+    "BatchResult": "runtime.pool",
+    "LRUCache": "runtime.cache",
+    "DiskCache": "runtime.diskcache",
+    "warmup": "runtime.warmup",
+    "normalize_file": "runtime.partition",
+    "normalize_manifest": "runtime.manifest",
+    "normalize_routed": "runtime.routing",
+    "anormalize_stream": "runtime.aio",
+    "normalize_array": "runtime.arrow",
+    "normalize_parquet": "runtime.arrow",
+}
 
-        return text
 
-    return normalize
+def __getattr__(name: str):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module_path), name)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+runtime 模块入口
+
+职责：
+- 存放与规则无关的执行层代码（批量、并行、缓存等）
+- 不包含任何 dataset / language 规则
+- 规则与执行顺序仍由 main.get_normalizer 决定
+
+常用接口通过 main 直接导出，例如：
+    from main import normalize_batch
+"""
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio 流式接口
+
+用途：
+- 基于 asyncio 的数据接入流程中，对异步来源的转写逐块规范化
+
+示例：
+    from main import anormalize_stream
+
+    async for output in anormalize_stream(source, "VNM", jobs=4):
+        ...
+
+做法：
+- 后台任务从来源（异步或普通可迭代对象）拉取文本，攒满 chunksize 条、
+  或来源暂时没有新数据且已等待 max_delay 秒时，把当前块提交到执行器
+- 块在常驻进程池（默认）/ 线程池中执行（见 runtime/pool.py、runtime/threads.py），
+  事件循环只负责调度；流水线加载（如 VNM 的 underthesea）同样在线程中完成，
+  VNM / IDN 等 CPU 密集阶段不会阻塞事件循环
+- 在途块数不超过 inflight，达到上限时暂停拉取来源，内存有上限
+- 按块的提交顺序等待结果，输出顺序与输入一致
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, Iterable
+from typing import AsyncIterator
+
+from main import _registry_key, get_normalizer
+from runtime.pool import _normalize_chunk, _resolve_jobs, _run_chunk, get_pool
+
+
+# 默认块大小与部分块的最长等待时间
+DEFAULT_CHUNKSIZE = 256
+DEFAULT_MAX_DELAY = 0.05
+
+
+def _load(key: tuple) -> None:
+    """
+    在线程中构建并加载 Normalizer（导入规则模块、延迟资源）
+    """
+    get_normalizer(*key).load()
+
+
+# 来源结束标记
+_END = object()
+
+
+async def _next(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+async def _aiter(source):
+    if isinstance(source, AsyncIterable):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+
+async def anormalize_stream(
+    source: AsyncIterable[str] | Iterable[str],
+    language: str,
+    dataset: str | None = None,
+    jobs: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    inflight: int | None = None,
+    max_delay: float | None = DEFAULT_MAX_DELAY,
+    backend: str = "process",
+    errors: str = "record",
+    failures: dict | None = None,
+) -> AsyncIterator[str | None]:
+    """
+    异步逐条产出规范化结果
+
+    参数：
+        source: 异步可迭代对象（async for）或普通可迭代对象
+        language (str): 三字母语言代码
+        dataset (str | None): 数据集名称
+        jobs (int | None): worker 数量；None 或 <= 0 表示 CPU 核数
+        chunksize (int): 每块最多条数
+        inflight (int | None): 同时在途的块数上限，None 表示 2 * jobs
+        max_delay (float | None): 来源暂时没有新数据时，部分块最长等待秒数；None 表示只按条数成块
+        backend (str): "process" 常驻进程池；"thread" 常驻线程池
+                       （线程与事件循环共享 GIL，纯 Python 规则较重时循环响应会变慢）
+        errors (str): "record" 失败行产出 None；"raise" 遇到失败行抛出 RuntimeError
+        failures (dict | None): 传入 dict 时记录失败行 {行号: "异常类型: 信息"}
+
+    产出：
+        与输入顺序一致的规范化结果
+    """
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+    if backend not in ("process", "thread"):
+        raise ValueError("backend 只能是 'process' 或 'thread'")
+
+    loop = asyncio.get_running_loop()
+    key = _registry_key(language, dataset)
+    jobs = _resolve_jobs(jobs)
+    inflight = inflight if inflight and inflight > 0 else 2 * jobs
+    chunksize = max(1, chunksize)
+
+    # 加载可能很慢（导入第三方库、读取数据表），放到线程中执行
+    await loop.run_in_executor(None, _load, key)
+
+    if backend == "thread":
+        from runtime.threads import get_thread_pool
+
+        pool = get_thread_pool(jobs)
+        normalizer = get_normalizer(*key)
+
+        def submit(texts):
+            return asyncio.wrap_future(pool.submit(_normalize_chunk, normalizer, texts))
+    else:
+        pool = get_pool(jobs, keys=[key])
+
+        def submit(texts):
+            return asyncio.wrap_future(pool.submit(_run_chunk, key, 0, texts))
+
+    # 队列中为已提交的块（future），长度上限即在途块数上限
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=inflight)
+
+    async def produce():
+        iterator = _aiter(source)
+        chunk = []
+        deadline = 0.0
+        pending_next = None
+        try:
+            while True:
+                if pending_next is None:
+                    pending_next = loop.create_task(_next(iterator))
+                timeout = None
+                if chunk and max_delay is not None:
+                    # 从块内第一条到达时开始计时
+                    timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait({pending_next}, timeout=timeout)
+                if not done:
+                    # 来源暂时没有新数据：先提交部分块，继续等待同一个 __anext__
+                    await chunks.put(submit(chunk))
+                    chunk = []
+                    continue
+
+                item = pending_next.result()
+                pending_next = None
+                if item is _END:
+                    break
+                if not chunk and max_delay is not None:
+                    deadline = loop.time() + max_delay
+                chunk.append(item)
+                if len(chunk) >= chunksize:
+                    await chunks.put(submit(chunk))
+                    chunk = []
+
+            if chunk:
+                await chunks.put(submit(chunk))
+        except Exception:
+            # 来源抛出异常：通知消费方结束，异常由 await producer 传出
+            await chunks.put(None)
+            raise
+        finally:
+            if pending_next is not None:
+                pending_next.cancel()
+        await chunks.put(None)
+
+    producer = loop.create_task(produce())
+    index = 0
+    try:
+        while True:
+            future = await chunks.get()
+            if future is None:
+                break
+            result = await future
+            outputs, chunk_failures = result if backend == "thread" else result[1:]
+
+            for offset, output in enumerate(outputs):
+                if offset in chunk_failures:
+                    message = chunk_failures[offset]
+                    if errors == "raise":
+                        raise RuntimeError(f"第 {index + offset} 行规范化失败: {message}")
+                    if failures is not None:
+                        failures[index + offset] = message
+                yield output
+            index += len(outputs)
+
+        # 来源本身抛出的异常在这里传给调用方
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+        # 取消尚未开始的块；已在执行的块结果被丢弃
+        while not chunks.empty():
+            future = chunks.get_nowait()
+            if future is not None:
+                future.cancel()
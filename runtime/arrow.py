@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Arrow / Parquet 列式批量规范化（可选后端）
+
+用途：
+- 清单以 Parquet 存储时，直接对字符串列规范化并写回 Parquet
+
+做法：
+- 每个 record batch 先在 Arrow（C++）中 dictionary_encode：
+  重复文本只保留一份，只有字典中的唯一值转换为 Python 字符串
+- 唯一值交给 normalize_batch（共享进程池 / 线程池与 disk_cache），
+  结果构建为新的字典，再用 take 按索引展开回整列，展开在 Arrow 中完成
+- 输入本身是字典列时只规范化字典，索引原样复用，输出仍为字典列
+- normalize_parquet 以 iter_batches 逐批读取、ParquetWriter 逐批写出，内存只与 batch_size 有关
+
+说明：
+- 依赖 pyarrow，未安装时调用各接口抛出 ImportError
+- null 保持为 null；规范化失败的行输出 null（errors="raise" 时抛出异常）
+- 命令行中 .parquet 输入自动走本模块：
+    python -m runtime.cli manifest.parquet -l IDN --field text --output-field norm -o out.parquet
+"""
+
+import time
+from typing import Iterable, Iterator
+
+from main import get_normalizer
+from runtime.dedup import dedup_report
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖
+    pa = None
+
+
+# normalize_parquet 每批读取的行数
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Arrow / Parquet 接口需要 pyarrow，请执行: pip install pyarrow")
+
+
+def _is_string_type(type_) -> bool:
+    return pa.types.is_string(type_) or pa.types.is_large_string(type_)
+
+
+def _normalize_values(
+    values: "pa.Array",
+    language: str,
+    dataset: str | None,
+    errors: str,
+    batch_options: dict,
+) -> tuple["pa.Array", dict]:
+    """
+    规范化一组（已去重的）字符串值
+
+    返回：
+        (同类型的结果数组, {下标: 失败信息})，失败的值为 null
+    """
+    from runtime.pool import normalize_batch
+
+    texts = values.to_pylist()
+    # 字典中不含 null；普通数组中的 null 不参与计算
+    positions = [i for i, text in enumerate(texts) if text is not None]
+    if len(positions) < len(texts):
+        texts = [texts[i] for i in positions]
+
+    result = normalize_batch(texts, language, dataset, errors=errors, **batch_options)
+
+    outputs = [None] * len(values)
+    for position, output in zip(positions, result):
+        outputs[position] = output
+    failures = {positions[i]: message for i, message in result.failures.items()}
+
+    return pa.array(outputs, type=values.type), failures
+
+
+def _normalize_column(
+    column,
+    language: str,
+    dataset: str | None,
+    errors: str,
+    batch_options: dict,
+) -> tuple["pa.Array", dict]:
+    """
+    规范化一列，返回 (结果列, 统计)
+
+    统计：rows / unique / failed / elapsed
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+
+    if pa.types.is_dictionary(column.type):
+        if not _is_string_type(column.type.value_type):
+            raise TypeError(f"只支持字符串列，实际类型: {column.type}")
+        encoded = column
+    elif _is_string_type(column.type):
+        encoded = pc.dictionary_encode(column)
+    else:
+        raise TypeError(f"只支持字符串列，实际类型: {column.type}")
+
+    started = time.perf_counter()
+    dictionary, failures = _normalize_values(
+        encoded.dictionary, language, dataset, errors, batch_options,
+    )
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    if failures:
+        failed_keys = pa.array(list(failures), type=encoded.indices.type)
+        failed = pc.sum(pc.is_in(encoded.indices, value_set=failed_keys)).as_py() or 0
+
+    if pa.types.is_dictionary(column.type):
+        result = pa.DictionaryArray.from_arrays(encoded.indices, dictionary)
+    else:
+        result = dictionary.take(encoded.indices)
+
+    stats = {
+        "rows": len(column),
+        "unique": len(encoded.dictionary),
+        "failed": failed,
+        "elapsed": elapsed,
+    }
+    return result, stats
+
+
+def normalize_array(
+    column,
+    language: str,
+    dataset: str | None = None,
+    errors: str = "record",
+    **batch_options,
+) -> "pa.Array":
+    """
+    规范化一个 Arrow 字符串列
+
+    参数：
+        column: pa.Array / pa.ChunkedArray，类型为 string / large_string 或其字典类型
+        language (str): 三字母语言代码
+        dataset (str | None): 数据集名称
+        errors (str): "record" 失败行输出 null；"raise" 遇到失败行抛出 RuntimeError
+        batch_options: 透传给 normalize_batch，如 jobs、backend、disk_cache、concat
+
+    返回：
+        pa.Array：与输入等长、同类型的结果列
+    """
+    _require_pyarrow()
+    result, _ = _normalize_column(column, language, dataset, errors, batch_options)
+    return result
+
+
+def output_schema(
+    schema: "pa.Schema",
+    column: str,
+    output_column: str | None = None,
+) -> "pa.Schema":
+    """
+    输出 schema：output_column 为 None 或与 column 相同时原地替换，否则在末尾追加同类型的新列
+    """
+    _require_pyarrow()
+    field = schema.field(column)
+    if output_column is None or output_column == column:
+        return schema
+    if output_column in schema.names:
+        index = schema.get_field_index(output_column)
+        return schema.set(index, pa.field(output_column, field.type))
+    return schema.append(pa.field(output_column, field.type))
+
+
+def normalize_batches(
+    batches: Iterable["pa.RecordBatch"],
+    column: str,
+    language: str,
+    dataset: str | None = None,
+    output_column: str | None = None,
+    errors: str = "record",
+    report: dict | None = None,
+    **batch_options,
+) -> Iterator["pa.RecordBatch"]:
+    """
+    逐批规范化 record batch 流中的一列
+
+    参数：
+        column: 输入列名
+        output_column: 输出列名；None 表示原地替换
+        report: 传入 dict 时累加统计（rows / unique / failed / elapsed / batches）
+        其余参数同 normalize_array
+    """
+    _require_pyarrow()
+    schema = None
+    for batch in batches:
+        if schema is None:
+            schema = output_schema(batch.schema, column, output_column)
+
+        result, stats = _normalize_column(
+            batch.column(column), language, dataset, errors, batch_options,
+        )
+
+        arrays = list(batch.columns)
+        target = schema.get_field_index(output_column or column)
+        if target < len(arrays):
+            arrays[target] = result
+        else:
+            arrays.append(result)
+
+        if report is not None:
+            for name, value in stats.items():
+                report[name] = report.get(name, 0) + value
+            report["batches"] = report.get("batches", 0) + 1
+
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def normalize_parquet(
+    source: str,
+    destination: str,
+    column: str,
+    language: str,
+    dataset: str | None = None,
+    output_column: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    errors: str = "record",
+    writer_options: dict | None = None,
+    **batch_options,
+) -> dict:
+    """
+    流式规范化 Parquet 文件中的一列
+
+    参数：
+        source / destination: 输入 / 输出 Parquet 路径
+        column / output_column: 同 normalize_batches
+        batch_size: 每批行数
+        writer_options: 透传给 pq.ParquetWriter，如 compression
+        其余参数同 normalize_array
+
+    返回：
+        dict：rows / unique / failed / batches / seconds / fingerprint / dedup（见 runtime/dedup.py）
+    """
+    _require_pyarrow()
+    started = time.perf_counter()
+    fingerprint = get_normalizer(language, dataset).fingerprint()
+
+    parquet = pq.ParquetFile(source)
+    schema = output_schema(parquet.schema_arrow, column, output_column)
+
+    report: dict = {}
+    with pq.ParquetWriter(destination, schema, **(writer_options or {})) as writer:
+        for batch in normalize_batches(
+            parquet.iter_batches(batch_size=batch_size),
+            column, language, dataset,
+            output_column=output_column,
+            errors=errors,
+            report=report,
+            **batch_options,
+        ):
+            writer.write_batch(batch)
+
+    rows = report.get("rows", 0)
+    unique = report.get("unique", 0)
+    return {
+        "language": language,
+        "dataset": dataset,
+        "fingerprint": fingerprint,
+        "rows": rows,
+        "unique": unique,
+        "failed": report.get("failed", 0),
+        "batches": report.get("batches", 0),
+        "seconds": time.perf_counter() - started,
+        "dedup": dedup_report(rows, unique, report.get("elapsed", 0.0)),
+    }
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+单条调用时间预算（延迟保护）
+
+用途：
+- 在线服务中单条异常转写（超长数字串、未闭合的括号、重复片段等）
+  可能触发规则正则的超线性回溯，一条请求卡住整个 worker
+- 为每次 Normalizer 调用设置时间上限，超时后放弃完整流水线，改走降级路径
+
+降级路径：
+- 只执行 final_clean（标点 / 符号 → 空格、压缩空白）：查表实现，线性时间，
+  不经过任何 dataset / language 规则；输出为 Degraded（str 子类），
+  调用方可用 isinstance(output, Degraded) 识别
+- 降级结果不写入内存缓存与磁盘缓存（负载高时的偶发超时不应被持久化）
+
+做法：
+- 主线程中用 SIGALRM + setitimer 计时：超时时信号处理函数抛出 BudgetExceeded，
+  标准库 re 与 regex 在匹配循环中都会检查信号，正在回溯的正则随之中断
+  （regex 自带的 timeout 参数只覆盖 regex，这里两者统一处理）
+- 非主线程（线程后端、服务端执行器线程）无法接收信号，只计时并统计超时次数，
+  不中断；进程池 worker 在各自的主线程中执行任务，可以中断
+- 已有其他 ITIMER_REAL 计时器时不覆盖，同样只计时
+
+启用方式：
+    get_normalizer("IDN").set_budget(0.5)             # 每条最多 0.5 秒
+    TEXTNORM_BUDGET=0.5 python -m runtime.cli ...     # 环境变量：新建的 Normalizer 默认预算，
+                                                      # 进程池 worker 同样生效
+    normalizer.budget_stats()                         # 调用 / 超时 / 未能中断次数
+
+说明：
+- 只作用于逐条调用（Normalizer.__call__，含 row 模式批量）；
+  拼接 / 向量化模式按块执行阶段，不受预算限制
+- 中断发生在阶段函数内部；各阶段为纯函数，放弃其中间结果不影响后续调用
+- 只计阶段本身的耗时：Normalizer 在首次计时前先完成 load()（导入第三方库、读取数据表），
+  进程池 worker 启动时同样先加载；导入不会被中断，也不会因冷启动被判为超时
+"""
+
+import os
+import signal
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Callable
+
+
+# 环境变量：默认预算秒数（未设置或 <= 0 表示不限制）
+BUDGET_ENV = "TEXTNORM_BUDGET"
+
+# 保留最近若干条超时文本的前缀，便于排查
+SAMPLE_SIZE = 20
+SAMPLE_CHARS = 80
+
+_HAS_ALARM = hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer")
+
+
+class BudgetExceeded(BaseException):
+    """
+    单条调用超出时间预算
+
+    继承 BaseException（与 KeyboardInterrupt 相同）：规则模块中的
+    except Exception（如 IDN 的货币转换）不会把它吞掉
+    """
+
+
+class Degraded(str):
+    """
+    降级路径的输出（内容与普通 str 相同，仅用于标记）
+    """
+
+    __slots__ = ()
+
+
+def default_budget() -> float | None:
+    """
+    读取环境变量 TEXTNORM_BUDGET；未设置、无法解析或 <= 0 时返回 None
+    """
+    value = os.environ.get(BUDGET_ENV)
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def _can_interrupt() -> bool:
+    """
+    当前能否用 SIGALRM 中断：需在主线程中，且没有其他代码设置的计时器
+    """
+    if not _HAS_ALARM or threading.current_thread() is not threading.main_thread():
+        return False
+    return signal.getitimer(signal.ITIMER_REAL)[0] == 0.0
+
+
+class Budget:
+    """
+    时间预算
+
+    参数：
+        seconds (float): 单条调用时间上限（秒）
+        fallback (Callable): 降级函数，接收原始文本；默认为 main.final_clean
+
+    计数：
+        calls       经过预算检查的调用次数
+        timeouts    被中断并改走降级路径的次数
+        overruns    超出预算但无法中断（非主线程等）的次数，结果仍为完整流水线输出
+        unguarded   无法中断的调用次数（不论是否超时）
+    """
+
+    __slots__ = (
+        "seconds", "fallback", "calls", "timeouts", "overruns", "unguarded",
+        "samples", "_armed",
+    )
+
+    def __init__(self, seconds: float, fallback: Callable[[str], str] | None = None):
+        if seconds <= 0:
+            raise ValueError(f"预算必须为正数: {seconds!r}")
+        if fallback is None:
+            from main import final_clean as fallback
+
+        self.seconds = float(seconds)
+        self.fallback = fallback
+        self.calls = 0
+        self.timeouts = 0
+        self.overruns = 0
+        self.unguarded = 0
+        self.samples: deque = deque(maxlen=SAMPLE_SIZE)
+        self._armed = False
+
+    def _on_alarm(self, signum, frame) -> None:
+        # 只在计时区间内抛出，避免迟到的信号打断无关代码
+        if self._armed:
+            self._armed = False
+            raise BudgetExceeded()
+
+    def run(self, func: Callable[[str], str], text: str) -> str:
+        """
+        在预算内执行 func(text)；超时时返回降级结果
+        """
+        self.calls += 1
+
+        if not _can_interrupt():
+            self.unguarded += 1
+            started = perf_counter()
+            result = func(text)
+            if perf_counter() - started > self.seconds:
+                self.overruns += 1
+                self._sample(text)
+            return result
+
+        previous = signal.signal(signal.SIGALRM, self._on_alarm)
+        try:
+            self._armed = True
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+            try:
+                result = func(text)
+            finally:
+                self._armed = False
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except BudgetExceeded:
+            self.timeouts += 1
+            self._sample(text)
+            return Degraded(self.fallback(text))
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+        return result
+
+    def _sample(self, text) -> None:
+        if isinstance(text, str):
+            self.samples.append({"chars": len(text), "prefix": text[:SAMPLE_CHARS]})
+
+    def snapshot(self) -> dict:
+        return {
+            "budget": self.seconds,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "overruns": self.overruns,
+            "unguarded": self.unguarded,
+            "samples": list(self.samples),
+        }
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.timeouts = 0
+        self.overruns = 0
+        self.unguarded = 0
+        self.samples.clear()
+
+    def __repr__(self) -> str:
+        return f"Budget(seconds={self.seconds!r}, calls={self.calls}, timeouts={self.timeouts})"
+
+
+def make_budget(budget, current: Budget | None = None) -> Budget | None:
+    """
+    统一预算参数：None / False / 0 表示不限制，数值为秒数，或直接传入 Budget
+
+    current 为当前挂载的预算：秒数相同时原样保留，
+    以同样参数重复调用 get_normalizer 不会清零超时计数
+    """
+    if budget is None or budget is False:
+        return None
+    if isinstance(budget, Budget):
+        return budget
+    if isinstance(budget, bool) or not isinstance(budget, (int, float)):
+        raise TypeError(f"budget 必须为秒数或 Budget: {budget!r}")
+    if budget <= 0:
+        return None
+    if current is not None and current.seconds == float(budget):
+        return current
+    return Budget(budget)
+
+
+def call_with_timeout(func: Callable, seconds: float, *args):
+    """
+    在主线程中以 SIGALRM 限时执行 func(*args)，超时抛出 BudgetExceeded
+    （供 benchmark/redos.py 等离线工具使用；无法中断时直接执行，不限时）
+    """
+    if not _can_interrupt():
+        return func(*args)
+
+    armed = [True]
+
+    def handler(signum, frame):
+        if armed[0]:
+            armed[0] = False
+            raise BudgetExceeded()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            return func(*args)
+        finally:
+            armed[0] = False
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
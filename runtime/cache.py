@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+内存输出缓存
+
+用途：
+- ASR 语料中大量重复文本（简短应答、提示语、同一参考文本被多个系统重复评分），
+  命中缓存时直接返回结果，不再执行整条流水线
+
+特性：
+- 以输入文本为 key，按条数（maxsize）与估算内存（max_bytes）双重限制
+- LRU 淘汰，记录 hits / misses / evictions
+- 所有操作由锁保护，可在线程后端中共享
+
+启用方式：
+    get_normalizer("IDN", cache=10000)          # 最多 10000 条
+    get_normalizer("IDN", cache=LRUCache(...))  # 自定义上限
+    get_normalizer("IDN", cache=False)          # 关闭
+
+说明：
+- 缓存挂在进程内共享的 Normalizer 实例上，进程池子进程各自独立
+- 只缓存 str 输入的成功结果，异常不缓存
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+# 未命中标记（结果本身可能是空字符串，不能用 None / "" 判断）
+MISSING = object()
+
+# 默认上限
+DEFAULT_MAXSIZE = 100_000
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def _entry_size(key: str, value: str) -> int:
+    """
+    估算一条缓存占用的字节数（key 与 value 的对象大小）
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    线程安全的 LRU 缓存
+
+    参数：
+        maxsize (int): 最多缓存条数
+        max_bytes (int | None): 估算内存上限（字节），None 表示不限
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize 必须为正整数: {maxsize!r}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes 必须为正整数或 None: {max_bytes!r}")
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.currbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=MISSING):
+        """
+        查询缓存；命中时移到最近使用端
+        """
+        with self._lock:
+            value = self._data.get(key, MISSING)
+            if value is MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        """
+        写入缓存；超出条数或内存上限时淘汰最久未使用的条目
+        """
+        size = _entry_size(key, value)
+        # 单条超过内存上限时不缓存
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, MISSING)
+            if old is not MISSING:
+                self.currbytes -= _entry_size(key, old)
+
+            self._data[key] = value
+            self.currbytes += size
+
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self.currbytes > self.max_bytes
+            ):
+                old_key, old_value = self._data.popitem(last=False)
+                self.currbytes -= _entry_size(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        清空缓存条目（计数保留，见 reset_stats）
+        """
+        with self._lock:
+            self._data.clear()
+            self.currbytes = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        返回缓存计数
+
+        返回：
+            dict: size / bytes / hits / misses / evictions / hit_ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "bytes": self.currbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __repr__(self) -> str:
+        return (
+            f"LRUCache(maxsize={self.maxsize}, max_bytes={self.max_bytes}, "
+            f"size={len(self._data)})"
+        )
+
+
+def make_cache(cache, current: "LRUCache | None" = None) -> "LRUCache | None":
+    """
+    将 get_normalizer 的 cache 参数统一为 LRUCache 或 None
+
+    参数：
+        cache: True（默认上限）/ int（最多条数）/ LRUCache 实例 / False（关闭）
+        current: 当前挂载的缓存；cache 为 True / int 且与其条数上限相同时原样保留，
+                 以同样参数重复调用 get_normalizer 不会清空已缓存的结果
+    """
+    if cache is False:
+        return None
+    if cache is True:
+        cache = DEFAULT_MAXSIZE
+    if isinstance(cache, LRUCache):
+        return cache
+    if isinstance(cache, int):
+        if cache <= 0:
+            return None
+        if current is not None and current.maxsize == cache:
+            return current
+        return LRUCache(maxsize=cache)
+    raise TypeError(f"cache 必须为 bool、int 或 LRUCache: {cache!r}")
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+r"""
+码位分类表（供 main.final_clean 使用）
+
+分类内容：
+- 标点 + 符号：与 regex 的 [\p{P}\p{S}] 完全一致（直接用 regex 扫描全部码位得到）
+- 空白：str.isspace() 为真的码位
+- 空白差异字符：str.isspace() 与 regex 的 \s 判断不一致的码位（如 \x1c-\x1f），
+  含这些字符的文本需要回退到正则实现才能保证逐字节一致
+- 文字（Script）：SCRIPT_PATTERNS 中各文字的码位，供按文字路由语言（runtime/routing.py）
+
+缓存：
+- 分类依赖 regex 版本与 Unicode 版本，结果以区间列表写入缓存目录
+  （见 runtime/paths.py），文件名包含版本号，升级后自动重建
+- 缓存目录不可写时只在内存中构建，不影响功能
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unicodedata
+from array import array
+
+import regex as re
+
+from runtime.paths import cache_dir
+
+
+# 缓存文件必须包含的分类（缺少时视为旧版缓存，重新扫描）
+_CLASS_KEYS = ("punct", "space", "space_mismatch", "scripts")
+
+# 文字名称 → regex Script 属性（假名合并为一类，与汉字分开）
+SCRIPT_PATTERNS = {
+    "arabic": r"\p{Script=Arabic}",
+    "hangul": r"\p{Script=Hangul}",
+    "kana": r"[\p{Script=Hiragana}\p{Script=Katakana}]",
+    "han": r"\p{Script=Han}",
+    "thai": r"\p{Script=Thai}",
+    "latin": r"\p{Script=Latin}",
+}
+
+
+def _cache_path() -> str:
+    return os.path.join(
+        cache_dir(),
+        f"charclass-regex{re.__version__}-unicode{unicodedata.unidata_version}.json",
+    )
+
+
+def _to_ranges(codepoints: list[int]) -> list[list[int]]:
+    """
+    有序码位列表 → 闭区间列表
+    """
+    ranges = []
+    for cp in codepoints:
+        if ranges and ranges[-1][1] == cp - 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ranges
+
+
+def _scan() -> dict:
+    """
+    用 regex 扫描全部码位（跳过代理区）
+    """
+    all_chars = "".join(
+        chr(cp) for cp in range(sys.maxunicode + 1) if not 0xD800 <= cp <= 0xDFFF
+    )
+
+    punct = [ord(m.group()) for m in re.finditer(r"[\p{P}\p{S}]", all_chars)]
+    regex_space = {ord(m.group()) for m in re.finditer(r"\s", all_chars)}
+    str_space = {ord(ch) for ch in all_chars if ch.isspace()}
+
+    space_mismatch = sorted(regex_space ^ str_space)
+
+    # final_clean 用 str.isprintable() 做预筛，要求差异字符都不可打印
+    # （空白类字符属于 Unicode 类别 Z* / Cc，按定义不可打印）
+    assert not any(chr(cp).isprintable() for cp in space_mismatch)
+
+    scripts = {
+        name: _to_ranges([ord(m.group()) for m in re.finditer(pattern, all_chars)])
+        for name, pattern in SCRIPT_PATTERNS.items()
+    }
+
+    return {
+        "punct": _to_ranges(punct),
+        "space": _to_ranges(sorted(str_space)),
+        "space_mismatch": space_mismatch,
+        "scripts": scripts,
+    }
+
+
+def _load_classes() -> dict:
+    """
+    读取磁盘缓存，不存在或损坏时重新扫描并写回
+    """
+    path = _cache_path()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            classes = json.load(file)
+        if all(key in classes for key in _CLASS_KEYS):
+            return classes
+    except (OSError, ValueError):
+        pass
+
+    classes = _scan()
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先写临时文件再原子替换，避免多进程同时构建时读到半个文件
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(classes, file)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+    return classes
+
+
+def build_punct_table() -> tuple[array, str]:
+    """
+    构建 str.translate 用的码位表
+
+    返回：
+        (table, space_mismatch)
+        - table: 下标为码位，标点 / 符号映射为空格(32)，其余映射为自身
+        - space_mismatch: 空白差异字符组成的字符串
+    """
+    classes = _load_classes()
+
+    table = array("I", range(sys.maxunicode + 1))
+    for start, end in classes["punct"]:
+        for cp in range(start, end + 1):
+            table[cp] = 32
+
+    space_mismatch = "".join(chr(cp) for cp in classes["space_mismatch"])
+    return table, space_mismatch
+
+
+def load_char_classes() -> dict:
+    """
+    返回码位分类（区间列表形式），供其他查表实现使用
+
+    返回：
+        {"punct": [[start, end], ...], "space": [[start, end], ...],
+         "space_mismatch": [cp, ...], "scripts": {文字: [[start, end], ...]}}
+    """
+    return _load_classes()
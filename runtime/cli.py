@@ -0,0 +1,553 @@
+# -*- coding: utf-8 -*-
+"""
+命令行入口：流式规范化大文件
+
+用法（仓库根目录）：
+    python -m runtime.cli input.txt -l IDN -o output.txt
+    python -m runtime.cli utts.tsv -l IDN -d magicdata --jobs 8 -o utts.norm.tsv
+    python -m runtime.cli utts.jsonl -l VNM --field text --output-field norm -o out.jsonl
+    cat text | python -m runtime.cli - -l USA --format kaldi > text.norm
+
+输入格式（--format，默认按扩展名推断）：
+    txt     每行一条文本
+    tsv     id<TAB>text
+    kaldi   uttid 文本（第一个空白分隔）
+    jsonl   每行一个 JSON 对象，文本取自 --field，结果写入 --output-field
+    parquet 列式文件，规范化 --field 列（见 runtime/arrow.py，需要 pyarrow，仅文件输入输出）
+
+执行方式：
+- 读取、规范化、写出三者重叠：主线程按块读取原始字节行，
+  块提交到常驻进程池 / 线程池（解码、解析、规范化、格式化都在 worker 中完成），
+  写出线程按提交顺序写出结果
+- 在途块数（--inflight）与写出队列长度都有上限，读取会等待，
+  内存占用与文件大小无关，只与块大小和并发数有关
+- 输出顺序与输入一致，行数一一对应
+
+失败行：
+- 空行原样输出；只含空白的行按普通行处理（txt 输出规范化结果，即空串；
+  tsv / kaldi / jsonl 中视为无法解析的行）
+- 规范化失败时文本置空（jsonl 为 null），无法解码 / 解析的行原样输出
+- 失败行数与前若干条原因（行号从 1 开始）输出到 stderr 与 --manifest；
+  --errors raise 时遇到失败行立即终止
+
+对可 mmap 的大文件，--mmap 改为按字节区间分片并行（见 runtime/partition.py）：
+worker 直接读取文件区间，不经管道传递文本。
+
+进度与吞吐（条/秒、MB/s）按 --progress 间隔输出到 stderr。
+--manifest 写出运行清单（含流水线指纹，见 Normalizer.fingerprint），便于追溯结果来源。
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import BinaryIO, Iterator
+
+from main import _registry_key, get_normalizer
+from runtime.pool import _normalize_chunk, _resolve_jobs, get_pool
+
+
+FORMATS = ("txt", "tsv", "kaldi", "jsonl")
+
+# 扩展名 → 格式（未列出的按 txt 处理；Kaldi 的 text 文件通常无扩展名，需显式指定）
+_EXTENSIONS = {
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+# 单块行数与字节数上限（长行自动减少块内行数）
+DEFAULT_CHUNK_LINES = 1000
+MAX_CHUNK_BYTES = 1 << 20
+
+# stderr 与清单中保留的失败原因条数（只计数其余失败，保证内存恒定）
+MAX_FAILURE_SAMPLES = 100
+
+
+def detect_format(path: str) -> str:
+    """
+    按扩展名推断输入格式
+    """
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "txt")
+
+
+# =============================
+# 行解析与格式化（在 worker 中执行）
+# =============================
+
+def parse_line(line: str, fmt: str, field: str) -> tuple[object, str]:
+    """
+    解析一行，返回 (记录, 待规范化文本)
+
+    记录为格式化输出时需要保留的部分：tsv / kaldi 为 id，jsonl 为整个对象，txt 为 None
+    """
+    if fmt == "txt":
+        return None, line
+
+    if fmt == "tsv":
+        key, sep, text = line.partition("\t")
+        if not sep:
+            raise ValueError("缺少制表符分隔的 id")
+        return key, text
+
+    if fmt == "kaldi":
+        parts = line.split(None, 1)
+        if not parts:
+            raise ValueError("缺少 uttid")
+        return parts[0], parts[1] if len(parts) > 1 else ""
+
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("JSON 行不是对象")
+    text = record.get(field)
+    if not isinstance(text, str):
+        raise ValueError(f"字段 {field!r} 缺失或不是字符串")
+    return record, text
+
+
+def render_line(record: object, output: str | None, fmt: str, output_field: str) -> str:
+    """
+    按输入格式写回规范化结果；output 为 None 表示规范化失败
+    """
+    if fmt == "txt":
+        return output or ""
+
+    if fmt == "tsv":
+        return f"{record}\t{output or ''}"
+
+    if fmt == "kaldi":
+        return f"{record} {output}" if output else record
+
+    record[output_field] = output
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _run_lines(
+    key: tuple,
+    start: int,
+    lines: list[bytes],
+    fmt: str,
+    field: str,
+    output_field: str,
+    mode: str = "row",
+) -> tuple[int, bytes, int, dict]:
+    """
+    处理一个块：解码 → 解析 → 规范化 → 格式化 → 编码
+
+    参数：
+        start: 块首行在文件中的行号（从 0 开始）
+
+    返回：
+        (块首行号, 输出字节, 失败行数, {行号(从 1 开始): 原因}（最多 MAX_FAILURE_SAMPLES 条）)
+    """
+    failures = {}
+    records = []
+    texts = []
+    rendered: list[str | None] = []
+    positions = []
+
+    for offset, raw in enumerate(lines):
+        try:
+            line = raw.decode("utf-8")
+            # 空行原样保留，保证行数对应；只含空白的行与其他行一样解析并规范化
+            if not line:
+                rendered.append(line)
+                continue
+            record, text = parse_line(line, fmt, field)
+        except (UnicodeDecodeError, ValueError) as exc:
+            failures[start + offset + 1] = f"{type(exc).__name__}: {exc}"
+            rendered.append(raw.decode("utf-8", "replace"))
+            continue
+        records.append(record)
+        texts.append(text)
+        positions.append(len(rendered))
+        rendered.append(None)
+
+    outputs, chunk_failures = _normalize_chunk(get_normalizer(*key), texts, 0, mode)
+    for index, (position, record, output) in enumerate(zip(positions, records, outputs)):
+        if index in chunk_failures:
+            failures[start + position + 1] = chunk_failures[index]
+        rendered[position] = render_line(record, output, fmt, output_field)
+
+    count = len(failures)
+    if count > MAX_FAILURE_SAMPLES:
+        failures = dict(sorted(failures.items())[:MAX_FAILURE_SAMPLES])
+
+    data = "".join(line + "\n" for line in rendered).encode("utf-8")
+    return start, data, count, failures
+
+
+# =============================
+# 读取与写出
+# =============================
+
+def read_chunks(
+    stream: BinaryIO,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    max_bytes: int = MAX_CHUNK_BYTES,
+) -> Iterator[tuple[int, list[bytes], int]]:
+    """
+    按块读取原始字节行（去掉行尾换行）
+
+    产出：
+        (块首行号, 行列表, 块字节数)
+    """
+    start = 0
+    lines: list[bytes] = []
+    size = 0
+    for raw in stream:
+        size += len(raw)
+        if raw.endswith(b"\n"):
+            raw = raw[:-2] if raw.endswith(b"\r\n") else raw[:-1]
+        lines.append(raw)
+        if len(lines) >= chunk_lines or size >= max_bytes:
+            yield start, lines, size
+            start += len(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield start, lines, size
+
+
+class _Writer(threading.Thread):
+    """
+    写出线程：从有界队列取出字节块按顺序写出
+
+    写出出错时记录异常并继续消费队列，避免主线程在 put 上阻塞
+    """
+
+    def __init__(self, stream: BinaryIO, maxsize: int):
+        super().__init__(name="textnorm-writer", daemon=True)
+        self.stream = stream
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.stream.write(data)
+            except BaseException as exc:
+                self.error = exc
+        if self.error is None:
+            try:
+                self.stream.flush()
+            except BaseException as exc:
+                self.error = exc
+
+
+class _Progress:
+    """
+    stderr 进度与吞吐
+    """
+
+    def __init__(self, interval: float, enabled: bool = True):
+        self.interval = interval
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.lines = 0
+        self.bytes = 0
+        self.failed = 0
+
+    def update(self, lines: int, nbytes: int, failed: int) -> None:
+        self.lines += lines
+        self.bytes += nbytes
+        self.failed += failed
+        if not self.enabled or self.interval <= 0:
+            return
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self._print("progress")
+
+    def _print(self, label: str) -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(
+            f"[{label}] lines={self.lines} failed={self.failed} "
+            f"MB={self.bytes / 1e6:.1f} {self.lines / elapsed:.0f} utts/s "
+            f"{self.bytes / elapsed / 1e6:.2f} MB/s elapsed={elapsed:.1f}s",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def done(self) -> float:
+        if self.enabled:
+            self._print("done")
+        return time.perf_counter() - self.started
+
+
+# =============================
+# 主流程
+# =============================
+
+def normalize_stream(
+    source: BinaryIO,
+    sink: BinaryIO,
+    language: str,
+    dataset: str | None = None,
+    fmt: str = "txt",
+    field: str = "text",
+    output_field: str | None = None,
+    jobs: int | None = None,
+    backend: str = "process",
+    mode: str = "row",
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    inflight: int | None = None,
+    errors: str = "record",
+    progress: float = 2.0,
+    quiet: bool = False,
+) -> dict:
+    """
+    流式规范化：source 中的行 → sink，内存占用有上限
+
+    参数：
+        source / sink: 二进制读 / 写流
+        fmt: 输入格式（见 FORMATS）
+        field / output_field: jsonl 的输入 / 输出字段（输出字段默认覆盖输入字段）
+        jobs: worker 数量；None 或 <= 0 表示 CPU 核数，1 表示在当前进程执行
+        backend: "process" 常驻进程池；"thread" 常驻线程池
+        mode: "row" / "concat" / "vectorize"（见 runtime/pool.py）
+        chunk_lines: 每块行数
+        inflight: 同时在途的块数上限，None 表示 2 * jobs
+        errors: "record" 记录失败行并继续；"raise" 遇到失败行抛出 RuntimeError
+        progress: 进度输出间隔（秒），<= 0 不输出
+        quiet: 不输出进度与汇总
+
+    返回：
+        dict：运行清单（行数、失败、字节数、耗时、流水线指纹等）
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未知格式 {fmt!r}，可选: {FORMATS}")
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+    if backend not in ("process", "thread"):
+        raise ValueError("backend 只能是 'process' 或 'thread'")
+
+    key = _registry_key(language, dataset)
+    normalizer = get_normalizer(*key)
+    fingerprint = normalizer.fingerprint()
+    jobs = _resolve_jobs(jobs)
+    inflight = inflight if inflight and inflight > 0 else 2 * jobs
+    output_field = output_field or field
+
+    if jobs == 1:
+        submit = None
+    elif backend == "thread":
+        from runtime.threads import get_thread_pool
+
+        submit = get_thread_pool(jobs).submit
+    else:
+        submit = get_pool(jobs, keys=[key]).submit
+
+    writer = _Writer(sink, maxsize=max(2, jobs))
+    writer.start()
+    meter = _Progress(progress, enabled=not quiet)
+
+    failed = 0
+    failures: dict[int, str] = {}
+    pending: deque = deque()
+
+    def collect(result, nbytes):
+        nonlocal failed
+        start, data, count, chunk_failures = result
+        if count and errors == "raise":
+            line = min(chunk_failures)
+            raise RuntimeError(f"第 {line} 行规范化失败: {chunk_failures[line]}")
+        failed += count
+        for line, reason in chunk_failures.items():
+            if len(failures) < MAX_FAILURE_SAMPLES:
+                failures[line] = reason
+        writer.queue.put(data)
+        meter.update(data.count(b"\n"), nbytes, count)
+        if writer.error is not None:
+            raise writer.error
+
+    try:
+        for start, lines, nbytes in read_chunks(source, chunk_lines):
+            args = (key, start, lines, fmt, field, output_field, mode)
+            if submit is None:
+                collect(_run_lines(*args), nbytes)
+                continue
+            pending.append((submit(_run_lines, *args), nbytes))
+            # 在途块数达到上限时，按提交顺序等待最早的块，读取随之暂停
+            while len(pending) >= inflight:
+                future, size = pending.popleft()
+                collect(future.result(), size)
+
+        while pending:
+            future, size = pending.popleft()
+            collect(future.result(), size)
+    finally:
+        for future, _ in pending:
+            future.cancel()
+        writer.queue.put(None)
+        writer.join()
+
+    if writer.error is not None:
+        raise writer.error
+
+    seconds = meter.done()
+    if failed and not quiet:
+        print(f"failed lines: {failed}", file=sys.stderr)
+        for line, reason in list(failures.items())[:10]:
+            print(f"  line {line}: {reason}", file=sys.stderr)
+
+    return {
+        "language": key[0],
+        "dataset": key[1],
+        "fingerprint": fingerprint,
+        "format": fmt,
+        "mode": mode,
+        "backend": backend if jobs > 1 else "inline",
+        "jobs": jobs,
+        "lines": meter.lines,
+        "bytes": meter.bytes,
+        "failed": failed,
+        "failures": {str(line): reason for line, reason in failures.items()},
+        "seconds": seconds,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m runtime.cli",
+        description=__doc__.strip().splitlines()[0],
+    )
+    parser.add_argument("input", help="输入文件，- 表示 stdin")
+    parser.add_argument("-o", "--output", default="-", help="输出文件，默认 stdout")
+    parser.add_argument("-l", "--language", required=True, help="三字母语言代码，如 IDN")
+    parser.add_argument("-d", "--dataset", help="数据集名称，如 magicdata")
+    parser.add_argument("--format", choices=("auto",) + FORMATS + ("parquet",), default="auto")
+    parser.add_argument("--field", default="text", help="jsonl 输入字段")
+    parser.add_argument("--output-field", help="jsonl 输出字段，默认覆盖 --field")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker 数量，默认 CPU 核数")
+    parser.add_argument("--backend", choices=("process", "thread"), default="process")
+    parser.add_argument("--mmap", action="store_true", help="按字节区间分片并行（仅文件输入）")
+    parser.add_argument("--parts", type=int, default=None, help="--mmap 的区间数，默认 jobs * 4")
+    parser.add_argument("--mode", choices=("row", "concat", "vectorize"), default="row")
+    parser.add_argument("--chunk-lines", type=int, default=DEFAULT_CHUNK_LINES)
+    parser.add_argument("--inflight", type=int, default=None, help="在途块数上限，默认 2 * jobs")
+    parser.add_argument("--errors", choices=("record", "raise"), default="record")
+    parser.add_argument("--progress", type=float, default=2.0, help="进度输出间隔（秒），0 关闭")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    parser.add_argument("--manifest", help="运行清单写入该 JSON 文件")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt == "auto":
+        fmt = detect_format(args.input) if args.input != "-" else "txt"
+
+    if fmt == "parquet":
+        if args.input == "-" or args.output == "-":
+            parser.error("parquet 需要文件输入与输出")
+        return _main_parquet(args)
+
+    if args.mmap:
+        if args.input == "-":
+            parser.error("--mmap 需要文件输入")
+        if args.backend == "thread":
+            parser.error("--mmap 只支持进程池")
+        return _main_mmap(args, fmt)
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    sink = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        manifest = normalize_stream(
+            source, sink, args.language, args.dataset,
+            fmt=fmt,
+            field=args.field,
+            output_field=args.output_field,
+            jobs=args.jobs,
+            backend=args.backend,
+            mode=args.mode,
+            chunk_lines=args.chunk_lines,
+            inflight=args.inflight,
+            errors=args.errors,
+            progress=args.progress,
+            quiet=args.quiet,
+        )
+    except (ImportError, RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout.buffer:
+            sink.close()
+
+    _write_manifest(args, manifest)
+    return 0
+
+
+def _main_mmap(args: argparse.Namespace, fmt: str) -> int:
+    from runtime.partition import normalize_file
+
+    output = sys.stdout.buffer if args.output == "-" else args.output
+    try:
+        manifest = normalize_file(
+            args.input, output, args.language, args.dataset,
+            fmt=fmt,
+            field=args.field,
+            output_field=args.output_field,
+            jobs=args.jobs,
+            parts=args.parts,
+            mode=args.mode,
+            chunk_lines=args.chunk_lines,
+            errors=args.errors,
+            progress=args.progress,
+            quiet=args.quiet,
+        )
+    except (ImportError, RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    _write_manifest(args, manifest)
+    return 0
+
+
+def _main_parquet(args: argparse.Namespace) -> int:
+    from runtime.arrow import normalize_parquet
+
+    try:
+        manifest = normalize_parquet(
+            args.input, args.output, args.field, args.language, args.dataset,
+            output_column=args.output_field,
+            errors=args.errors,
+            jobs=args.jobs,
+            backend=args.backend,
+            concat=args.mode == "concat",
+            vectorize=args.mode == "vectorize",
+        )
+    except (ImportError, RuntimeError, ValueError, TypeError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(
+            f"[done] rows={manifest['rows']} unique={manifest['unique']} "
+            f"failed={manifest['failed']} elapsed={manifest['seconds']:.1f}s",
+            file=sys.stderr,
+        )
+    _write_manifest(args, manifest)
+    return 0
+
+
+def _write_manifest(args: argparse.Namespace, manifest: dict) -> None:
+    if args.manifest:
+        manifest.update(input=args.input, output=args.output)
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+规范化服务客户端（见 runtime/server.py）
+
+特性：
+- 只依赖标准库，不导入 main 与规则模块，在线 worker 中导入几乎无开销
+- 同步阻塞调用，一个连接可反复使用；也可在多个线程中各自创建客户端
+- normalize_many 一次请求发送多条文本，服务端与其他请求合并为微批
+
+示例：
+    from runtime.client import NormalizeClient
+
+    with NormalizeClient(unix_path="/tmp/textnorm.sock") as client:
+        client.normalize("Harganya Rp 50.000", "IDN")
+        client.normalize_many(["...", "..."], "IDN", "magicdata")
+        client.metrics()
+"""
+
+import itertools
+import json
+import socket
+
+
+class NormalizeError(RuntimeError):
+    """
+    服务端返回的错误（请求无效、语言模块加载失败或单条规范化失败）
+    """
+
+
+class NormalizeClient:
+    """
+    参数：
+        unix_path (str | None): Unix socket 路径；为 None 时连接 host:port
+        host / port: TCP 地址
+        timeout (float | None): 单次请求超时秒数
+    """
+
+    def __init__(
+        self,
+        unix_path: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        timeout: float | None = 30.0,
+    ):
+        if unix_path is not None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = unix_path
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (host, port)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        self._file = self._sock.makefile("rb")
+        self._ids = itertools.count(1)
+
+    def _call(self, request: dict) -> dict:
+        rid = next(self._ids)
+        request["id"] = rid
+        self._sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        # 同一连接上同步调用，响应按请求顺序返回；id 不符说明连接状态异常
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("服务端关闭了连接")
+        response = json.loads(line)
+        if response.get("id") != rid:
+            raise NormalizeError(f"响应 id 不匹配: {response.get('id')!r} != {rid!r}")
+        return response
+
+    def normalize(self, text: str, language: str, dataset: str | None = None) -> str:
+        """
+        规范化单条文本；失败时抛出 NormalizeError
+        """
+        response = self._call({"language": language, "dataset": dataset, "text": text})
+        if "error" in response:
+            raise NormalizeError(response["error"])
+        return response["output"]
+
+    def normalize_many(
+        self,
+        texts: list[str],
+        language: str,
+        dataset: str | None = None,
+    ) -> tuple[list, dict]:
+        """
+        规范化多条文本
+
+        返回：
+            (outputs, failures)：失败行输出为 None，failures 为 {行号: 原因}
+        """
+        response = self._call({"language": language, "dataset": dataset, "texts": list(texts)})
+        if "error" in response:
+            raise NormalizeError(response["error"])
+        failures = {int(i): message for i, message in response.get("errors", {}).items()}
+        return response["outputs"], failures
+
+    def metrics(self) -> dict:
+        return self._call({"op": "metrics"})["metrics"]
+
+    def ping(self) -> bool:
+        return bool(self._call({"op": "ping"}).get("ok"))
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        finally:
+            self._sock.close()
+
+    def __enter__(self) -> "NormalizeClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+拼接执行模式
+
+原理：
+- 将一批文本以 main.CONCAT_SENTINEL 拼接成一个字符串
+- 声明支持拼接模式的阶段（Stage.joined 不为 None）对整串只执行一次，
+  省去每条文本的 Python 调用与正则启动开销
+- 不支持的阶段按哨兵切回逐条执行，之后再重新拼接
+- 最后按哨兵切分得到每条结果
+
+安全措施：
+- 输入中含哨兵字符或非 str 时整批回退为逐条执行
+- 切分后条数不一致、或任一阶段抛出异常时整批回退为逐条执行
+- verify_joined 对比两种模式的输出，用于新增 CONCAT_SAFE 声明时自检
+
+用法（仓库根目录）：
+    python -m runtime.concat                     # 用 benchmark 语料校验所有组合
+    python -m runtime.concat --languages SAU --datasets magicdata
+"""
+
+import argparse
+from typing import Sequence
+
+from main import CONCAT_SENTINEL, Normalizer, get_normalizer
+from runtime.pool import _normalize_rows
+
+
+def _joinable(texts: Sequence[str]) -> bool:
+    """
+    所有输入都是 str 且不含哨兵字符
+    """
+    for text in texts:
+        if type(text) is not str or CONCAT_SENTINEL in text:
+            return False
+    return True
+
+
+def _run_joined(normalizer: Normalizer, texts: Sequence[str]) -> list[str] | None:
+    """
+    按阶段在“整串”与“逐条”两种形态之间切换执行
+
+    返回：
+        输出列表；结构异常（条数不一致）时返回 None
+    """
+    rows = list(texts)
+    joined = None
+
+    for stage in normalizer.stages:
+        if stage.joined is not None:
+            if joined is None:
+                joined = CONCAT_SENTINEL.join(rows)
+            joined = stage.joined(joined)
+        else:
+            if joined is not None:
+                rows = joined.split(CONCAT_SENTINEL)
+                joined = None
+            rows = [stage.func(text) for text in rows]
+
+    if joined is not None:
+        rows = joined.split(CONCAT_SENTINEL)
+
+    if len(rows) != len(texts):
+        return None
+    return rows
+
+
+def normalize_joined(
+    normalizer: Normalizer,
+    texts: Sequence[str],
+    start: int = 0,
+) -> tuple[list, dict]:
+    """
+    拼接模式执行一批文本
+
+    返回：
+        (outputs, failures)，与 runtime.pool._normalize_rows 相同；
+        无法使用拼接模式时自动回退为逐条执行
+    """
+    if texts and _joinable(texts):
+        try:
+            outputs = _run_joined(normalizer, texts)
+        except Exception:
+            outputs = None
+        if outputs is not None:
+            return outputs, {}
+
+    return _normalize_rows(normalizer, texts, start)
+
+
+def joined_stages(normalizer: Normalizer) -> list[str]:
+    """
+    返回支持拼接模式的阶段名称
+    """
+    return [stage.name for stage in normalizer.stages if stage.joined is not None]
+
+
+def verify_joined(
+    language: str,
+    dataset: str | None,
+    texts: Sequence[str],
+) -> list[tuple[int, str, str]]:
+    """
+    校验拼接模式与逐条模式输出一致
+
+    返回：
+        不一致的行：[(行号, 逐条输出, 拼接输出), ...]，空列表表示一致
+    """
+    normalizer = get_normalizer(language, dataset)
+    expected, _ = _normalize_rows(normalizer, texts)
+    actual, _ = normalize_joined(normalizer, texts)
+
+    return [
+        (index, want, got)
+        for index, (want, got) in enumerate(zip(expected, actual))
+        if want != got
+    ]
+
+
+def main() -> None:
+    from benchmark.corpora import DATASET_TAGS, SENTENCES, build_corpus
+
+    parser = argparse.ArgumentParser(description="校验拼接模式与逐条模式输出一致")
+    parser.add_argument("--languages", default=",".join(SENTENCES))
+    parser.add_argument("--datasets", default="none,magicdata,dataocean")
+    parser.add_argument("--size", type=int, default=2000)
+    args = parser.parse_args()
+
+    failed = False
+    for language in args.languages.split(","):
+        for dataset in args.datasets.split(","):
+            dataset = None if dataset == "none" else dataset
+            texts = build_corpus(language, dataset, size=args.size)
+            mismatches = verify_joined(language, dataset, texts)
+            stages = joined_stages(get_normalizer(language, dataset))
+            status = "OK" if not mismatches else f"{len(mismatches)} mismatches"
+            print(f"{language}/{dataset}: joined={stages} {status}")
+            for index, want, got in mismatches[:3]:
+                print(f"    [{index}] row   : {want!r}")
+                print(f"    [{index}] joined: {got!r}")
+            failed = failed or bool(mismatches)
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+批量去重
+
+用途：
+- 清单中常有 20%~40% 的完全重复行（"yes"、"ok"、固定提示语等）
+- 每个不同的文本只规范化一次，再按原顺序回填
+
+说明：
+- 以文本本身为 dict key（即按哈希去重），只保存引用，不复制字符串
+- 原行 → 唯一行的映射使用 array('q')，每行 8 字节，GB 级列表也不会产生大量 int 对象
+- 非 str 输入不参与去重，各自保留为独立行（失败信息照常记录）
+"""
+
+from array import array
+from typing import Sequence
+
+
+def dedup_texts(texts: Sequence[str]) -> tuple[list, array]:
+    """
+    去重
+
+    返回：
+        (uniques, inverse)：uniques 为首次出现顺序的唯一文本，
+        inverse[i] 为第 i 行在 uniques 中的下标
+    """
+    index: dict[str, int] = {}
+    uniques = []
+    inverse = array("q")
+
+    for text in texts:
+        if type(text) is str:
+            j = index.get(text)
+            if j is None:
+                j = index[text] = len(uniques)
+                uniques.append(text)
+        else:
+            j = len(uniques)
+            uniques.append(text)
+        inverse.append(j)
+
+    return uniques, inverse
+
+
+def scatter(outputs: list, failures: dict, inverse: array) -> tuple[list, dict]:
+    """
+    将唯一行的结果按原顺序回填
+
+    返回：
+        (outputs, failures)：行号相对原输入
+    """
+    full_outputs = [outputs[j] for j in inverse]
+
+    full_failures = {}
+    if failures:
+        for i, j in enumerate(inverse):
+            message = failures.get(j)
+            if message is not None:
+                full_failures[i] = message
+
+    return full_outputs, full_failures
+
+
+def dedup_report(rows: int, unique: int, elapsed: float) -> dict:
+    """
+    去重统计
+
+    参数：
+        rows: 原行数
+        unique: 唯一行数（实际计算的行数）
+        elapsed: 计算唯一行耗时（秒）
+
+    返回：
+        dict: rows / unique / duplicate_ratio / elapsed /
+              saved_seconds（按唯一行平均耗时估算的节省时间）
+    """
+    duplicates = rows - unique
+    return {
+        "rows": rows,
+        "unique": unique,
+        "duplicate_ratio": duplicates / rows if rows else 0.0,
+        "elapsed": elapsed,
+        "saved_seconds": elapsed / unique * duplicates if unique else 0.0,
+    }
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+持久化磁盘缓存（sqlite，标准库）
+
+用途：
+- 每晚对同一批参考文本重复评测时，不必每次从头规范化
+- 映射：(流水线指纹, 文本哈希) → 规范化结果
+
+特性：
+- get_many / put_many 批量读写（单条 SQL 处理一组 key）
+- WAL 模式 + busy_timeout，多进程 / 多线程可同时读写同一文件；
+  连接按 (进程, 线程) 独立创建，fork 后不复用父进程连接
+- 数据量超过 max_bytes 时按最近访问时间淘汰最旧条目
+- 指纹由 Normalizer.fingerprint() 计算，规则源码、规则表、数据文件或依赖版本变化后指纹改变，
+  旧条目不再命中，随后被淘汰
+
+默认位置：缓存目录（见 runtime/paths.py）下的 normalize-cache.sqlite3
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Sequence
+
+from runtime.paths import cache_dir
+
+
+# 默认容量上限（数据页占用字节数）
+DEFAULT_MAX_BYTES = 1 << 30
+
+# 单条 SQL 中 IN (...) 的最大参数个数（低于 sqlite 旧版 999 的限制）
+_SQL_BATCH = 500
+
+# 超出容量时每轮淘汰的条目比例
+_EVICT_FRACTION = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    fingerprint TEXT NOT NULL,
+    key BLOB NOT NULL,
+    value TEXT NOT NULL,
+    atime INTEGER NOT NULL,
+    UNIQUE (fingerprint, key)
+);
+CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime);
+"""
+
+
+def default_path() -> str:
+    return os.path.join(cache_dir(), "normalize-cache.sqlite3")
+
+
+def text_key(text: str) -> bytes:
+    """
+    文本哈希（128 位），作为缓存 key；允许孤立代理字符
+    """
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+class DiskCache:
+    """
+    sqlite 持久化缓存
+
+    参数：
+        path (str | None): 数据库文件路径，None 表示 default_path()
+        max_bytes (int): 容量上限（字节），超出后按访问时间淘汰
+        timeout (float): 其他进程持有写锁时的等待秒数
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout: float = 30.0,
+    ):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes 必须为正整数: {max_bytes!r}")
+
+        self.path = os.fspath(path) if path is not None else default_path()
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # ---------- 连接管理 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        返回当前 (进程, 线程) 专用连接
+        """
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, "pid", None) != pid:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            local.conn = conn
+            local.pid = pid
+        return local.conn
+
+    def close(self) -> None:
+        """
+        关闭当前线程的连接（其他线程的连接随线程结束回收）
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+    def __reduce__(self):
+        # 传给子进程时只传路径与参数，子进程自行建立连接
+        return (DiskCache, (self.path, self.max_bytes, self.timeout))
+
+    # ---------- 读写 ----------
+
+    def get_many(self, fingerprint: str, texts: Sequence[str]) -> list[str | None]:
+        """
+        批量查询
+
+        返回：
+            list: 与 texts 等长，未命中（或非 str 输入）为 None
+        """
+        results: list[str | None] = [None] * len(texts)
+        positions: dict[bytes, list[int]] = {}
+        for i, text in enumerate(texts):
+            if isinstance(text, str):
+                positions.setdefault(text_key(text), []).append(i)
+        if not positions:
+            return results
+
+        conn = self._connect()
+        keys = list(positions)
+        hit_keys = []
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT key, value FROM entries WHERE fingerprint = ? AND key IN ({marks})",
+                (fingerprint, *batch),
+            )
+            for key, value in rows:
+                hit_keys.append(key)
+                for i in positions[key]:
+                    results[i] = value
+
+        # 更新命中条目的访问时间（供淘汰使用）
+        if hit_keys:
+            now = int(time.time())
+            with conn:
+                for start in range(0, len(hit_keys), _SQL_BATCH):
+                    batch = hit_keys[start:start + _SQL_BATCH]
+                    marks = ",".join("?" * len(batch))
+                    conn.execute(
+                        f"UPDATE entries SET atime = ? WHERE fingerprint = ? AND key IN ({marks})",
+                        (now, fingerprint, *batch),
+                    )
+
+        return results
+
+    def put_many(self, fingerprint: str, items: Sequence[tuple[str, str]]) -> None:
+        """
+        批量写入 (原文, 结果)，写入后检查容量
+        """
+        if not items:
+            return
+
+        now = int(time.time())
+        rows = [(fingerprint, text_key(text), value, now) for text, value in items]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (fingerprint, key, value, atime) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        self._evict(conn)
+
+    def _used_bytes(self, conn: sqlite3.Connection) -> int:
+        """
+        已用数据页字节数（不含空闲页，O(1)）
+        """
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        超出容量时按 atime 从旧到新分批删除
+        """
+        while self._used_bytes(conn) > self.max_bytes:
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count == 0:
+                break
+            with conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE rowid IN "
+                    "(SELECT rowid FROM entries ORDER BY atime LIMIT ?)",
+                    (max(1, int(count * _EVICT_FRACTION)),),
+                )
+
+    def clear(self, fingerprint: str | None = None) -> None:
+        """
+        删除全部条目，或只删除指定指纹的条目
+        """
+        conn = self._connect()
+        with conn:
+            if fingerprint is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE fingerprint = ?", (fingerprint,))
+
+    def stats(self) -> dict:
+        """
+        返回条目数、指纹数与已用字节数
+        """
+        conn = self._connect()
+        count, fingerprints = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT fingerprint) FROM entries"
+        ).fetchone()
+        return {
+            "entries": count,
+            "fingerprints": fingerprints,
+            "bytes": self._used_bytes(conn),
+            "max_bytes": self.max_bytes,
+        }
+
+    def __repr__(self) -> str:
+        return f"DiskCache(path={self.path!r}, max_bytes={self.max_bytes})"
+
+
+# =============================
+# 与批量接口的衔接
+# =============================
+
+# 按解析后的路径在进程内共享实例（避免每次调用都重新连接、建表、设置 WAL）
+_SHARED: dict[str, DiskCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_disk_cache(disk_cache) -> DiskCache | None:
+    """
+    将 normalize_batch 的 disk_cache 参数统一为 DiskCache 或 None
+
+    参数：
+        disk_cache: None / False（关闭）、True（默认路径）、路径字符串、DiskCache 实例；
+                    True 与路径按解析后的绝对路径在进程内共享同一实例
+    """
+    if disk_cache is None or disk_cache is False:
+        return None
+    if isinstance(disk_cache, DiskCache):
+        return disk_cache
+    if disk_cache is True:
+        path = default_path()
+    elif isinstance(disk_cache, (str, os.PathLike)):
+        path = os.fspath(disk_cache)
+    else:
+        raise TypeError(f"disk_cache 必须为 bool、路径或 DiskCache: {disk_cache!r}")
+
+    resolved = os.path.realpath(path)
+    with _SHARED_LOCK:
+        cache = _SHARED.get(resolved)
+        if cache is None:
+            cache = _SHARED[resolved] = DiskCache(resolved)
+        return cache
+
+
+def run_cached(
+    cache: DiskCache,
+    fingerprint: str,
+    texts: Sequence[str],
+    run: Callable[[list[str]], tuple[list, dict]],
+) -> tuple[list, dict]:
+    """
+    先查磁盘缓存，只对未命中的文本调用 run，再写回成功结果（降级结果除外）
+
+    参数：
+        run: 接收未命中文本列表，返回 (outputs, failures)，failures 行号相对该列表
+
+    返回：
+        (outputs, failures)：行号相对 texts
+    """
+    outputs = cache.get_many(fingerprint, texts)
+    missing = [i for i, value in enumerate(outputs) if value is None]
+    if not missing:
+        return outputs, {}
+
+    sub_outputs, sub_failures = run([texts[i] for i in missing])
+
+    failures = {}
+    new_items = []
+    for j, i in enumerate(missing):
+        outputs[i] = sub_outputs[j]
+        if j in sub_failures:
+            failures[i] = sub_failures[j]
+        elif isinstance(texts[i], str) and type(sub_outputs[j]) is str:
+            # 降级输出（runtime/budget.py 的 Degraded）不写回
+            new_items.append((texts[i], sub_outputs[j]))
+
+    cache.put_many(fingerprint, new_items)
+    return outputs, failures
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+流水线指纹
+
+指纹覆盖所有可能影响输出的内容：
+- 各阶段模块源码（含 final_clean 所在的 main 及其依赖模块）
+- 模块级编译正则（pattern 字符串 + flags）与映射表
+  （如 INDONESIAN_ABBREV_MAP、MALAY_ABBREV_MAP、CURRENCY_MAP）
+- 源码中引用的 *.tsv 数据文件内容（language/ref_code/*.tsv）
+- 模块导入的第三方库版本（如 regex、num2words、underthesea），
+  以及 Python 的 Unicode 数据版本
+
+用途：
+- 持久化缓存（runtime/diskcache.py）的 key 前缀
+- 批量结果与输出清单中记录，用于判断结果是否可复用
+
+说明：
+- 只读取源码与数据文件、遍历模块全局变量，不执行任何规则，启动时计算开销很小
+- 按 (language, dataset) 在进程内缓存，clear_registry() 时一并清空
+"""
+
+import ast
+import hashlib
+import os
+import re
+import sys
+import threading
+import unicodedata
+from functools import lru_cache
+from importlib import import_module, metadata
+
+
+# 源码中引用数据文件的形式，如 'currency.tsv'
+_DATA_FILE_PATTERN = re.compile(r"""["']([\w./-]+\.tsv)["']""")
+
+# 数据文件的查找目录（相对模块所在目录）
+_DATA_DIRS = ("", "ref_code")
+
+_FINGERPRINTS: dict[tuple[str, str | None], str] = {}
+_FINGERPRINTS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _distributions() -> dict[str, list[str]]:
+    """
+    顶层包名 → 发行包名（一次性扫描已安装的发行包）
+    """
+    return metadata.packages_distributions()
+
+
+@lru_cache(maxsize=None)
+def _dependency_version(top_level: str) -> str | None:
+    """
+    第三方顶层包的版本；标准库与项目内模块返回 None
+    """
+    if top_level in sys.stdlib_module_names:
+        return None
+    dists = _distributions().get(top_level)
+    if not dists:
+        return None
+    try:
+        return metadata.version(dists[0])
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _imported_packages(source: str) -> set[str]:
+    """
+    源码中导入的顶层包名（含 try/except 与函数内导入）
+    """
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def _stable_repr(value) -> str | None:
+    """
+    模块全局变量的稳定表示；与规则无关的对象（函数、模块、类等）返回 None
+    """
+    pattern = getattr(value, "pattern", None)
+    flags = getattr(value, "flags", None)
+    if isinstance(pattern, (str, bytes)) and isinstance(flags, int):
+        return f"pattern:{pattern!r}:{flags}"
+    if isinstance(value, (str, bytes, int, float, bool)):
+        return repr(value)
+    if isinstance(value, dict):
+        items = [(_stable_repr(k), _stable_repr(v)) for k, v in value.items()]
+        return None if any(None in item for item in items) else f"dict:{items!r}"
+    if isinstance(value, (list, tuple)):
+        items = [_stable_repr(v) for v in value]
+        return None if None in items else f"{type(value).__name__}:{items!r}"
+    if isinstance(value, (set, frozenset)):
+        items = [_stable_repr(v) for v in value]
+        return None if None in items else f"set:{sorted(items)!r}"
+    return None
+
+
+def _module_digest(module_path: str, digest) -> None:
+    """
+    将单个模块的源码、全局规则表、数据文件与依赖版本写入 digest
+    """
+    module = sys.modules.get(module_path) or import_module(module_path)
+    # 延迟加载的数据表与正则也要计入，先完成加载
+    ensure_loaded = getattr(module, "_ensure_loaded", None)
+    if ensure_loaded is not None:
+        ensure_loaded()
+
+    with open(module.__file__, "rb") as f:
+        source = f.read()
+
+    digest.update(f"module:{module_path}\n".encode("utf-8"))
+    digest.update(source)
+
+    text = source.decode("utf-8")
+
+    # 模块级正则与映射表（含运行时从数据文件加载的内容）
+    for name in sorted(vars(module)):
+        if name.startswith("__"):
+            continue
+        value = _stable_repr(vars(module)[name])
+        if value is not None:
+            digest.update(f"global:{name}={value}\n".encode("utf-8"))
+
+    # 源码中引用的数据文件
+    base = os.path.dirname(os.path.abspath(module.__file__))
+    for rel_path in sorted(set(_DATA_FILE_PATTERN.findall(text))):
+        for data_dir in _DATA_DIRS:
+            path = os.path.join(base, data_dir, rel_path)
+            if os.path.isfile(path):
+                digest.update(f"data:{data_dir}/{rel_path}\n".encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+                break
+
+    # 第三方依赖版本
+    for package in sorted(_imported_packages(text)):
+        version = _dependency_version(package)
+        if version is not None:
+            digest.update(f"dependency:{package}=={version}\n".encode("utf-8"))
+
+
+def compute_fingerprint(key: tuple[str, str | None], modules: list[str]) -> str:
+    """
+    计算指纹（不使用缓存）
+
+    参数：
+        key: (language, dataset)
+        modules: 参与计算的模块路径，顺序有意义
+    """
+    digest = hashlib.sha256(repr(key).encode("utf-8"))
+    digest.update(f"unicode:{unicodedata.unidata_version}\n".encode("utf-8"))
+    for module_path in modules:
+        _module_digest(module_path, digest)
+    return digest.hexdigest()[:32]
+
+
+def get_fingerprint(key: tuple[str, str | None], modules: list[str]) -> str:
+    """
+    按 (language, dataset) 缓存的指纹
+    """
+    fingerprint = _FINGERPRINTS.get(key)
+    if fingerprint is None:
+        fingerprint = compute_fingerprint(key, modules)
+        with _FINGERPRINTS_LOCK:
+            _FINGERPRINTS[key] = fingerprint
+    return fingerprint
+
+
+def clear_fingerprints() -> None:
+    with _FINGERPRINTS_LOCK:
+        _FINGERPRINTS.clear()
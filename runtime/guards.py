@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+阶段触发条件（guard）
+
+用途：
+- 大部分文本不含括号、+、#、数字、URL 等，
+  依赖这些字符的阶段对其整段扫描却不会产生任何替换
+- 阶段声明一个廉价的 Guard：文本中不存在触发字符 / 子串时直接跳过该阶段
+- 每个 Guard 记录调用次数与跳过次数，用于评估 guard 效果
+
+声明方式：
+- 流水线阶段：dataset / language 模块定义模块级 GUARD = Guard(...)，
+  main.get_normalizer 构建阶段时自动套用
+- 模块内部函数：使用 @guarded(Guard(...)) 装饰，跳过时原样返回第一个参数
+
+约定：
+- Guard 返回 False 时，被跳过的阶段对该文本必须是恒等变换
+- 计数器不加锁，多线程下为近似值
+"""
+
+import functools
+import re
+from typing import Callable
+
+
+class Guard:
+    """
+    触发条件：文本包含 chars 中任一字符、匹配 pattern、或包含 literals 中任一子串
+
+    参数：
+        chars (str): 触发字符集合，如 "[#"
+        pattern (str): 触发正则（标准库 re），如 r"\\d"
+        literals (tuple[str]): 触发子串，如 ("http", "@")
+    """
+
+    __slots__ = ("name", "chars", "pattern", "literals", "_search", "calls", "skips")
+
+    def __init__(
+        self,
+        chars: str = "",
+        pattern: str | None = None,
+        literals: tuple[str, ...] = (),
+    ):
+        parts = []
+        if chars:
+            parts.append("[" + re.escape(chars) + "]")
+        if pattern:
+            parts.append(pattern)
+        if not parts and not literals:
+            raise ValueError("Guard 至少需要 chars / pattern / literals 之一")
+
+        self.name = None
+        self.chars = chars
+        self.pattern = pattern
+        self.literals = tuple(literals)
+        self._search = re.compile("|".join(parts)).search if parts else None
+        self.calls = 0
+        self.skips = 0
+
+    def __call__(self, text: str) -> bool:
+        """
+        返回 True 表示阶段需要执行
+        """
+        self.calls += 1
+
+        if self._search is not None and self._search(text) is not None:
+            return True
+        for literal in self.literals:
+            if literal in text:
+                return True
+
+        self.skips += 1
+        return False
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.skips = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"Guard(name={self.name!r}, chars={self.chars!r}, "
+            f"pattern={self.pattern!r}, literals={self.literals!r})"
+        )
+
+
+# 进程内全部已注册的 guard：名称 → Guard
+GUARDS: dict[str, Guard] = {}
+
+
+def register_guard(name: str, guard: Guard) -> Guard:
+    """
+    以名称注册 guard（同名覆盖），返回 guard 本身
+    """
+    guard.name = name
+    GUARDS[name] = guard
+    return guard
+
+
+def apply_guard(guard: Guard, func: Callable) -> Callable:
+    """
+    包装 func：guard 不满足时跳过，原样返回第一个参数（文本）
+    """
+    @functools.wraps(func)
+    def wrapper(text, *args, **kwargs):
+        if not guard(text):
+            return text
+        return func(text, *args, **kwargs)
+
+    wrapper.guard = guard
+    return wrapper
+
+
+def guarded(guard: Guard) -> Callable:
+    """
+    装饰器：guard 不满足时跳过函数，原样返回第一个参数（文本）
+
+    示例：
+        @guarded(Guard(pattern=r"\\d"))
+        def _convert_numbers(text: str) -> str:
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        register_guard(f"{func.__module__}.{func.__qualname__}", guard)
+        return apply_guard(guard, func)
+
+    return decorator
+
+
+def guard_stats() -> dict[str, dict]:
+    """
+    返回每个 guard 的计数
+
+    返回：
+        {名称: {"calls": 调用次数, "skips": 跳过次数, "skip_ratio": 跳过比例}}
+    """
+    return {
+        name: {
+            "calls": guard.calls,
+            "skips": guard.skips,
+            "skip_ratio": guard.skips / guard.calls if guard.calls else 0.0,
+        }
+        for name, guard in GUARDS.items()
+    }
+
+
+def reset_guard_stats() -> None:
+    """
+    清零所有 guard 计数
+    """
+    for guard in GUARDS.values():
+        guard.reset()
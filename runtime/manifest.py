@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+多语种清单规范化：按 (language, dataset) 分组调度
+
+用途：
+- 合并评测清单中每行自带语言与数据集（ARE、EGY、IDN、VNM ...），
+  不必逐行调用 get_normalizer
+
+做法：
+1. 按 (language, dataset) 分组，组内只记录行号（array('q')）与文本
+2. 估算每组代价：在当前进程中加载流水线、不计时地执行第一行后，对其后若干行计时
+   （同时完成这些行的计算，结果直接使用），按每字符耗时 × 组内总字符数估算；不同语言的规则开销可相差数十倍，按行数分块会严重失衡
+3. 按估算代价切块：每块目标代价约为总代价 / (jobs * CHUNKS_PER_WORKER)，
+   各组块大小因此不同；所有块按代价从大到小提交（最长处理时间优先），减少尾部等待
+4. 各块在常驻进程池 / 线程池中执行对应组的 Normalizer，结果按行号回填，输出顺序与输入一致
+
+示例：
+    from main import normalize_manifest
+
+    rows = [{"language": "IDN", "dataset": "magicdata", "text": "..."}, ...]
+    outputs = normalize_manifest(rows, "language", "dataset", jobs=8)
+    outputs.failures   # {行号: "异常类型: 信息"}
+    outputs.groups     # 每组行数、字符数、估算代价、块数与流水线指纹
+"""
+
+import time
+from array import array
+from typing import Mapping, Sequence
+
+from main import _registry_key, get_normalizer
+from runtime.pool import (
+    CHUNKS_PER_WORKER,
+    MAX_CHUNKSIZE,
+    BatchResult,
+    _normalize_rows,
+    _resolve_jobs,
+    _run_pooled,
+)
+
+
+# 代价估算时每组在当前进程中计时的行数
+CALIBRATION_ROWS = 16
+
+
+class _Group:
+    """
+    一个 (language, dataset) 组
+    """
+
+    __slots__ = ("key", "indices", "texts", "chars", "cost", "error")
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.indices = array("q")
+        self.texts: list = []
+        self.chars = 0
+        self.cost = 0.0
+        self.error: str | None = None
+
+
+def _row_keys(
+    rows: Sequence[Mapping],
+    lang_field: str,
+    dataset_field: str | None,
+    text_field: str,
+    failures: dict,
+) -> tuple[list, list]:
+    """
+    取出每行的 (language, dataset) 与文本；缺少语言或文本字段的行 key 为 None 并记为失败
+    """
+    keys = []
+    texts = []
+    for index, row in enumerate(rows):
+        try:
+            language = row[lang_field]
+            dataset = row.get(dataset_field) if dataset_field else None
+            text = row[text_field]
+            key = _registry_key(language, dataset or None)
+        except (KeyError, TypeError, AttributeError) as exc:
+            failures[index] = f"{type(exc).__name__}: {exc}"
+            key = text = None
+        keys.append(key)
+        texts.append(text)
+    return keys, texts
+
+
+def _group_keys(keys: Sequence, texts: Sequence) -> dict[tuple, _Group]:
+    """
+    按 (language, dataset) 分组；key 为 None 的行跳过
+    """
+    groups: dict[tuple, _Group] = {}
+    for index, (key, text) in enumerate(zip(keys, texts)):
+        if key is None:
+            continue
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = _Group(key)
+        group.indices.append(index)
+        group.texts.append(text)
+        if isinstance(text, str):
+            group.chars += len(text)
+    return groups
+
+
+def _calibrate(
+    group: _Group,
+    outputs: list,
+    failures: dict,
+) -> int:
+    """
+    在当前进程中执行组内前 1 + CALIBRATION_ROWS 行，对后 CALIBRATION_ROWS 行计时，估算整组代价
+
+    一次性开销不计入代价：先 load() 加载延迟资源（underthesea、num2words、TSV 表），
+    再不计时地执行第一行（首次调用的正则编译、内部缓存填充等）；
+    否则 VNM / IDN 等组的代价会被高估数百倍，切出过多小块
+
+    返回：
+        已完成的行数（这些行不再分发）
+    """
+    normalizer = get_normalizer(*group.key)
+    normalizer.load()
+
+    warm_outputs, warm_failures = _normalize_rows(normalizer, group.texts[:1])
+
+    sample = group.texts[1:1 + CALIBRATION_ROWS]
+    started = time.perf_counter()
+    sample_outputs, sample_failures = _normalize_rows(normalizer, sample, 1)
+    elapsed = time.perf_counter() - started
+
+    done_failures = {**warm_failures, **sample_failures}
+    for position, output in enumerate(warm_outputs + sample_outputs):
+        row = group.indices[position]
+        outputs[row] = output
+        if position in done_failures:
+            failures[row] = done_failures[position]
+
+    sample_chars = sum(len(text) for text in sample if isinstance(text, str))
+    if sample_chars:
+        group.cost = elapsed / sample_chars * group.chars
+    else:
+        group.cost = elapsed / max(1, len(sample)) * len(group.texts)
+    return len(warm_outputs) + len(sample)
+
+
+def _plan_chunks(
+    groups: list[_Group],
+    done: dict[tuple, int],
+    jobs: int,
+    chunksize: int | None,
+) -> list[tuple[float, _Group, int, int]]:
+    """
+    按估算代价切块，返回按代价从大到小排列的 [(代价, 组, 起始, 结束), ...]
+    """
+    total = sum(group.cost for group in groups) or 1.0
+    target = total / (jobs * CHUNKS_PER_WORKER)
+
+    chunks = []
+    for group in groups:
+        start = done.get(group.key, 0)
+        remaining = len(group.texts) - start
+        if remaining <= 0:
+            continue
+        row_cost = group.cost / max(1, len(group.texts))
+        size = chunksize
+        if not size:
+            size = int(target / row_cost) if row_cost else MAX_CHUNKSIZE
+            size = max(1, min(MAX_CHUNKSIZE, size))
+        for begin in range(start, len(group.texts), size):
+            end = min(begin + size, len(group.texts))
+            chunks.append((row_cost * (end - begin), group, begin, end))
+
+    chunks.sort(key=lambda chunk: chunk[0], reverse=True)
+    return chunks
+
+
+def normalize_manifest(
+    rows: Sequence[Mapping],
+    lang_field: str = "language",
+    dataset_field: str | None = "dataset",
+    text_field: str = "text",
+    jobs: int | None = None,
+    chunksize: int | None = None,
+    errors: str = "record",
+    backend: str = "process",
+) -> BatchResult:
+    """
+    多语种清单规范化
+
+    参数：
+        rows: 行序列，每行为 dict（或其他 Mapping）
+        lang_field: 语言代码字段
+        dataset_field: 数据集字段；None 表示不使用数据集，字段值为空时同样不使用
+        text_field: 文本字段
+        jobs (int | None): worker 数量；None 或 <= 0 表示 CPU 核数，1 表示串行
+        chunksize (int | None): 每块行数；None 表示按估算代价自适应
+        errors (str): "record" 记录失败行并继续；"raise" 遇到失败行抛出异常
+        backend (str): "process" 常驻进程池；"thread" 常驻线程池
+
+    返回：
+        BatchResult: 与输入顺序一致的输出列表，失败行为 None；
+                     另有 result.groups：每组的行数、字符数、估算代价（秒）、块数与指纹，
+                     加载失败的组（如缺少依赖）记录 error
+    """
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+    if backend not in ("process", "thread"):
+        raise ValueError("backend 只能是 'process' 或 'thread'")
+
+    failures: dict[int, str] = {}
+    keys, texts = _row_keys(rows, lang_field, dataset_field, text_field, failures)
+    return normalize_grouped(keys, texts, jobs, chunksize, errors, backend, failures)
+
+
+def normalize_grouped(
+    keys: Sequence[tuple | None],
+    texts: Sequence[str],
+    jobs: int | None = None,
+    chunksize: int | None = None,
+    errors: str = "record",
+    backend: str = "process",
+    failures: dict | None = None,
+) -> BatchResult:
+    """
+    按每行给定的 (language, dataset) 分组规范化（normalize_manifest 与 runtime/routing.py 共用）
+
+    参数：
+        keys: 每行的 (language, dataset)（已经过 _registry_key 统一格式）；None 表示跳过该行
+        texts: 与 keys 等长的文本
+        failures: 已知的失败行（如字段缺失），结果中一并返回
+        其余参数同 normalize_manifest
+
+    返回：
+        同 normalize_manifest
+    """
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+    if backend not in ("process", "thread"):
+        raise ValueError("backend 只能是 'process' 或 'thread'")
+
+    jobs = _resolve_jobs(jobs)
+    outputs: list = [None] * len(texts)
+    failures = dict(failures) if failures else {}
+
+    groups = _group_keys(keys, texts)
+
+    # 逐组加载并估算代价；加载失败的组整组记为失败
+    done: dict[tuple, int] = {}
+    ready = []
+    for group in groups.values():
+        try:
+            done[group.key] = _calibrate(group, outputs, failures)
+        except Exception as exc:
+            if errors == "raise":
+                raise
+            group.error = f"{type(exc).__name__}: {exc}"
+            for row in group.indices:
+                failures[row] = group.error
+            continue
+        ready.append(group)
+
+    chunks = _plan_chunks(ready, done, jobs, chunksize)
+    counts: dict[tuple, int] = {}
+
+    def place(group, begin, chunk_outputs, chunk_failures):
+        for offset, output in enumerate(chunk_outputs):
+            outputs[group.indices[begin + offset]] = output
+        for position, message in chunk_failures.items():
+            failures[group.indices[position]] = message
+
+    if jobs == 1 or len(chunks) <= 1:
+        for _, group, begin, end in chunks:
+            chunk_outputs, chunk_failures = _normalize_rows(
+                get_normalizer(*group.key), group.texts[begin:end], begin,
+            )
+            place(group, begin, chunk_outputs, chunk_failures)
+            counts[group.key] = counts.get(group.key, 0) + 1
+    elif backend == "thread":
+        from runtime.threads import get_thread_pool
+
+        pool = get_thread_pool(jobs)
+        futures = [
+            (group, begin, pool.submit(
+                _normalize_rows, get_normalizer(*group.key), group.texts[begin:end], begin,
+            ))
+            for _, group, begin, end in chunks
+        ]
+        for group, begin, future in futures:
+            place(group, begin, *future.result())
+            counts[group.key] = counts.get(group.key, 0) + 1
+    else:
+        # 与 normalize_batch 相同：worker 异常退出时重建进程池并重试，仍失败的块记为失败行
+        tasks = [(group.key, begin, group.texts[begin:end]) for _, group, begin, end in chunks]
+        for (_, group, begin, _), (chunk_outputs, chunk_failures) in zip(
+            chunks, _run_pooled(tasks, jobs),
+        ):
+            place(group, begin, chunk_outputs, chunk_failures)
+            counts[group.key] = counts.get(group.key, 0) + 1
+
+    if failures and errors == "raise":
+        index = min(failures)
+        raise RuntimeError(f"第 {index} 行规范化失败: {failures[index]}")
+
+    result = BatchResult(outputs, failures)
+    result.groups = [
+        {
+            "language": group.key[0],
+            "dataset": group.key[1],
+            "rows": len(group.texts),
+            "chars": group.chars,
+            "cost": group.cost,
+            "chunks": counts.get(group.key, 0),
+            "fingerprint": get_normalizer(*group.key).fingerprint() if group.error is None else None,
+            "error": group.error,
+        }
+        for group in groups.values()
+    ]
+    return result
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+大文件按字节区间并行规范化（mmap）
+
+用途：
+- 数 GB 的 Kaldi text / TSV / JSONL 等按行文件，单文件多核并行
+
+做法：
+- partition_file：mmap 文件，按字节均分为若干区间，区间边界对齐到换行符之后
+- 每个 worker 只接收 (路径, 起止字节)，自行 mmap 并解码、规范化自己的区间，
+  结果写入输出目录下的临时分片文件；父进程不经管道传递文本
+- 父进程按区间顺序把分片拼接到输出文件（先完成的分片等待前面的分片），
+  输出与逐行处理完全一致
+
+示例：
+    from main import normalize_file
+
+    report = normalize_file("data/text", "data/text.norm", "IDN", fmt="kaldi", jobs=16)
+
+说明：
+- 区间数默认为 jobs * CHUNKS_PER_WORKER，区间内仍按块处理，单个 worker 内存有上限
+- 行的解析、格式与失败处理与命令行相同（见 runtime/cli.py），
+  命令行中对文件输入加 --mmap 即走本模块
+"""
+
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import as_completed
+from typing import BinaryIO, Iterator
+
+from main import _registry_key, get_normalizer
+from runtime.cli import (
+    DEFAULT_CHUNK_LINES,
+    FORMATS,
+    MAX_CHUNK_BYTES,
+    MAX_FAILURE_SAMPLES,
+    _Progress,
+    _run_lines,
+    detect_format,
+)
+from runtime.pool import CHUNKS_PER_WORKER, _resolve_jobs, get_pool
+
+
+def partition_file(path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    把文件按字节均分为至多 parts 个区间，每个区间以完整的行结束
+
+    返回：
+        [(起始字节, 结束字节), ...]，首尾相接覆盖整个文件；空文件返回 []
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    parts = max(1, min(parts, size))
+
+    ranges = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        for index in range(1, parts + 1):
+            if start >= size:
+                break
+            if index == parts:
+                end = size
+            else:
+                # 从均分点向后找到下一个换行符，区间在换行符之后结束
+                target = max(start, size * index // parts)
+                newline = mm.find(b"\n", target)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_range_lines(
+    mm: mmap.mmap,
+    start: int,
+    end: int,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    max_bytes: int = MAX_CHUNK_BYTES,
+) -> Iterator[list[bytes]]:
+    """
+    按块产出 [start, end) 内的行（去掉行尾换行），与 runtime.cli.read_chunks 的分行规则一致
+    """
+    lines: list[bytes] = []
+    size = 0
+    pos = start
+    while pos < end:
+        newline = mm.find(b"\n", pos, end)
+        stop = end if newline == -1 else newline + 1
+        raw = mm[pos:stop]
+        pos = stop
+
+        size += len(raw)
+        if raw.endswith(b"\n"):
+            raw = raw[:-2] if raw.endswith(b"\r\n") else raw[:-1]
+        lines.append(raw)
+        if len(lines) >= chunk_lines or size >= max_bytes:
+            yield lines
+            lines = []
+            size = 0
+    if lines:
+        yield lines
+
+
+def _run_range(
+    key: tuple,
+    path: str,
+    start: int,
+    end: int,
+    part_path: str,
+    fmt: str,
+    field: str,
+    output_field: str,
+    mode: str = "row",
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> tuple[int, int, dict]:
+    """
+    在 worker 中处理一个字节区间，结果写入 part_path
+
+    返回：
+        (行数, 失败行数, {区间内行号(从 1 开始): 原因})
+    """
+    lines_done = 0
+    failed = 0
+    failures: dict[int, str] = {}
+
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(part_path, "wb") as out:
+        for lines in iter_range_lines(mm, start, end, chunk_lines):
+            _, data, count, chunk_failures = _run_lines(
+                key, lines_done, lines, fmt, field, output_field, mode,
+            )
+            out.write(data)
+            lines_done += len(lines)
+            failed += count
+            for line, reason in chunk_failures.items():
+                if len(failures) < MAX_FAILURE_SAMPLES:
+                    failures[line] = reason
+
+    return lines_done, failed, failures
+
+
+def normalize_file(
+    path: str,
+    output: str | BinaryIO,
+    language: str,
+    dataset: str | None = None,
+    fmt: str | None = None,
+    field: str = "text",
+    output_field: str | None = None,
+    jobs: int | None = None,
+    parts: int | None = None,
+    mode: str = "row",
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    errors: str = "record",
+    progress: float = 0,
+    quiet: bool = True,
+) -> dict:
+    """
+    按字节区间并行规范化一个按行文件
+
+    参数：
+        path: 输入文件路径（必须是可 mmap 的普通文件）
+        output: 输出文件路径，或二进制写流（如 sys.stdout.buffer）
+        fmt: 输入格式（见 runtime.cli.FORMATS），None 表示按扩展名推断
+        jobs: worker 数量；None 或 <= 0 表示 CPU 核数，1 表示在当前进程执行
+        parts: 区间数；None 表示 jobs * CHUNKS_PER_WORKER
+        其余参数同 runtime.cli.normalize_stream
+
+    返回：
+        dict：运行清单（行数、失败、字节数、耗时、流水线指纹等）
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"未知格式 {fmt!r}，可选: {FORMATS}")
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+
+    key = _registry_key(language, dataset)
+    fingerprint = get_normalizer(*key).fingerprint()
+    jobs = _resolve_jobs(jobs)
+    parts = parts if parts and parts > 0 else jobs * CHUNKS_PER_WORKER
+    output_field = output_field or field
+
+    ranges = partition_file(path, parts)
+    meter = _Progress(progress, enabled=not quiet)
+
+    # 分片写在输出文件所在目录，拼接时不跨文件系统
+    if isinstance(output, str):
+        part_dir = tempfile.mkdtemp(prefix=".textnorm-parts-", dir=os.path.dirname(os.path.abspath(output)))
+        sink = open(output, "wb")
+    else:
+        part_dir = tempfile.mkdtemp(prefix="textnorm-parts-")
+        sink = output
+
+    def part_path(index):
+        return os.path.join(part_dir, f"{index:06d}.part")
+
+    results: dict[int, tuple] = {}
+    lines_before = 0
+    failed = 0
+    failures: dict[int, str] = {}
+    merged = 0
+
+    def merge_ready():
+        # 按区间顺序拼接已完成的分片，并把区间内行号换算为全文件行号
+        nonlocal merged, lines_before, failed
+        while merged in results:
+            lines, count, part_failures = results.pop(merged)
+            if count and errors == "raise":
+                line = min(part_failures)
+                raise RuntimeError(
+                    f"第 {lines_before + line} 行规范化失败: {part_failures[line]}"
+                )
+            failed += count
+            for line, reason in part_failures.items():
+                if len(failures) < MAX_FAILURE_SAMPLES:
+                    failures[lines_before + line] = reason
+            lines_before += lines
+
+            with open(part_path(merged), "rb") as part:
+                shutil.copyfileobj(part, sink, 1 << 20)
+            os.remove(part_path(merged))
+            merged += 1
+
+    try:
+        args = [
+            (key, path, start, end, part_path(index), fmt, field, output_field, mode, chunk_lines)
+            for index, (start, end) in enumerate(ranges)
+        ]
+        if jobs == 1 or len(ranges) <= 1:
+            for index, arg in enumerate(args):
+                results[index] = _run_range(*arg)
+                meter.update(results[index][0], arg[3] - arg[2], results[index][1])
+                merge_ready()
+        else:
+            pool = get_pool(jobs, keys=[key])
+            futures = {pool.submit(_run_range, *arg): index for index, arg in enumerate(args)}
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    start, end = ranges[index]
+                    meter.update(results[index][0], end - start, results[index][1])
+                    merge_ready()
+            finally:
+                for future in futures:
+                    future.cancel()
+        sink.flush()
+    finally:
+        if sink is not output:
+            sink.close()
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    seconds = meter.done()
+    if failed and not quiet:
+        print(f"failed lines: {failed}", file=sys.stderr)
+        for line, reason in list(failures.items())[:10]:
+            print(f"  line {line}: {reason}", file=sys.stderr)
+
+    return {
+        "language": key[0],
+        "dataset": key[1],
+        "fingerprint": fingerprint,
+        "format": fmt,
+        "mode": mode,
+        "backend": "mmap" if jobs > 1 else "inline",
+        "jobs": jobs,
+        "parts": len(ranges),
+        "lines": meter.lines,
+        "bytes": meter.bytes,
+        "failed": failed,
+        "failures": {str(line): reason for line, reason in failures.items()},
+        "seconds": seconds,
+    }
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+本地缓存目录
+
+优先级：
+1. 环境变量 TEXTNORM_CACHE_DIR
+2. $XDG_CACHE_HOME/textnormfactory
+3. ~/.cache/textnormfactory
+"""
+
+import os
+
+
+def cache_dir() -> str:
+    """
+    返回缓存目录路径（不保证已创建）
+    """
+    path = os.environ.get("TEXTNORM_CACHE_DIR")
+    if path:
+        return path
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "textnormfactory")
@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+"""
+批量规范化与常驻进程池
+
+职责：
+- normalize_batch：对一批文本执行 get_normalizer 流水线
+- 维护一个可复用的 ProcessPoolExecutor，worker 启动时预加载 Normalizer
+- 保持输入顺序；单行失败只记录在结果中，不影响整批
+- worker 异常退出（OOM、C 扩展段错误）时重建进程池并重试受影响的块，
+  仍然失败的块整块记为失败行，不中断整批，之后的调用也不受影响
+
+说明：
+- 任务只传递 (language, dataset) key 与文本，worker 内部通过
+  get_normalizer 注册表获取 Normalizer，结果与串行调用完全一致
+"""
+
+import atexit
+import math
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import Iterable, Sequence
+
+from main import Normalizer, _registry_key, get_normalizer
+
+
+# =============================
+# 分块参数
+# =============================
+
+# 每个 worker 期望分到的块数（块太少负载不均，块太多调度开销大）
+CHUNKS_PER_WORKER = 4
+
+# 单块目标字符数（长文本自动减小块内行数）
+TARGET_CHUNK_CHARS = 1 << 16
+
+# 单块行数上限
+MAX_CHUNKSIZE = 4096
+
+# 估算平均长度时采样的行数
+_LENGTH_SAMPLE = 1000
+
+# worker 异常退出后整批重试的轮数；之后逐块单独重试，找出导致退出的块
+POOL_RETRIES = 1
+
+
+class BatchResult(list):
+    """
+    normalize_batch 的返回值
+
+    - 本身是与输入等长、顺序一致的输出列表
+    - 失败行的输出为 None
+    - failures: {行号: "异常类型: 信息"}
+    - fingerprint: 产生该结果的流水线指纹（见 Normalizer.fingerprint）；
+      未使用磁盘缓存时在首次访问时才计算（需要加载各阶段模块，不访问就不付出这部分开销）
+    - dedup: 去重模式下的统计（见 runtime/dedup.py），未去重时为 None
+    - groups: normalize_manifest 的分组统计（见 runtime/manifest.py），其他情况为 None
+    """
+
+    def __init__(
+        self,
+        outputs: Iterable = (),
+        failures: dict | None = None,
+        fingerprint: str | None = None,
+        key: tuple | None = None,
+    ):
+        super().__init__(outputs)
+        self.failures = failures if failures is not None else {}
+        self._fingerprint = fingerprint
+        self._key = key
+        self.dedup = None
+        self.groups = None
+
+    @property
+    def fingerprint(self) -> str | None:
+        if self._fingerprint is None and self._key is not None:
+            self._fingerprint = get_normalizer(*self._key).fingerprint()
+        return self._fingerprint
+
+
+# =============================
+# worker 侧函数（必须是模块级函数，才能被 pickle）
+# =============================
+
+def _normalize_rows(
+    normalizer: Normalizer,
+    texts: Sequence[str],
+    start: int = 0,
+) -> tuple[list, dict]:
+    """
+    逐行执行 normalizer，单行异常只记录不抛出
+
+    返回：
+        (outputs, failures)，failures 的行号基于 start 偏移
+    """
+    outputs = []
+    failures = {}
+    for offset, text in enumerate(texts):
+        try:
+            outputs.append(normalizer(text))
+        except Exception as exc:
+            outputs.append(None)
+            failures[start + offset] = f"{type(exc).__name__}: {exc}"
+    return outputs, failures
+
+
+def _normalize_chunk(
+    normalizer: Normalizer,
+    texts: Sequence[str],
+    start: int = 0,
+    mode: str = "row",
+) -> tuple[list, dict]:
+    """
+    执行一个块
+
+    mode：
+        "row"       逐条执行
+        "concat"    拼接模式（见 runtime/concat.py）
+        "vectorize" final_clean 整块向量化（见 runtime/vectorized.py）
+    """
+    if mode == "concat":
+        from runtime.concat import normalize_joined
+
+        return normalize_joined(normalizer, texts, start)
+    if mode == "vectorize":
+        from runtime.vectorized import normalize_vectorized
+
+        return normalize_vectorized(normalizer, texts, start)
+    return _normalize_rows(normalizer, texts, start)
+
+
+def _worker_init(keys: tuple) -> None:
+    """
+    worker 启动时预加载 Normalizer（导入规则模块、构建阶段列表、加载延迟资源）
+
+    延迟资源在这里加载完，启用时间预算时首批文本不会因加载耗时被判为超时
+    """
+    for key in keys:
+        normalizer = get_normalizer(*key)
+        try:
+            normalizer.load()
+        except Exception:
+            # 加载失败（如缺少依赖）不能让 worker 启动失败，留到调用时按行记录
+            pass
+
+
+def _run_chunk(
+    key: tuple,
+    start: int,
+    texts: list,
+    mode: str = "row",
+) -> tuple[int, list, dict]:
+    """
+    在 worker 中处理一个块
+    """
+    outputs, failures = _normalize_chunk(get_normalizer(*key), texts, start, mode)
+    return start, outputs, failures
+
+
+# =============================
+# 常驻进程池
+# =============================
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_JOBS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool(jobs: int, keys: Iterable[tuple] = ()) -> ProcessPoolExecutor:
+    """
+    获取常驻进程池
+
+    - worker 数量不变且进程池可用时直接复用；已损坏（worker 异常退出）时重建
+    - 新建进程池时，worker 启动即预加载 keys 对应的 Normalizer；
+      之后出现的新组合在 worker 内首次使用时加载并进入其注册表
+
+    参数：
+        jobs (int): worker 数量
+        keys: 需要预加载的 (language, dataset) 列表
+    """
+    global _POOL, _POOL_JOBS
+
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_JOBS == jobs and not _is_broken(_POOL):
+            return _POOL
+
+        if _POOL is not None:
+            # worker 数量变化时旧进程池可能仍有其他线程的任务在途：
+            # 不等待、不取消，已提交的任务照常完成后 worker 自行退出；
+            # 只有已损坏的进程池才取消排队任务（它们已无法完成）
+            _POOL.shutdown(wait=False, cancel_futures=_is_broken(_POOL))
+
+        _POOL = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_worker_init,
+            initargs=(tuple(keys),),
+        )
+        _POOL_JOBS = jobs
+        return _POOL
+
+
+def _is_broken(pool: ProcessPoolExecutor) -> bool:
+    # ProcessPoolExecutor 在 worker 异常退出后置位 _broken，之后所有 submit 都会失败
+    return bool(getattr(pool, "_broken", False))
+
+
+def reset_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """
+    丢弃已损坏的常驻进程池，下次 get_pool 时重建
+
+    参数：
+        pool: 只有当前常驻进程池仍是该对象时才丢弃（其他线程可能已经重建）；None 表示无条件丢弃
+    """
+    global _POOL, _POOL_JOBS
+
+    with _POOL_LOCK:
+        if _POOL is None or (pool is not None and _POOL is not pool):
+            return
+        old = _POOL
+        _POOL = None
+        _POOL_JOBS = 0
+    old.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """
+    关闭常驻进程池（进程退出时自动调用）
+    """
+    global _POOL, _POOL_JOBS
+
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+        _POOL = None
+        _POOL_JOBS = 0
+
+
+atexit.register(shutdown_pool)
+
+
+# =============================
+# 分块
+# =============================
+
+def _resolve_jobs(jobs: int | None) -> int:
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def auto_chunksize(texts: Sequence[str], jobs: int) -> int:
+    """
+    自适应块大小
+
+    - 至少切出 jobs * CHUNKS_PER_WORKER 块，保证负载均衡
+    - 按采样平均长度限制单块字符数，长文本块内行数更少
+    """
+    n = len(texts)
+    if n == 0:
+        return 1
+
+    by_count = math.ceil(n / (jobs * CHUNKS_PER_WORKER))
+
+    sample = texts[:_LENGTH_SAMPLE]
+    avg_len = max(1, sum(len(t) for t in sample if isinstance(t, str)) // len(sample))
+    by_size = max(1, TARGET_CHUNK_CHARS // avg_len)
+
+    return max(1, min(by_count, by_size, MAX_CHUNKSIZE))
+
+
+def _dispatch(
+    key: tuple[str, str | None],
+    texts: Sequence[str],
+    jobs: int,
+    chunksize: int | None,
+    backend: str,
+    mode: str,
+) -> tuple[list, dict]:
+    """
+    按后端分块执行，返回 (outputs, failures)
+    """
+    if chunksize is None:
+        chunksize = auto_chunksize(texts, jobs)
+
+    # 单 worker 或只有一个块时直接在当前进程执行，省去进程间传输
+    if jobs == 1 or len(texts) <= chunksize:
+        return _normalize_chunk(get_normalizer(*key), texts, 0, mode)
+
+    if backend == "thread":
+        from runtime.threads import run_threaded
+
+        return run_threaded(key, texts, jobs, chunksize, mode)
+
+    tasks = [
+        (key, start, list(texts[start:start + chunksize]))
+        for start in range(0, len(texts), chunksize)
+    ]
+
+    outputs = []
+    failures = {}
+    # 按输入顺序拼接，保证输出顺序与输入一致
+    for chunk_outputs, chunk_failures in _run_pooled(tasks, jobs, mode):
+        outputs.extend(chunk_outputs)
+        failures.update(chunk_failures)
+    return outputs, failures
+
+
+def _submit(pool: ProcessPoolExecutor, func, *args) -> Future:
+    """
+    提交任务；进程池在提交过程中损坏时返回带 BrokenExecutor 异常的 Future，与运行中损坏统一处理
+
+    进程池已被其他线程以不同的 worker 数量替换（旧池已关闭，submit 抛出 RuntimeError）时同样处理：
+    调用方随后通过 get_pool 取得当前进程池重试
+    """
+    try:
+        return pool.submit(func, *args)
+    except BrokenExecutor as exc:
+        error = exc
+    except RuntimeError as exc:
+        error = BrokenExecutor(f"进程池已关闭: {exc}")
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+def _run_pooled(
+    tasks: Sequence[tuple[tuple, int, list]],
+    jobs: int,
+    mode: str = "row",
+) -> list[tuple[list, dict]]:
+    """
+    在常驻进程池中执行各块，返回与 tasks 一一对应的 (outputs, failures)
+
+    参数：
+        tasks: [(key, 起始行号, 块内文本)]，各块可属于不同的 (language, dataset)
+               （normalize_manifest 与 runtime/routing.py 按组分块后同样经由这里执行）
+
+    worker 异常退出时所有未完成的块都会失败（BrokenExecutor）：
+    - 先重建进程池，整批重试这些块 POOL_RETRIES 轮
+    - 仍然失败的块逐个单独执行，再次导致退出的块整块记为失败行
+    """
+    keys = list(dict.fromkeys(key for key, _, _ in tasks))
+    results: list = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    rounds = 0
+    while pending:
+        isolate = rounds > POOL_RETRIES
+        rounds += 1
+        broken = []
+        error = None
+        # 逐块单独执行时每次只提交一块，导致退出的块不会连累其他块
+        batches = [[index] for index in pending] if isolate else [pending]
+        for batch in batches:
+            pool = get_pool(jobs, keys=keys)
+            futures = [(index, _submit(pool, _run_chunk, *tasks[index], mode)) for index in batch]
+            batch_error = None
+            for index, future in futures:
+                try:
+                    _, chunk_outputs, chunk_failures = future.result()
+                except BrokenExecutor as exc:
+                    broken.append(index)
+                    batch_error = error = exc
+                    continue
+                results[index] = (chunk_outputs, chunk_failures)
+            if batch_error is not None:
+                reset_pool(pool)
+
+        if isolate:
+            # 单独执行仍导致 worker 退出：整块记为失败
+            message = f"{type(error).__name__}: {error}"
+            for index in broken:
+                _, start, chunk = tasks[index]
+                results[index] = (
+                    [None] * len(chunk),
+                    {start + offset: message for offset in range(len(chunk))},
+                )
+            break
+        pending = broken
+    return results
+
+
+# =============================
+# 对外接口
+# =============================
+
+def normalize_batch(
+    texts: Sequence[str],
+    language: str,
+    dataset: str | None = None,
+    jobs: int | None = None,
+    chunksize: int | None = None,
+    errors: str = "record",
+    backend: str = "process",
+    concat: bool = False,
+    vectorize: bool = False,
+    disk_cache=None,
+    dedup: bool = False,
+) -> BatchResult:
+    """
+    批量文本规范化
+
+    参数：
+        texts (Sequence[str]): 待处理文本
+        language (str): 三字母语言代码，如 "IDN"
+        dataset (str | None): 数据集名称，如 "magicdata"
+        jobs (int | None): worker 数量；None 或 <= 0 表示 CPU 核数，1 表示串行
+        chunksize (int | None): 每个任务的行数；None 表示自适应
+        errors (str): "record" 记录失败行并继续，"raise" 遇到失败行抛出异常
+        backend (str): "process" 常驻进程池；"thread" 常驻线程池（见 runtime/threads.py）
+        concat (bool): 拼接模式，块内文本拼接后逐阶段整体执行（见 runtime/concat.py）
+        vectorize (bool): final_clean 整块 NumPy 向量化执行（见 runtime/vectorized.py），
+                          与 concat 互斥
+        disk_cache: 持久化缓存（见 runtime/diskcache.py）；None / False 不使用，
+                    True 使用默认路径，也可传路径或 DiskCache 实例。
+                    命中的行不再计算，未命中的行计算成功后写回
+        dedup (bool): 去重模式，每个不同的文本只计算一次再按原顺序回填，
+                      统计见 result.dedup（重复率与估算节省时间）
+
+    返回：
+        BatchResult: 与输入顺序一致的输出列表，失败行为 None，
+                     失败信息见 result.failures
+    """
+    if errors not in ("record", "raise"):
+        raise ValueError("errors 只能是 'record' 或 'raise'")
+    if backend not in ("process", "thread"):
+        raise ValueError("backend 只能是 'process' 或 'thread'")
+    if concat and vectorize:
+        raise ValueError("concat 与 vectorize 不能同时启用")
+
+    mode = "concat" if concat else "vectorize" if vectorize else "row"
+
+    if not isinstance(texts, Sequence):
+        texts = list(texts)
+
+    key = _registry_key(language, dataset)
+    jobs = _resolve_jobs(jobs)
+
+    def run(subset):
+        return _dispatch(key, subset, jobs, chunksize, backend, mode)
+
+    # 指纹计算时会导入各阶段依赖（如 VNM 的 underthesea）：
+    # 磁盘缓存需要它作为 key，立即计算；否则留给 BatchResult.fingerprint 首次访问时计算
+    cache = None
+    fingerprint = None
+    if disk_cache is not None and disk_cache is not False:
+        from runtime.diskcache import get_disk_cache
+
+        cache = get_disk_cache(disk_cache)
+        fingerprint = get_normalizer(*key).fingerprint()
+
+    work = texts
+    if dedup:
+        from runtime.dedup import dedup_texts
+
+        work, inverse = dedup_texts(texts)
+        started = time.perf_counter()
+
+    if cache is not None:
+        from runtime.diskcache import run_cached
+
+        outputs, failures = run_cached(cache, fingerprint, work, run)
+    else:
+        outputs, failures = run(work)
+
+    if dedup:
+        from runtime.dedup import dedup_report, scatter
+
+        report = dedup_report(len(texts), len(work), time.perf_counter() - started)
+        outputs, failures = scatter(outputs, failures, inverse)
+
+    if failures and errors == "raise":
+        index = min(failures)
+        raise RuntimeError(f"第 {index} 行规范化失败: {failures[index]}")
+
+    result = BatchResult(outputs, failures, fingerprint, key)
+    if dedup:
+        result.dedup = report
+    return result
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+"""
+规则级性能分析
+
+用途：
+- 模块内大量规则在真实语料上从不命中，却每次都要整段扫描
+  （如 IDN 的 INDONESIAN_ABBREV_MAP 逐词正则、PHL 的 CONTRACTIONS、MAR 的 NORM_MAP）
+- 对给定语料逐条统计每个规则的耗时、匹配次数与改动字符数，
+  按耗时排序输出，用于判断哪些规则值得换用更快的实现
+
+实现：
+- 临时替换模块全局的 re / regex 模块对象：re.sub / re.compile 等调用
+  得到带统计的 pattern（函数内临时编译的正则也能按 pattern 字符串归类）
+- 临时替换模块级编译正则、含编译正则的规则列表（如 MYS 的 NORM_RULES）
+  与 ReplacementTable（runtime/tables.py，逐对统计 str.replace）
+- 退出时全部还原；分析期间模块行为与原来完全一致
+
+命令行：
+    python -m runtime.profiler --language IDN --dataset magicdata
+    python -m runtime.profiler --language MAR --input corpus.txt --top 20
+
+说明：
+- 分析期间各规则调用都会额外计时，只用于离线分析，不要在生产中开启
+- 不加锁，只在单线程中使用
+- 改动字符数：输入与输出去掉公共前缀、公共后缀后较长一侧的长度
+"""
+
+import argparse
+import sys
+import time
+import types
+from importlib import import_module
+from typing import Iterable, Sequence
+
+from main import get_normalizer
+from runtime.tables import ReplacementTable
+
+
+class RuleStats:
+    """
+    单个规则的累计统计
+    """
+
+    __slots__ = ("rule", "calls", "hits", "matches", "changed", "time")
+
+    def __init__(self, rule: str):
+        self.rule = rule
+        self.calls = 0
+        self.hits = 0
+        self.matches = 0
+        self.changed = 0
+        self.time = 0.0
+
+    def record(self, elapsed: float, matches: int, changed: int = 0) -> None:
+        self.calls += 1
+        self.time += elapsed
+        if matches:
+            self.hits += 1
+            self.matches += matches
+        self.changed += changed
+
+    def as_dict(self) -> dict:
+        return {
+            "rule": self.rule,
+            "calls": self.calls,
+            "hits": self.hits,
+            "matches": self.matches,
+            "changed": self.changed,
+            "time": self.time,
+        }
+
+
+def _changed_chars(before, after) -> int:
+    """
+    改动字符数：去掉公共前缀与公共后缀后较长一侧的长度
+    """
+    if before is after or before == after:
+        return 0
+    if not isinstance(before, str) or not isinstance(after, str):
+        return 0
+
+    limit = min(len(before), len(after))
+    prefix = 0
+    while prefix < limit and before[prefix] == after[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and before[-1 - suffix] == after[-1 - suffix]:
+        suffix += 1
+    return max(len(before), len(after)) - prefix - suffix
+
+
+def _is_pattern(value) -> bool:
+    """
+    是否为已编译正则（re.Pattern 或 regex.Pattern）
+    """
+    return (
+        not isinstance(value, (types.ModuleType, type))
+        and isinstance(getattr(value, "pattern", None), (str, bytes))
+        and callable(getattr(value, "subn", None))
+    )
+
+
+def _label(pattern) -> str:
+    text = pattern.pattern if isinstance(pattern.pattern, str) else repr(pattern.pattern)
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+class ProfiledPattern:
+    """
+    带统计的编译正则代理（未覆盖的属性直接转发给原对象）
+    """
+
+    def __init__(self, pattern, stats: RuleStats):
+        self._pattern = pattern
+        self._stats = stats
+
+    def sub(self, repl, string, *args, **kwargs):
+        started = time.perf_counter()
+        result, count = self._pattern.subn(repl, string, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+        self._stats.record(elapsed, count, _changed_chars(string, result) if count else 0)
+        return result
+
+    def subn(self, repl, string, *args, **kwargs):
+        started = time.perf_counter()
+        result, count = self._pattern.subn(repl, string, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+        self._stats.record(elapsed, count, _changed_chars(string, result) if count else 0)
+        return result, count
+
+    def _single(self, method, string, *args, **kwargs):
+        started = time.perf_counter()
+        match = method(string, *args, **kwargs)
+        self._stats.record(time.perf_counter() - started, 0 if match is None else 1)
+        return match
+
+    def search(self, string, *args, **kwargs):
+        return self._single(self._pattern.search, string, *args, **kwargs)
+
+    def match(self, string, *args, **kwargs):
+        return self._single(self._pattern.match, string, *args, **kwargs)
+
+    def fullmatch(self, string, *args, **kwargs):
+        return self._single(self._pattern.fullmatch, string, *args, **kwargs)
+
+    def findall(self, string, *args, **kwargs):
+        started = time.perf_counter()
+        found = self._pattern.findall(string, *args, **kwargs)
+        self._stats.record(time.perf_counter() - started, len(found))
+        return found
+
+    def finditer(self, string, *args, **kwargs):
+        # 一次性取完所有匹配以便计时；匹配基于原字符串，提前取出不影响调用方逻辑
+        started = time.perf_counter()
+        found = list(self._pattern.finditer(string, *args, **kwargs))
+        self._stats.record(time.perf_counter() - started, len(found))
+        return iter(found)
+
+    def split(self, string, *args, **kwargs):
+        started = time.perf_counter()
+        parts = self._pattern.split(string, *args, **kwargs)
+        self._stats.record(time.perf_counter() - started, len(parts) - 1)
+        return parts
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+    def __repr__(self) -> str:
+        return f"ProfiledPattern({self._pattern!r})"
+
+
+class ProfiledTable(ReplacementTable):
+    """
+    带统计的 ReplacementTable：逐对记录 str.replace 的耗时与替换次数
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self, table: ReplacementTable, stats: list[RuleStats]):
+        super().__init__(table.pairs)
+        self._stats = stats
+
+    def __call__(self, text: str) -> str:
+        for (old, new), stats in zip(self.pairs, self._stats):
+            started = time.perf_counter()
+            count = text.count(old)
+            if count:
+                result = text.replace(old, new)
+            else:
+                result = text
+            elapsed = time.perf_counter() - started
+            stats.record(elapsed, count, _changed_chars(text, result) if count else 0)
+            text = result
+        return text
+
+
+class ProfiledRe:
+    """
+    re / regex 模块代理：模块级函数经由带统计的编译正则执行
+    """
+
+    def __init__(self, module: types.ModuleType, profiler: "RuleProfiler", owner: str):
+        self._module = module
+        self._profiler = profiler
+        self._owner = owner
+
+    def compile(self, pattern, flags=0, **kwargs):
+        compiled = self._module.compile(pattern, flags, **kwargs)
+        return self._profiler.wrap_pattern(self._owner, compiled)
+
+    def _compiled(self, pattern, args: tuple, kwargs: dict, flags_index: int):
+        """
+        从模块级函数参数中取出 flags 并编译，返回 (编译正则, 其余位置参数)
+        """
+        if len(args) > flags_index:
+            flags = args[flags_index]
+            args = args[:flags_index] + args[flags_index + 1:]
+        else:
+            flags = kwargs.pop("flags", 0)
+        if isinstance(pattern, ProfiledPattern):
+            compiled = pattern
+        elif _is_pattern(pattern):
+            compiled = self._profiler.wrap_pattern(self._owner, pattern)
+        else:
+            compiled = self.compile(pattern, flags)
+        return compiled, args
+
+    # 参数顺序与标准库一致：sub(pattern, repl, string, count=0, flags=0)
+    def sub(self, pattern, repl, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 1)
+        return compiled.sub(repl, string, *args, **kwargs)
+
+    def subn(self, pattern, repl, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 1)
+        return compiled.subn(repl, string, *args, **kwargs)
+
+    def split(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 1)
+        return compiled.split(string, *args, **kwargs)
+
+    def search(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 0)
+        return compiled.search(string, *args, **kwargs)
+
+    def match(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 0)
+        return compiled.match(string, *args, **kwargs)
+
+    def fullmatch(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 0)
+        return compiled.fullmatch(string, *args, **kwargs)
+
+    def findall(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 0)
+        return compiled.findall(string, *args, **kwargs)
+
+    def finditer(self, pattern, string, *args, **kwargs):
+        compiled, args = self._compiled(pattern, args, kwargs, 0)
+        return compiled.finditer(string, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+class RuleProfiler:
+    """
+    规则级分析器
+
+    示例：
+        profiler = RuleProfiler()
+        with profiler.instrument(["language.IDN"]):
+            for text in texts:
+                normalizer(text)
+        print(profiler.format_report(top=20))
+    """
+
+    def __init__(self):
+        self.rules: dict[str, RuleStats] = {}
+        self._restore: list[tuple[object, str, object]] = []
+
+    # ---------- 统计对象 ----------
+
+    def _rule(self, rule: str) -> RuleStats:
+        stats = self.rules.get(rule)
+        if stats is None:
+            stats = self.rules[rule] = RuleStats(rule)
+        return stats
+
+    def wrap_pattern(self, owner: str, pattern, name: str | None = None) -> ProfiledPattern:
+        """
+        包装编译正则；同一模块内 pattern 字符串与 flags 相同的正则归为同一规则
+        """
+        label = name or _label(pattern)
+        rule = f"{owner}:{label}"
+        if name is None and pattern.flags:
+            rule += f" /{pattern.flags}"
+        return ProfiledPattern(pattern, self._rule(rule))
+
+    def _wrap_table(self, owner: str, name: str, table: ReplacementTable) -> ProfiledTable:
+        stats = [self._rule(f"{owner}:{name}[{old!r}]") for old, _ in table.pairs]
+        return ProfiledTable(table, stats)
+
+    def _wrap_global(self, owner: str, name: str, value):
+        """
+        按类型包装模块全局变量；无需包装时返回 None
+        """
+        if isinstance(value, types.ModuleType) and value.__name__ in ("re", "regex"):
+            return ProfiledRe(value, self, owner)
+        if isinstance(value, ReplacementTable) and not isinstance(value, ProfiledTable):
+            return self._wrap_table(owner, name, value)
+        if _is_pattern(value):
+            return self.wrap_pattern(owner, value, name)
+        # 规则列表：元素为含编译正则的 tuple，如 [(pattern, replacement), ...]
+        if isinstance(value, (list, tuple)) and value and all(
+            isinstance(item, tuple) and any(_is_pattern(x) for x in item) for item in value
+        ):
+            return type(value)(
+                tuple(self.wrap_pattern(owner, x) if _is_pattern(x) else x for x in item)
+                for item in value
+            )
+        return None
+
+    # ---------- 安装与还原 ----------
+
+    def instrument(self, modules: Iterable[str]) -> "RuleProfiler":
+        """
+        替换指定模块的正则与替换表（可作为上下文管理器，退出时还原）
+        """
+        for module_path in modules:
+            module = import_module(module_path)
+            # 先完成延迟加载，避免分析期间才编译的正则被代理后遗留在模块中
+            ensure_loaded = getattr(module, "_ensure_loaded", None)
+            if ensure_loaded is not None:
+                ensure_loaded()
+            for name, value in list(vars(module).items()):
+                if name.startswith("__"):
+                    continue
+                wrapped = self._wrap_global(module_path, name, value)
+                if wrapped is not None:
+                    setattr(module, name, wrapped)
+                    self._restore.append((module, name, value))
+        return self
+
+    def restore(self) -> None:
+        while self._restore:
+            module, name, value = self._restore.pop()
+            setattr(module, name, value)
+
+    def __enter__(self) -> "RuleProfiler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.restore()
+
+    # ---------- 报告 ----------
+
+    def report(self) -> list[dict]:
+        """
+        按累计耗时倒序返回各规则统计
+        """
+        rows = [stats.as_dict() for stats in self.rules.values()]
+        rows.sort(key=lambda row: row["time"], reverse=True)
+        return rows
+
+    def format_report(self, top: int | None = None) -> str:
+        rows = self.report()
+        total = sum(row["time"] for row in rows) or 1.0
+        lines = [
+            f"{'time(ms)':>10} {'share':>6} {'calls':>8} {'hits':>8} "
+            f"{'matches':>8} {'changed':>8}  rule"
+        ]
+        for row in rows[:top]:
+            lines.append(
+                f"{row['time'] * 1000:>10.2f} {row['time'] / total:>6.1%} {row['calls']:>8} "
+                f"{row['hits']:>8} {row['matches']:>8} {row['changed']:>8}  {row['rule']}"
+            )
+        never = sum(1 for row in rows if row["calls"] and not row["hits"])
+        lines.append(f"rules: {len(rows)}, never matched: {never}, total: {total * 1000:.2f} ms")
+        return "\n".join(lines)
+
+
+def profile_rules(
+    language: str,
+    dataset: str | None,
+    texts: Sequence[str],
+) -> RuleProfiler:
+    """
+    对给定语料执行一遍流水线，返回各 dataset / language 模块的规则统计
+    """
+    normalizer = get_normalizer(language, dataset)
+    modules = [stage.name for stage in normalizer.stages if stage.name != "final_clean"]
+
+    profiler = RuleProfiler()
+    with profiler.instrument(modules):
+        for text in texts:
+            try:
+                normalizer._run(text)
+            except Exception:
+                continue
+    return profiler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="规则级性能分析（耗时 / 匹配次数 / 改动字符数）")
+    parser.add_argument("--language", required=True)
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--input", help="每行一条文本；不指定时使用 benchmark 固定语料")
+    parser.add_argument("--size", type=int, default=2000, help="固定语料条数")
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.rstrip("\n") for line in f]
+    else:
+        from benchmark.corpora import build_corpus
+
+        texts = build_corpus(args.language, args.dataset, size=args.size)
+
+    profiler = profile_rules(args.language, args.dataset, texts)
+    print(f"{args.language}/{args.dataset}: {len(texts)} texts", file=sys.stderr)
+    print(profiler.format_report(top=args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+按文字自动路由语言（无语言标签的转写）
+
+用途：
+- 部分识别结果没有语言标签，按文本的主要文字（Script）选择默认的 language 流水线
+
+做法：
+- 码位 → 文字查找表由 runtime/charclass.py 按 regex Script 属性扫描全部码位得到
+  （与字符分类表一起缓存在磁盘），文字：arabic / hangul / kana / han / thai / latin
+- 有 numpy 时整批向量化：文本拼接后编码为 UTF-32，查表得到每个码位的文字，
+  再用 bincount 一次得到每行的文字直方图；扫描开销远小于规范化本身
+- 没有 numpy 时逐行用 regex 统计各文字字符数，结果相同
+- 主要文字：字符数最多的文字，假名与汉字合并比较（日文混用两者），
+  合并后胜出时含假名判为 kana（日语），否则为 han（中文）；不含任何上述文字的行无法识别
+- 路由表（文字 → 语言代码）可配置，默认见 DEFAULT_ROUTES；
+  阿拉伯文与拉丁文对应多种语言 / 方言，默认只能选其一，需要时按数据来源传入 routes
+
+示例：
+    from main import normalize_routed
+
+    outputs = normalize_routed(texts, routes={"arabic": "EGY"}, default="USA", jobs=8)
+"""
+
+import sys
+from typing import Mapping, Sequence
+
+import regex as re
+
+from main import _registry_key
+from runtime.charclass import SCRIPT_PATTERNS, load_char_classes
+from runtime.manifest import normalize_grouped
+from runtime.pool import BatchResult
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+# 文字名称，直方图第 0 列为“其他”，第 i 列为 SCRIPTS[i - 1]
+SCRIPTS = tuple(SCRIPT_PATTERNS)
+
+# 默认路由：文字 → 语言代码
+DEFAULT_ROUTES = {
+    "arabic": "SAU",
+    "hangul": "KOR",
+    "kana": "JPN",
+    "han": "CHN",
+    "thai": "THA",
+    "latin": "USA",
+}
+
+# 向量化时每次拼接的行数（限制 UTF-32 缓冲区大小）
+ROUTE_BLOCK = 1 << 16
+
+_ARABIC, _HANGUL, _KANA, _HAN, _THAI, _LATIN = range(1, len(SCRIPTS) + 1)
+
+# 参与比较的列：假名与汉字合并为一列
+_CJK = -1
+_CANDIDATES = (_ARABIC, _HANGUL, _CJK, _THAI, _LATIN)
+
+_SCRIPT_LUT = None
+
+_SCRIPT_REGEXES = [re.compile(pattern) for pattern in SCRIPT_PATTERNS.values()]
+
+
+def _script_lut():
+    """
+    首次使用时构建码位 → 文字编号查找表（uint8，长度为全部码位数）
+    """
+    global _SCRIPT_LUT
+
+    if _SCRIPT_LUT is None:
+        scripts = load_char_classes()["scripts"]
+        lut = np.zeros(sys.maxunicode + 1, dtype=np.uint8)
+        for number, name in enumerate(SCRIPTS, 1):
+            for start, end in scripts[name]:
+                lut[start:end + 1] = number
+        _SCRIPT_LUT = lut
+
+    return _SCRIPT_LUT
+
+
+def _histogram_vectorized(texts: list[str]) -> "np.ndarray":
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    width = len(SCRIPTS) + 1
+    if int(lengths.sum()) == 0:
+        return np.zeros((len(texts), width), dtype=np.int64)
+
+    cps = np.frombuffer(
+        "".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32,
+    )
+    codes = _script_lut()[cps]
+    row_ids = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    counts = np.bincount(row_ids * width + codes, minlength=len(texts) * width)
+    return counts.reshape(len(texts), width)
+
+
+def _histogram_array(texts: Sequence[str]) -> "np.ndarray":
+    """
+    整批文字直方图（numpy），按 ROUTE_BLOCK 行分段拼接；非 str 行全为 0
+    """
+    hist = np.zeros((len(texts), len(SCRIPTS) + 1), dtype=np.int64)
+    valid = [i for i, text in enumerate(texts) if type(text) is str]
+    for block in range(0, len(valid), ROUTE_BLOCK):
+        positions = valid[block:block + ROUTE_BLOCK]
+        hist[positions] = _histogram_vectorized([texts[i] for i in positions])
+    return hist
+
+
+def script_histogram(texts: Sequence[str]) -> list[list[int]]:
+    """
+    每行各文字的字符数
+
+    返回：
+        [[其他, arabic, hangul, kana, han, thai, latin], ...]；非 str 行全为 0
+    """
+    if np is not None:
+        return _histogram_array(texts).tolist()
+
+    rows = []
+    for text in texts:
+        if type(text) is not str:
+            rows.append([0] * (len(SCRIPTS) + 1))
+            continue
+        counts = [len(pattern.findall(text)) for pattern in _SCRIPT_REGEXES]
+        rows.append([len(text) - sum(counts)] + counts)
+    return rows
+
+
+def _dominant(row: list[int]) -> str | None:
+    best = None
+    best_count = 0
+    for column in _CANDIDATES:
+        count = row[_KANA] + row[_HAN] if column == _CJK else row[column]
+        if count > best_count:
+            best, best_count = column, count
+    if best is None:
+        return None
+    if best == _CJK:
+        return "kana" if row[_KANA] else "han"
+    return SCRIPTS[best - 1]
+
+
+def _dominant_array(hist: "np.ndarray") -> list[str | None]:
+    """
+    _dominant 的向量化版本（并列时同样取 _CANDIDATES 中靠前的文字）
+    """
+    columns = [
+        hist[:, _KANA] + hist[:, _HAN] if column == _CJK else hist[:, column]
+        for column in _CANDIDATES
+    ]
+    matrix = np.stack(columns, axis=1)
+    winner = matrix.argmax(axis=1)
+    names = np.array(
+        [None if column == _CJK else SCRIPTS[column - 1] for column in _CANDIDATES],
+        dtype=object,
+    )
+    result = names[winner]
+
+    cjk = winner == _CANDIDATES.index(_CJK)
+    result[cjk] = np.where(hist[cjk, _KANA] > 0, "kana", "han")
+    result[matrix.max(axis=1) == 0] = None
+    return result.tolist()
+
+
+def detect_scripts(texts: Sequence[str]) -> list[str | None]:
+    """
+    每行的主要文字；无法识别（不含任何已知文字或非 str）时为 None
+    """
+    if np is not None:
+        return _dominant_array(_histogram_array(texts))
+    return [_dominant(row) for row in script_histogram(texts)]
+
+
+def route_texts(
+    texts: Sequence[str],
+    routes: Mapping[str, str] | None = None,
+    default: str | None = None,
+) -> list[str | None]:
+    """
+    每行路由到的语言代码
+
+    参数：
+        routes: 覆盖 DEFAULT_ROUTES 中的部分条目，如 {"arabic": "EGY"}
+        default: 无法识别或路由表中没有对应文字时使用的语言代码；None 表示不路由
+    """
+    table = {**DEFAULT_ROUTES, **(routes or {})}
+    return [
+        table.get(script, default) if script is not None else default
+        for script in detect_scripts(texts)
+    ]
+
+
+def normalize_routed(
+    texts: Sequence[str],
+    dataset: str | None = None,
+    routes: Mapping[str, str] | None = None,
+    default: str | None = None,
+    jobs: int | None = None,
+    chunksize: int | None = None,
+    errors: str = "record",
+    backend: str = "process",
+) -> BatchResult:
+    """
+    按主要文字路由语言后批量规范化
+
+    - 按路由结果分组，各组交给对应 Normalizer，调度与 normalize_manifest 相同
+    - 未能路由的行记为失败（输出 None）
+
+    参数：
+        dataset: 所有行共用的数据集名称
+        routes / default: 同 route_texts
+        其余参数同 normalize_manifest
+
+    返回：
+        BatchResult：与输入顺序一致；result.groups 给出每种语言的行数与代价
+    """
+    languages = route_texts(texts, routes, default)
+
+    failures = {}
+    keys = []
+    for index, language in enumerate(languages):
+        if language is None:
+            failures[index] = "ValueError: 无法按文字识别语言，且未指定 default"
+            keys.append(None)
+        else:
+            keys.append(_registry_key(language, dataset))
+
+    return normalize_grouped(keys, texts, jobs, chunksize, errors, backend, failures)
@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+"""
+本地规范化服务（asyncio，微批）
+
+用途：
+- 在线评测 worker 每解码一条就要规范化一次，各自导入 / 预热代价高；
+  常驻服务持有已加载的 get_normalizer 流水线，worker 通过本地 socket 调用
+
+用法（仓库根目录）：
+    python -m runtime.server --unix /tmp/textnorm.sock --preload IDN,VNM/magicdata --jobs 4
+    python -m runtime.server --port 8765 --max-batch 256 --max-delay-ms 5
+
+协议（JSON lines，每行一个请求 / 响应，同一连接可流水线发送，按 id 对应）：
+    {"id": 1, "language": "IDN", "dataset": "magicdata", "text": "..."}
+        → {"id": 1, "output": "..."}
+    {"id": 2, "language": "IDN", "texts": ["...", "..."]}
+        → {"id": 2, "outputs": ["...", null], "errors": {"1": "异常类型: 信息"}}
+    {"id": 3, "op": "metrics"}  → {"id": 3, "metrics": {...}}
+    {"id": 4, "op": "ping"}     → {"id": 4, "ok": true}
+    请求本身无效（JSON 错误、缺少字段、语言模块加载失败）时返回 {"id": ..., "error": "..."}
+
+执行方式：
+- 同一 (language, dataset) 的并发请求在 --max-delay-ms 内合并为一个微批（最多 --max-batch 行），
+  整批提交到常驻进程池 / 线程池（见 runtime/pool.py、runtime/threads.py）执行；
+  同时执行的微批数上限为 2 * jobs
+- 背压：排队与执行中的行数达到 --max-pending 时暂停读取各连接的新请求，
+  客户端的发送随 socket 缓冲区填满而阻塞，服务内存有上限
+- 指标（op=metrics）：请求数、行数、微批数与平均大小、失败数、当前 / 峰值排队行数、
+  执行中微批数、最近请求延迟 p50 / p99、运行时长
+- worker 异常退出（OOM、段错误）时按已加载的全部组合重建进程池，并将受影响的微批重试一次；
+  重试仍失败的微批整批记为失败，之后的请求使用新的进程池（指标 pool_rebuilds）
+- SIGTERM / SIGINT 时优雅退出：停止接受新连接，已收到的请求执行完并写回响应后再关闭
+
+客户端见 runtime/client.py（只依赖标准库，不导入规则模块）。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor
+
+from main import _registry_key, get_normalizer
+from runtime.pool import _normalize_chunk, _resolve_jobs, _run_chunk, get_pool, reset_pool
+from runtime.pool import _submit as _submit_task
+
+
+# 默认微批参数
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_DELAY = 0.005
+DEFAULT_MAX_PENDING = 10_000
+
+# 单个请求行的最大字节数
+MAX_LINE_BYTES = 16 << 20
+
+# 延迟分位数基于最近的请求数
+_LATENCY_WINDOW = 4096
+
+
+class _Metrics:
+    """
+    服务指标
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.failures = 0
+        self.invalid = 0
+        self.connections = 0
+        self.max_pending = 0
+        self.pool_rebuilds = 0
+        self.latencies: deque = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self, pending: int, inflight: int) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))]
+
+        return {
+            "uptime": time.monotonic() - self.started,
+            "connections": self.connections,
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "mean_batch": self.batch_rows / self.batches if self.batches else 0.0,
+            "failures": self.failures,
+            "invalid_requests": self.invalid,
+            "pending_rows": pending,
+            "max_pending_rows": self.max_pending,
+            "inflight_batches": inflight,
+            "pool_rebuilds": self.pool_rebuilds,
+            "latency_p50_ms": percentile(50) * 1e3,
+            "latency_p99_ms": percentile(99) * 1e3,
+        }
+
+
+class _Batcher:
+    """
+    单个 (language, dataset) 的微批收集器
+    """
+
+    def __init__(self, server: "NormalizeServer", key: tuple):
+        self.server = server
+        self.key = key
+        self.items: list[tuple[list, asyncio.Future]] = []
+        self.rows = 0
+        self.timer: asyncio.TimerHandle | None = None
+
+    def add(self, texts: list) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.items.append((texts, future))
+        self.rows += len(texts)
+        if self.rows >= self.server.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(
+                self.server.max_delay, self.flush,
+            )
+        return future
+
+    def flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.items:
+            return
+        items, self.items, self.rows = self.items, [], 0
+        self.server._spawn(self.server._run_batch(self.key, items))
+
+
+class NormalizeServer:
+    """
+    微批规范化服务
+
+    参数：
+        jobs (int | None): worker 数量；None 或 <= 0 表示 CPU 核数
+        backend (str): "process" 常驻进程池；"thread" 常驻线程池
+        max_batch (int): 单个微批最多行数
+        max_delay (float): 微批最长等待秒数（延迟预算）
+        max_pending (int): 排队与执行中的行数上限，达到后暂停读取新请求
+    """
+
+    def __init__(
+        self,
+        jobs: int | None = None,
+        backend: str = "process",
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        if backend not in ("process", "thread"):
+            raise ValueError("backend 只能是 'process' 或 'thread'")
+        self.jobs = _resolve_jobs(jobs)
+        self.backend = backend
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self.max_pending = max(self.max_batch, max_pending)
+
+        self.metrics = _Metrics()
+        self.pending = 0
+        self.inflight = 0
+        self._batchers: dict[tuple, _Batcher] = {}
+        self._tasks: set = set()
+        self._capacity: asyncio.Condition | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._closing = False
+        self._readers: set = set()
+        # 最近使用的进程池，用于统计重建次数
+        self._pool = None
+
+    # -----------------------------
+    # 执行
+    # -----------------------------
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _submit(self, key: tuple, texts: list) -> tuple:
+        """
+        提交一个微批，返回 (进程池, future)；线程后端的进程池为 None
+        """
+        if self.backend == "thread":
+            from runtime.threads import get_thread_pool
+
+            return None, get_thread_pool(self.jobs).submit(
+                _normalize_chunk, get_normalizer(*key), texts,
+            )
+        # 新建（或重建）进程池时预加载所有已出现过的组合；损坏的进程池由 get_pool 替换
+        pool = get_pool(self.jobs, keys=list(self._batchers) or [key])
+        if pool is not self._pool:
+            if self._pool is not None:
+                self.metrics.pool_rebuilds += 1
+            self._pool = pool
+        # 提交时进程池已损坏同样通过 future 报告，调用方统一按 BrokenExecutor 处理
+        return pool, _submit_task(pool, _run_chunk, key, 0, texts)
+
+    async def _run_batch(self, key: tuple, items: list) -> None:
+        texts = [text for chunk, _ in items for text in chunk]
+        async with self._slots:
+            self.inflight += 1
+            try:
+                for attempt in range(2):
+                    pool, future = self._submit(key, texts)
+                    try:
+                        result = await asyncio.wrap_future(future)
+                    except BrokenExecutor:
+                        # 同一时刻在途的微批都会失败：丢弃损坏的进程池（只丢弃一次），
+                        # 重试时 _submit 重建
+                        if self.backend == "thread" or attempt:
+                            raise
+                        reset_pool(pool)
+                        continue
+                    break
+                outputs, failures = result if self.backend == "thread" else result[1:]
+            except Exception as exc:
+                # worker 异常（如进程崩溃）且重试仍失败：整批失败，之后的请求使用重建的进程池
+                if isinstance(exc, BrokenExecutor) and self.backend != "thread":
+                    reset_pool(pool)
+                outputs = [None] * len(texts)
+                failures = {i: f"{type(exc).__name__}: {exc}" for i in range(len(texts))}
+            finally:
+                self.inflight -= 1
+
+        self.metrics.batches += 1
+        self.metrics.batch_rows += len(texts)
+        self.metrics.failures += len(failures)
+
+        offset = 0
+        for chunk, future in items:
+            end = offset + len(chunk)
+            chunk_failures = {i - offset: failures[i] for i in range(offset, end) if i in failures}
+            if not future.done():
+                future.set_result((outputs[offset:end], chunk_failures))
+            offset = end
+
+    async def _acquire(self, rows: int) -> None:
+        """
+        背压：排队行数超出上限时等待（单个请求超过上限时只等到队列为空）
+        """
+        async with self._capacity:
+            await self._capacity.wait_for(
+                lambda: self.pending == 0 or self.pending + rows <= self.max_pending
+            )
+            self.pending += rows
+            self.metrics.max_pending = max(self.metrics.max_pending, self.pending)
+
+    async def _release(self, rows: int) -> None:
+        async with self._capacity:
+            self.pending -= rows
+            self._capacity.notify_all()
+
+    async def normalize(self, language: str, dataset: str | None, texts: list) -> tuple[list, dict]:
+        """
+        提交一组文本到对应的微批，返回 (outputs, failures)
+        """
+        key = _registry_key(language, dataset)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            # 首次出现的组合：在线程中加载，加载失败直接抛出给请求方
+            await asyncio.get_running_loop().run_in_executor(None, get_normalizer, *key)
+            batcher = self._batchers.setdefault(key, _Batcher(self, key))
+        return await batcher.add(texts)
+
+    # -----------------------------
+    # 连接处理
+    # -----------------------------
+
+    async def _handle_request(self, request: dict, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        started = time.perf_counter()
+        rid = request.get("id")
+        single = "text" in request
+        texts = [request["text"]] if single else request.get("texts")
+        rows = len(texts) if isinstance(texts, list) else 0
+
+        try:
+            try:
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("需要字符串字段 text 或字符串列表 texts")
+                language = request.get("language")
+                if not isinstance(language, str):
+                    raise ValueError("需要字符串字段 language")
+                outputs, failures = await self.normalize(language, request.get("dataset"), texts)
+            except Exception as exc:
+                self.metrics.invalid += 1
+                response = {"id": rid, "error": f"{type(exc).__name__}: {exc}"}
+            else:
+                self.metrics.rows += rows
+                if single:
+                    response = {"id": rid, "output": outputs[0]}
+                    if failures:
+                        response["error"] = failures[0]
+                else:
+                    response = {"id": rid, "outputs": outputs}
+                    if failures:
+                        response["errors"] = {str(i): message for i, message in failures.items()}
+
+            self.metrics.latencies.append(time.perf_counter() - started)
+            await self._write(writer, lock, response)
+        finally:
+            # 响应写回后才释放名额，优雅退出时等待 pending 归零即可保证响应已发出
+            await self._release(rows)
+
+    async def _write(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, response: dict) -> None:
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+        async with lock:
+            try:
+                writer.write(data)
+                await writer.drain()
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.metrics.connections += 1
+        self._readers.add(asyncio.current_task())
+        lock = asyncio.Lock()
+        tasks: set = set()
+        try:
+            while not self._closing:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # 单行超过 MAX_LINE_BYTES 或连接异常
+                    break
+                except asyncio.CancelledError:
+                    # 优雅退出时取消空闲连接的读取
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("请求必须是 JSON 对象")
+                except ValueError as exc:
+                    self.metrics.invalid += 1
+                    await self._write(writer, lock, {"id": None, "error": f"ValueError: {exc}"})
+                    continue
+
+                self.metrics.requests += 1
+                op = request.get("op")
+                if op == "metrics":
+                    await self._write(writer, lock, {"id": request.get("id"), "metrics": self.stats()})
+                    continue
+                if op == "ping":
+                    await self._write(writer, lock, {"id": request.get("id"), "ok": True})
+                    continue
+
+                texts = request.get("texts")
+                rows = 1 if "text" in request else len(texts) if isinstance(texts, list) else 0
+                # 背压：等待排队行数回落后才读取下一个请求
+                await self._acquire(rows)
+                task = asyncio.get_running_loop().create_task(
+                    self._handle_request(request, writer, lock)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            # 连接关闭前写回已收到请求的响应
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._readers.discard(asyncio.current_task())
+            self.metrics.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, RuntimeError):
+                pass
+
+    # -----------------------------
+    # 启动与关闭
+    # -----------------------------
+
+    def stats(self) -> dict:
+        return self.metrics.snapshot(self.pending, self.inflight)
+
+    async def start(
+        self,
+        unix_path: str | None = None,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+    ) -> None:
+        """
+        开始监听：指定 unix_path 时使用 Unix socket，否则监听 host:port
+        """
+        self._capacity = asyncio.Condition()
+        self._slots = asyncio.Semaphore(2 * self.jobs)
+
+        if unix_path is not None:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=unix_path, limit=MAX_LINE_BYTES,
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host=host, port=port or 0, limit=MAX_LINE_BYTES,
+            )
+        self.unix_path = unix_path
+
+    @property
+    def address(self):
+        """
+        实际监听地址：Unix socket 路径或 (host, port)
+        """
+        if self._server is None:
+            return None
+        return self._server.sockets[0].getsockname()
+
+    async def shutdown(self, timeout: float = 30.0) -> None:
+        """
+        优雅退出：停止接受新连接，执行完已收到的请求，写回响应后关闭连接
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+
+        for batcher in self._batchers.values():
+            batcher.flush()
+
+        deadline = time.monotonic() + timeout
+        while (self.pending or self._tasks) and time.monotonic() < deadline:
+            for batcher in self._batchers.values():
+                batcher.flush()
+            await asyncio.sleep(0.01)
+
+        readers = list(self._readers)
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+    async def serve(
+        self,
+        unix_path: str | None = None,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+    ) -> None:
+        """
+        启动并运行到收到 SIGTERM / SIGINT，然后优雅退出
+        """
+        await self.start(unix_path, host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        print(f"listening on {self.address}", file=sys.stderr, flush=True)
+        await stop.wait()
+        print("shutting down", file=sys.stderr, flush=True)
+        await self.shutdown()
+
+
+def _parse_preload(value: str | None) -> list[tuple[str, str | None]]:
+    """
+    "IDN,VNM/magicdata" → [("IDN", None), ("VNM", "magicdata")]
+    """
+    combos = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        language, _, dataset = item.partition("/")
+        combos.append((language, dataset or None))
+    return combos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--unix", help="Unix socket 路径")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--preload", help="预热的组合，如 IDN,VNM/magicdata")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker 数量，默认 CPU 核数")
+    parser.add_argument("--backend", choices=("process", "thread"), default="process")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY * 1e3)
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING)
+    args = parser.parse_args()
+
+    # 在创建进程池之前预热，fork 出的 worker 共享已加载的规则表（见 runtime/warmup.py）
+    combos = _parse_preload(args.preload)
+    if combos:
+        from runtime.warmup import warmup
+
+        for language, dataset in combos:
+            warmup([language], [dataset])
+
+    server = NormalizeServer(
+        jobs=args.jobs,
+        backend=args.backend,
+        max_batch=args.max_batch,
+        max_delay=args.max_delay_ms / 1e3,
+        max_pending=args.max_pending,
+    )
+    if args.backend == "process":
+        get_pool(server.jobs, keys=[_registry_key(*combo) for combo in combos])
+
+    asyncio.run(server.serve(args.unix, args.host, None if args.unix else args.port))
+
+
+if __name__ == "__main__":
+    main()
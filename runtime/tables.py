@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+字面量替换表
+
+用途：
+- 替代规则模块中 "dict + 每次调用排序 + 循环 str.replace" 的写法：
+  排序在模块加载时完成一次，执行时按固定顺序依次替换
+- 作为可识别的规则对象，便于逐条统计（见 runtime/profiler.py）
+"""
+
+from typing import Iterable
+
+
+class ReplacementTable:
+    """
+    按顺序执行的字面量替换表（str.replace），顺序即优先级
+
+    参数：
+        pairs (Iterable[tuple[str, str]]): (原文, 替换) 序列，已按优先级排列
+    """
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: Iterable[tuple[str, str]]):
+        self.pairs = tuple(pairs)
+
+    @classmethod
+    def longest_first(cls, mapping: dict[str, str]) -> "ReplacementTable":
+        """
+        按原文长度倒序构建（等长时保持 dict 插入顺序），避免短词先替换破坏长词
+        """
+        return cls(sorted(mapping.items(), key=lambda x: len(x[0]), reverse=True))
+
+    def __call__(self, text: str) -> str:
+        for old, new in self.pairs:
+            text = text.replace(old, new)
+        return text
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def __repr__(self) -> str:
+        return f"ReplacementTable({len(self.pairs)} pairs)"
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+线程池批量后端
+
+职责：
+- 在常驻 ThreadPoolExecutor 中执行 get_normalizer 流水线
+- 省去进程池的进程启动与 pickle 开销
+
+说明：
+- regex 包在匹配 str 时默认释放 GIL（等价于 concurrent=True，且无额外拷贝），
+  因此 ARE / DZA / MAR / SAU / MYS / dataset 模块与 final_clean 的匹配阶段可以多核并行；
+  各模块的热点正则已在模块级预编译，减少持有 GIL 的 Python 层开销
+- 标准库 re 的匹配不释放 GIL，这些语言在普通 CPython 上线程后端无加速，
+  但结果正确；在 free-threaded CPython（无 GIL）上同样可以并行
+- 流水线本身无共享可变状态，注册表访问由锁保护
+"""
+
+import atexit
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+from main import get_normalizer
+from runtime.pool import _normalize_chunk
+
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_JOBS = 0
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def gil_enabled() -> bool:
+    """
+    当前解释器是否启用 GIL（free-threaded 构建返回 False）
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def get_thread_pool(jobs: int) -> ThreadPoolExecutor:
+    """
+    获取常驻线程池，线程数不变时复用
+    """
+    global _EXECUTOR, _EXECUTOR_JOBS
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None and _EXECUTOR_JOBS == jobs:
+            return _EXECUTOR
+
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=True)
+
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=jobs,
+            thread_name_prefix="textnorm",
+        )
+        _EXECUTOR_JOBS = jobs
+        return _EXECUTOR
+
+
+def shutdown_thread_pool() -> None:
+    """
+    关闭常驻线程池（进程退出时自动调用）
+    """
+    global _EXECUTOR, _EXECUTOR_JOBS
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=True)
+        _EXECUTOR = None
+        _EXECUTOR_JOBS = 0
+
+
+atexit.register(shutdown_thread_pool)
+
+
+def run_threaded(
+    key: tuple,
+    texts: Sequence[str],
+    jobs: int,
+    chunksize: int,
+    mode: str = "row",
+) -> tuple[list, dict]:
+    """
+    按块提交到线程池，按提交顺序收集结果
+
+    返回：
+        (outputs, failures)，与 runtime.pool._normalize_chunk 相同
+    """
+    # 在提交前构建好 Normalizer，避免多个线程同时首次加载
+    normalizer = get_normalizer(*key)
+    pool = get_thread_pool(jobs)
+
+    futures = [
+        pool.submit(_normalize_chunk, normalizer, texts[start:start + chunksize], start, mode)
+        for start in range(0, len(texts), chunksize)
+    ]
+
+    outputs = []
+    failures = {}
+    for future in futures:
+        chunk_outputs, chunk_failures = future.result()
+        outputs.extend(chunk_outputs)
+        failures.update(chunk_failures)
+
+    return outputs, failures
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy 向量化 final_clean（可选后端）
+
+原理：
+- 整批文本拼接后编码为 UTF-32，得到一个码位数组
+- 通过码位分类查找表（见 runtime/charclass.py）一次性判断标点 / 符号 / 空白
+- 标点与符号视为空格；每段空白只保留第一个字符并替换为空格，
+  同时去掉每条文本的首尾空白
+- 整批只解码一次，再按每条的新长度切回
+
+说明：
+- 依赖 numpy，未安装时调用 final_clean_batch 抛出 ImportError
+- 非 str 或含空白差异字符（如 \\x1c-\\x1f）的行回退为逐条 final_clean，
+  保证与 main.final_clean 逐字节一致
+"""
+
+import sys
+from typing import Sequence
+
+from main import _punct_tables, final_clean
+from runtime.charclass import load_char_classes
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+# 码位分类查找表：0 = 其他，1 = 标点 / 符号 / 空白（统一视为空格）
+_SPACE_LUT = None
+
+
+def _space_lut():
+    """
+    首次使用时构建查找表（uint8，长度为全部码位数）
+    """
+    global _SPACE_LUT
+
+    if _SPACE_LUT is None:
+        classes = load_char_classes()
+        lut = np.zeros(sys.maxunicode + 1, dtype=np.uint8)
+        for start, end in classes["punct"] + classes["space"]:
+            lut[start:end + 1] = 1
+        _SPACE_LUT = lut
+
+    return _SPACE_LUT
+
+
+def _needs_scalar(text) -> bool:
+    """
+    需要回退到逐条 final_clean 的行
+    """
+    if type(text) is not str:
+        return True
+    return not text.isprintable() and _punct_tables()[1].search(text) is not None
+
+
+def _clean_vectorized(texts: list[str]) -> list[str]:
+    """
+    对不含空白差异字符的 str 列表执行向量化清理
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    total = int(lengths.sum())
+    if total == 0:
+        return [""] * len(texts)
+
+    joined = "".join(texts)
+    cps = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    nonempty = lengths > 0
+
+    # 标点 / 符号 / 空白
+    space = _space_lut()[cps].astype(bool)
+
+    # 前一个字符是否为空白；每行开头视为前面是空白，从而去掉行首空白
+    prev_space = np.empty_like(space)
+    prev_space[0] = True
+    prev_space[1:] = space[:-1]
+    prev_space[starts[nonempty]] = True
+
+    # 每段空白只保留第一个
+    keep = ~space | ~prev_space
+
+    # 去掉行尾空白：位置在该行最后一个非空白字符之后的空白
+    row_ids = np.repeat(np.arange(len(texts)), lengths)
+    positions = np.arange(total)
+    last_solid = np.full(len(texts), -1, dtype=np.int64)
+    solid = np.where(space, -1, positions)
+    last_solid[nonempty] = np.maximum.reduceat(solid, starts[nonempty])
+    keep &= ~(space & (positions > last_solid[row_ids]))
+
+    out = np.where(space, np.uint32(32), cps)[keep]
+
+    new_lengths = np.zeros(len(texts), dtype=np.int64)
+    new_lengths[nonempty] = np.add.reduceat(keep.astype(np.int64), starts[nonempty])
+
+    decoded = out.tobytes().decode("utf-32-le", "surrogatepass")
+
+    results = []
+    offset = 0
+    for length in new_lengths.tolist():
+        results.append(decoded[offset:offset + length])
+        offset += length
+    return results
+
+
+def final_clean_batch(texts: Sequence[str]) -> list[str]:
+    """
+    批量 final_clean（NumPy 向量化）
+
+    参数：
+        texts (Sequence[str]): 待清理文本
+
+    返回：
+        list[str]: 与逐条调用 main.final_clean 完全一致的结果
+
+    异常：
+        ImportError: 未安装 numpy
+        与 final_clean 相同：非 str 输入时抛出对应异常
+    """
+    if np is None:
+        raise ImportError("final_clean_batch 需要 numpy，请执行: pip install numpy")
+
+    results = [None] * len(texts)
+    vector_index = []
+    vector_texts = []
+
+    for index, text in enumerate(texts):
+        if _needs_scalar(text):
+            results[index] = final_clean(text)
+        else:
+            vector_index.append(index)
+            vector_texts.append(text)
+
+    if vector_texts:
+        for index, cleaned in zip(vector_index, _clean_vectorized(vector_texts)):
+            results[index] = cleaned
+
+    return results
+
+
+def normalize_vectorized(
+    normalizer,
+    texts: Sequence[str],
+    start: int = 0,
+) -> tuple[list, dict]:
+    """
+    前面各阶段逐条执行，最后的 final_clean 整块向量化执行
+
+    返回：
+        (outputs, failures)，与 runtime.pool._normalize_rows 相同
+    """
+    *head, last = normalizer.stages
+
+    outputs = []
+    failures = {}
+    pending = []
+
+    for offset, text in enumerate(texts):
+        try:
+            for stage in head:
+                text = stage.func(text)
+            # 非 str 结果在此逐条执行，保持与逐条模式相同的异常
+            if type(text) is not str:
+                text = last.func(text)
+            else:
+                pending.append(offset)
+            outputs.append(text)
+        except Exception as exc:
+            outputs.append(None)
+            failures[start + offset] = f"{type(exc).__name__}: {exc}"
+
+    if pending:
+        cleaned = final_clean_batch([outputs[offset] for offset in pending])
+        for offset, text in zip(pending, cleaned):
+            outputs[offset] = text
+
+    return outputs, failures
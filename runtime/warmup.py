@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+预热与 fork 友好的预加载
+
+用途：
+- 在创建进程池（fork）之前，于父进程中一次性完成：
+  1. 导入各 dataset / language 模块并构建 Normalizer
+  2. 加载延迟资源（IDN 的 TSV 表与货币 / 度量衡 / 时区正则、VNM 的 underthesea 等）
+  3. 用一段校准文本走一遍每条流水线，触发函数内正则的编译缓存等首次调用开销
+  4. 计算流水线指纹
+  5. gc.freeze()：把以上对象移出分代 GC，
+     fork 出的 worker 不会因 GC 扫描写入这些对象所在的内存页，按 copy-on-write 共享
+- 之后 fork 的 worker 直接继承注册表与已加载的规则表，无需各自重建
+
+示例：
+    from main import warmup, normalize_batch
+
+    report = warmup(["IDN", "VNM"], [None, "magicdata"])
+    print(report["shared_bytes"])        # 约等于每个 worker 节省的内存
+    normalize_batch(texts, "IDN", jobs=8)
+
+说明：
+- 内存节省按预热前后的 RSS 差值估算：这部分对象由父进程构建，
+  fork 后各 worker 共享，否则每个 worker 都要各自构建一份
+- 只有 fork 启动方式的进程池能共享；spawn / forkserver 下预热只对当前进程有效
+"""
+
+import gc
+import os
+import pkgutil
+import sys
+import time
+from typing import Iterable
+
+from main import get_normalizer
+
+
+# 校准文本：覆盖各模块常见触发内容（标签、数字、金额、日期、时区、URL、邮箱、各文字）
+CALIBRATION_TEXTS = (
+    "Hello world 123 [LAUGHTER] + [breath] #erm",
+    "Harganya Rp 50.000 dan 2.5 kg, jam 14:30 WIB (12/05/2024)",
+    "Email test@test.com https://example.com/page ok 'yung",
+    "الله يسلمك ٢٠٢٤ <noise> 今天 天气 一二三 안녕하세요 สวัสดี ๑๒๓ xin chào",
+)
+
+
+def available_languages() -> list[str]:
+    """
+    language 目录下全部三字母语言代码
+    """
+    import language
+
+    return sorted(
+        info.name
+        for info in pkgutil.iter_modules(language.__path__)
+        if len(info.name) == 3 and info.name.isupper()
+    )
+
+
+def _rss_bytes() -> int | None:
+    """
+    当前进程常驻内存（字节）；不支持的平台返回 None
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss 为峰值：Linux 单位 KB，macOS 单位字节
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def warmup(
+    languages: Iterable[str] | None = None,
+    datasets: Iterable[str | None] = (None,),
+    calibration: Iterable[str] = CALIBRATION_TEXTS,
+    freeze: bool = True,
+) -> dict:
+    """
+    预热指定的 (language, dataset) 组合
+
+    参数：
+        languages: 语言代码列表；None 表示全部语言（缺少依赖的语言记录在 errors 中并跳过）
+        datasets: 数据集列表，None 元素表示不使用数据集
+        calibration: 校准文本
+        freeze (bool): 完成后执行 gc.freeze()
+
+    返回：
+        dict:
+            combos        成功预热的组合 [(language, dataset), ...]
+            errors        {"LANG/dataset": "异常类型: 信息"}（仅 languages=None 时收集）
+            seconds       预热耗时
+            rss_before / rss_after  预热前后 RSS（字节，平台不支持时为 None）
+            shared_bytes  RSS 增量：fork 后每个 worker 共享而无需自建的内存（估算）
+            frozen        gc.freeze() 后永久代中的对象数
+
+    异常：
+        显式指定 languages 时，任一组合加载失败（如缺少依赖）直接抛出
+    """
+    strict = languages is not None
+    languages = list(languages) if languages is not None else available_languages()
+    datasets = list(datasets)
+    calibration = list(calibration)
+
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+
+    combos = []
+    errors = {}
+    for language in languages:
+        for dataset in datasets:
+            try:
+                normalizer = get_normalizer(language, dataset)
+                normalizer.load()
+                for text in calibration:
+                    try:
+                        normalizer._run(text)
+                    except Exception:
+                        # 校准只为触发首次调用开销，个别规则对校准文本报错不影响预热
+                        pass
+                normalizer.fingerprint()
+            except Exception as e:
+                if strict:
+                    raise
+                errors[f"{language}/{dataset}"] = f"{type(e).__name__}: {e}"
+                continue
+            combos.append(normalizer.key)
+
+    gc.collect()
+    if freeze:
+        gc.freeze()
+
+    rss_after = _rss_bytes()
+    shared = (
+        rss_after - rss_before
+        if rss_before is not None and rss_after is not None
+        else None
+    )
+
+    return {
+        "combos": combos,
+        "errors": errors,
+        "seconds": time.perf_counter() - started,
+        "rss_before": rss_before,
+        "rss_after": rss_after,
+        "shared_bytes": shared,
+        "frozen": gc.get_freeze_count(),
+    }
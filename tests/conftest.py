@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+tests 共用的 fixture
+"""
+
+import os
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def crashing_language():
+    """
+    临时注入 language.CRASH：含 "CRASH" 的文本使 worker 进程直接退出（模拟 OOM / 段错误）
+
+    进程池以 fork 启动，子进程继承注入的模块；前后各关闭一次常驻进程池
+    """
+    import multiprocessing
+    import types
+
+    from main import clear_registry
+    from runtime.pool import shutdown_pool
+
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("需要 fork 启动方式")
+
+    def normalize(text):
+        if "CRASH" in text:
+            os._exit(1)
+        return text.upper()
+
+    module = types.ModuleType("language.CRASH")
+    module.normalize = normalize
+    # 指纹按模块源码计算（normalize_manifest 的分组统计会用到）
+    module.__file__ = __file__
+    shutdown_pool()
+    sys.modules["language.CRASH"] = module
+    yield "CRASH"
+    shutdown_pool()
+    del sys.modules["language.CRASH"]
+    clear_registry()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio 流式接口（runtime/aio.py）：顺序、部分块与失败行
+
+运行：python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.aio import anormalize_stream
+
+
+TEXTS = build_corpus("USA", "magicdata", size=50) + ["", "   "]
+
+
+async def _slow_source(texts, pause_every=7, pause=0.02):
+    # 来源间歇停顿：部分块在 max_delay 到期后提交
+    for index, text in enumerate(texts):
+        if index and index % pause_every == 0:
+            await asyncio.sleep(pause)
+        yield text
+
+
+def _collect(source, **options):
+    async def run():
+        return [output async for output in anormalize_stream(source, "USA", "magicdata", **options)]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_async_source_matches_normalizer(backend):
+    normalizer = get_normalizer("USA", "magicdata")
+
+    outputs = _collect(
+        _slow_source(TEXTS), jobs=2, chunksize=10, max_delay=0.005, backend=backend,
+    )
+    assert outputs == [normalizer(text) for text in TEXTS]
+
+
+def test_sync_source_records_failures():
+    normalizer = get_normalizer("USA", "magicdata")
+    texts = TEXTS[:12] + [None] + TEXTS[12:20] + [123]
+    failures = {}
+
+    outputs = _collect(texts, jobs=2, chunksize=5, failures=failures)
+
+    assert sorted(failures) == [12, 21]
+    assert outputs == [None if i in failures else normalizer(t) for i, t in enumerate(texts)]
+
+
+def test_errors_raise_and_source_exception():
+    with pytest.raises(RuntimeError, match="第 3 行"):
+        _collect(["a", "b", "c", None], jobs=1, errors="raise")
+
+    async def broken():
+        yield "hello"
+        raise ValueError("source failed")
+
+    with pytest.raises(ValueError, match="source failed"):
+        _collect(broken(), jobs=1)
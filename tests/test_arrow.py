@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Arrow / Parquet 列式规范化（runtime/arrow.py，需要 pyarrow）
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.arrow import normalize_array, normalize_parquet
+
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _values():
+    # 重复文本、null、空串与纯空白
+    texts = build_corpus("USA", "magicdata", size=20)
+    return texts + [None, "", "   ", None] + texts[:5]
+
+
+def _expected(values):
+    normalizer = get_normalizer("USA", "magicdata")
+    return [None if value is None else normalizer(value) for value in values]
+
+
+@pytest.mark.parametrize("type_", [pa.string(), pa.large_string()])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_string_column_with_nulls(type_, jobs):
+    values = _values()
+    column = pa.array(values, type=type_)
+
+    result = normalize_array(column, "USA", "magicdata", jobs=jobs, chunksize=4)
+
+    assert result.type == type_
+    assert result.to_pylist() == _expected(values)
+    assert result.null_count == 2
+
+
+def test_dictionary_column_keeps_indices():
+    values = _values()
+    column = pa.array(values).dictionary_encode()
+
+    result = normalize_array(column, "USA", "magicdata")
+
+    assert pa.types.is_dictionary(result.type)
+    assert result.indices.equals(column.indices)
+    assert result.to_pylist() == _expected(values)
+
+
+def test_chunked_and_non_string_columns():
+    values = _values()
+    chunked = pa.chunked_array([values[:10], values[10:]])
+    assert normalize_array(chunked, "USA", "magicdata").to_pylist() == _expected(values)
+
+    with pytest.raises(TypeError):
+        normalize_array(pa.array([1, 2, 3]), "USA")
+
+
+def test_parquet_roundtrip(tmp_path):
+    values = _values()
+    source = str(tmp_path / "in.parquet")
+    destination = str(tmp_path / "out.parquet")
+    pq.write_table(pa.table({"id": list(range(len(values))), "text": values}), source)
+
+    report = normalize_parquet(
+        source, destination, "text", "USA", "magicdata",
+        output_column="norm", batch_size=7, jobs=2,
+    )
+
+    table = pq.read_table(destination)
+    assert table.column_names == ["id", "text", "norm"]
+    assert table.column("text").to_pylist() == values
+    assert table.column("norm").to_pylist() == _expected(values)
+    assert report["rows"] == len(values)
+    assert report["batches"] == -(-len(values) // 7)
+    assert report["failed"] == 0
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+单条时间预算（runtime/budget.py）
+
+运行：python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from main import final_clean, get_normalizer
+from runtime.budget import Degraded
+from runtime.cache import MISSING
+from runtime.diskcache import DiskCache
+from runtime.pool import normalize_batch
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 未闭合的方括号：ARE 的 SQUARE_TAG_PATTERN 对其为平方级回溯（见 benchmark/redos.py）
+PATHOLOGICAL = "[" * 30000 + " مرحبا"
+
+
+@pytest.fixture
+def are():
+    normalizer = get_normalizer("ARE")
+    yield normalizer
+    normalizer.set_budget(None)
+    normalizer.set_cache(False)
+
+
+def _run_cold(code: str, budget: float) -> dict:
+    """
+    在新进程中执行 code（冷启动：规则模块与第三方库均未加载），返回其打印的 JSON
+    """
+    env = dict(os.environ, TEXTNORM_BUDGET=str(budget))
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_timeout_falls_back_to_final_clean(are):
+    are.set_budget(0.05)
+    output = are(PATHOLOGICAL)
+
+    assert type(output) is Degraded
+    assert output == final_clean(PATHOLOGICAL)
+    stats = are.budget_stats()
+    assert stats["timeouts"] == 1
+    assert stats["samples"][0]["chars"] == len(PATHOLOGICAL)
+
+    # 普通文本不受影响
+    assert type(are("مرحبا بكم")) is str
+
+
+def test_lru_cache_skips_degraded(are):
+    are.set_cache(100)
+    are.set_budget(0.05)
+
+    assert type(are(PATHOLOGICAL)) is Degraded
+    assert are.cache.get(PATHOLOGICAL) is MISSING
+
+    normal = are("مرحبا بكم")
+    assert are.cache.get("مرحبا بكم") == normal
+
+
+def test_disk_cache_skips_degraded(are, tmp_path):
+    are.set_budget(0.05)
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    texts = [PATHOLOGICAL, "مرحبا بكم"]
+
+    result = normalize_batch(texts, "ARE", jobs=1, disk_cache=cache)
+    assert type(result[0]) is Degraded
+
+    stored = cache.get_many(result.fingerprint, texts)
+    assert stored[0] is None
+    assert stored[1] == result[1]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_cold_pipeline_is_not_degraded(jobs):
+    """
+    延迟加载（VNM 导入 underthesea 约 0.5 秒）不计入预算
+    """
+    pytest.importorskip("underthesea")
+    pytest.importorskip("num2words")
+
+    code = (
+        "import json\n"
+        "from main import get_normalizer, normalize_batch\n"
+        "from runtime.budget import Degraded\n"
+        f"jobs = {jobs}\n"
+        "texts = ['abc 123', 'Hôm nay trời đẹp quá'] * 4\n"
+        "if jobs == 1:\n"
+        "    outputs = [get_normalizer('VNM')(text) for text in texts]\n"
+        "else:\n"
+        "    outputs = normalize_batch(texts, 'VNM', jobs=jobs, chunksize=2)\n"
+        "print(json.dumps({'degraded': sum(isinstance(o, Degraded) for o in outputs),\n"
+        "                  'outputs': list(outputs)}))\n"
+    )
+    result = _run_cold(code, budget=0.2)
+    assert result["degraded"] == 0
+    assert None not in result["outputs"]
+
+
+def test_repeated_lookup_keeps_budget_stats(are):
+    """
+    以同样的 budget 参数重复获取 Normalizer 时沿用已有预算与计数
+    """
+    normalizer = get_normalizer("ARE", budget=0.05)
+    assert type(normalizer(PATHOLOGICAL)) is Degraded
+
+    budget = normalizer._budget
+    assert get_normalizer("ARE", budget=0.05)._budget is budget
+    assert get_normalizer("ARE").budget_stats()["timeouts"] == 1
+
+    # 不同秒数或 False 才替换
+    get_normalizer("ARE", budget=0.1)
+    assert are.budget_stats()["timeouts"] == 0
+    get_normalizer("ARE", budget=False)
+    assert are.budget_stats() == {}
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+内存输出缓存（runtime/cache.py）
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from main import Normalizer, get_normalizer
+from runtime.cache import MISSING, LRUCache
+
+
+@pytest.fixture
+def usa():
+    normalizer = get_normalizer("USA")
+    normalizer.set_cache(False)
+    yield normalizer
+    normalizer.set_cache(False)
+
+
+def test_repeated_lookup_keeps_cache(usa):
+    """
+    以同样的 cache 参数重复获取 Normalizer 时沿用已有缓存
+    """
+    text = "Hello, World! It costs 5 dollars."
+    expected = Normalizer("USA")(text)
+
+    first = get_normalizer("USA", cache=100)
+    assert first(text) == expected
+    second = get_normalizer("USA", cache=100)
+    assert second is first
+    assert second(text) == expected
+
+    stats = second.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    # 不同上限、显式实例、False 才替换缓存
+    get_normalizer("USA", cache=200)
+    assert usa.cache.maxsize == 200 and usa.cache.get(text) is MISSING
+    custom = LRUCache(maxsize=200)
+    get_normalizer("USA", cache=custom)
+    assert usa.cache is custom
+    get_normalizer("USA", cache=False)
+    assert usa.cache is None
+
+
+def test_lru_eviction_and_bytes_limit():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")  # 淘汰最久未使用的 b
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+    small = LRUCache(maxsize=100, max_bytes=1)
+    small.put("x", "y")
+    assert small.get("x") is MISSING
+
+
+def test_cached_output_matches_normalize(usa):
+    texts = ["Hello, World!", "", "Hello, World!", "3 cats & 2 dogs", "3 cats & 2 dogs"]
+    reference = Normalizer("USA")
+    usa.set_cache(10)
+    assert [usa(text) for text in texts] == [reference(text) for text in texts]
+    assert usa.cache.stats()["hits"] == 2
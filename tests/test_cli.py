@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+命令行（runtime/cli.py）
+
+运行：python -m pytest tests
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from main import get_normalizer
+from runtime.cli import normalize_stream
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINES = ["Hello, World!", "", "   ", "\t", "It costs 5 dollars."]
+
+
+def _stream(lines, fmt="txt", jobs=1):
+    source = io.BytesIO("".join(line + "\n" for line in lines).encode("utf-8"))
+    sink = io.BytesIO()
+    manifest = normalize_stream(source, sink, "USA", fmt=fmt, jobs=jobs, quiet=True)
+    return sink.getvalue().decode("utf-8").split("\n")[:-1], manifest
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_whitespace_lines_are_normalized(jobs):
+    """
+    只含空白的行与逐条调用一致（输出空串），空行原样保留
+    """
+    normalizer = get_normalizer("USA")
+    output, manifest = _stream(LINES, jobs=jobs)
+
+    assert output == [normalizer(line) for line in LINES]
+    assert output[2] == output[3] == ""
+    assert manifest["failed"] == 0
+
+
+def test_whitespace_line_without_id_is_a_parse_failure():
+    normalizer = get_normalizer("USA")
+    output, manifest = _stream(["a\tHello!", "", "  ", "b\tWorld"], fmt="tsv")
+
+    assert output == [f"a\t{normalizer('Hello!')}", "", "  ", f"b\t{normalizer('World')}"]
+    assert manifest["failed"] == 1
+    assert list(manifest["failures"]) == ["3"]
+
+
+def _run_module(module, stdin):
+    completed = subprocess.run(
+        [sys.executable, "-m", module, "-", "-l", "USA", "-j", "1", "-q"],
+        cwd=ROOT, input=stdin, capture_output=True, text=True, timeout=120, check=True,
+    )
+    return completed.stdout
+
+
+def test_python_m_main_matches_runtime_cli():
+    stdin = "".join(line + "\n" for line in LINES)
+    assert _run_module("main", stdin) == _run_module("runtime.cli", stdin)
+
+
+def test_python_m_main_loads_main_once():
+    """
+    python -m main 转交 runtime.cli 时，__main__ 不再执行 main.py 的其余部分
+    """
+    code = (
+        "import json, os, runpy, sys\n"
+        "defined = {}\n"
+        "def profile(frame, event, arg):\n"
+        "    code = frame.f_code\n"
+        "    if (event == 'return' and code.co_name == '<module>'\n"
+        "            and code.co_filename.endswith(os.sep + 'main.py')):\n"
+        "        defined[frame.f_globals['__name__']] = 'Normalizer' in frame.f_globals\n"
+        "sys.path.insert(0, os.getcwd())\n"
+        "sys.argv = ['main', '--help']\n"
+        "sys.setprofile(profile)\n"
+        "try:\n"
+        "    runpy.run_module('main', run_name='__main__', alter_sys=True)\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.setprofile(None)\n"
+        "print(json.dumps(defined))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, timeout=120, check=True,
+    )
+    defined = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert defined == {"__main__": False, "main": True}
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+去重模式（runtime/dedup.py）：结果与逐条调用一致，失败行按原行号回填
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.dedup import dedup_texts, scatter
+from runtime.pool import normalize_batch
+
+
+def _texts():
+    # 大量重复行 + 重复的非 str 输入（不参与去重，各自失败）
+    unique = build_corpus("USA", "magicdata", size=30)
+    return unique * 3 + ["", "", "ok", "ok", None, 123, None]
+
+
+@pytest.mark.parametrize(
+    "jobs, backend, mode",
+    [(1, "process", "row"), (2, "process", "row"), (2, "thread", "row"), (2, "process", "concat")],
+)
+def test_dedup_matches_serial(jobs, backend, mode):
+    texts = _texts()
+    normalizer = get_normalizer("USA", "magicdata")
+
+    result = normalize_batch(
+        texts, "USA", "magicdata", jobs=jobs, chunksize=7, backend=backend,
+        concat=mode == "concat", dedup=True,
+    )
+
+    for index, text in enumerate(texts):
+        if isinstance(text, str):
+            assert result[index] == normalizer(text)
+        else:
+            assert result[index] is None
+    assert sorted(result.failures) == [len(texts) - 3, len(texts) - 2, len(texts) - 1]
+
+    report = result.dedup
+    assert report["rows"] == len(texts)
+    assert report["unique"] == len({text for text in texts if isinstance(text, str)}) + 3
+    assert report["duplicate_ratio"] == pytest.approx(1 - report["unique"] / len(texts))
+
+
+def test_dedup_with_disk_cache(tmp_path):
+    texts = _texts()
+    plain = normalize_batch(texts, "USA", "magicdata", jobs=1)
+    cached = normalize_batch(
+        texts, "USA", "magicdata", jobs=1, dedup=True, disk_cache=str(tmp_path / "c.sqlite"),
+    )
+    assert list(cached) == list(plain)
+    assert cached.failures.keys() == plain.failures.keys()
+
+
+def test_dedup_texts_and_scatter():
+    uniques, inverse = dedup_texts(["a", "b", "a", None, None, "b"])
+    assert uniques == ["a", "b", None, None]
+    assert list(inverse) == [0, 1, 0, 2, 3, 1]
+
+    outputs, failures = scatter(["A", "B", None, None], {2: "x", 3: "y"}, inverse)
+    assert outputs == ["A", "B", "A", None, None, "B"]
+    assert failures == {3: "x", 4: "y"}
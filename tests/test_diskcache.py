@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+持久化缓存（runtime/diskcache.py）：共享实例、命中与指纹失效
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import clear_registry, get_normalizer
+from runtime.diskcache import get_disk_cache
+from runtime.pool import normalize_batch
+
+
+@pytest.fixture
+def fresh_registry():
+    clear_registry()
+    yield
+    clear_registry()
+
+
+def test_path_instances_are_shared(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite"
+    cache = get_disk_cache(str(path))
+
+    assert get_disk_cache(str(path)) is cache
+    assert get_disk_cache(path) is cache
+    monkeypatch.chdir(tmp_path)
+    assert get_disk_cache("cache.sqlite") is cache
+    assert get_disk_cache(str(tmp_path / "other.sqlite")) is not cache
+
+    monkeypatch.setenv("TEXTNORM_CACHE_DIR", str(tmp_path / "default"))
+    assert get_disk_cache(True) is get_disk_cache(True)
+    assert get_disk_cache(False) is None
+
+
+def test_cached_outputs_match_normalizer(tmp_path):
+    texts = build_corpus("USA", "magicdata", size=40) + ["", "   "]
+    normalizer = get_normalizer("USA", "magicdata")
+    expected = [normalizer(text) for text in texts]
+    path = str(tmp_path / "cache.sqlite")
+
+    first = normalize_batch(texts, "USA", "magicdata", jobs=1, disk_cache=path)
+    assert list(first) == expected
+
+    cache = get_disk_cache(path)
+    assert cache.get_many(first.fingerprint, texts) == expected
+
+    # 第二次全部命中：同样的结果，不再计算
+    again = normalize_batch(texts, "USA", "magicdata", jobs=2, disk_cache=path)
+    assert list(again) == expected
+
+
+def test_rule_change_invalidates_entries(tmp_path, monkeypatch, fresh_registry):
+    """
+    规则表变化后指纹改变，旧条目不再命中
+    """
+    import language.USA as usa
+
+    texts = ["SIL hello world", "MUSIC 3 cats"]
+    path = str(tmp_path / "cache.sqlite")
+    before = normalize_batch(texts, "USA", jobs=1, disk_cache=path)
+
+    monkeypatch.setattr(usa, "SKIP_WORDS_STRICT", usa.SKIP_WORDS_STRICT | {"EXTRA"})
+    clear_registry()
+    fingerprint = get_normalizer("USA").fingerprint()
+
+    assert fingerprint != before.fingerprint
+    assert get_disk_cache(path).get_many(fingerprint, texts) == [None, None]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+最终清理（main.final_clean）
+
+运行：python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+import pytest
+
+from main import CONCAT_SENTINEL, _final_clean_regex, final_clean, final_clean_joined
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXTS = [
+    "Hello, world!! 你好。",
+    "  a\t\tb  ",
+    "price: $5 + 3% (approx)",
+    "x\x1cy\x1f z",
+    "",
+    "¿Qué? ¡Sí!",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_regex_reference(text):
+    assert final_clean(text) == _final_clean_regex(text)
+
+
+def test_joined_matches_per_row():
+    joined = final_clean_joined(CONCAT_SENTINEL.join(TEXTS))
+    assert joined.split(CONCAT_SENTINEL) == [final_clean(text) for text in TEXTS]
+
+
+def test_import_does_not_build_table(tmp_path):
+    """
+    导入 main 不构建标点查找表、不写缓存目录；首次调用 final_clean 时才构建
+    """
+    code = (
+        "import json, os, sys\n"
+        "import main\n"
+        "before = main._PUNCT_TABLES is None, os.listdir(sys.argv[1])\n"
+        "output = main.final_clean('a, b!')\n"
+        "print(json.dumps({'lazy': before[0], 'files': before[1], 'output': output,\n"
+        "                  'built': main._PUNCT_TABLES is not None}))\n"
+    )
+    env = dict(os.environ, TEXTNORM_CACHE_DIR=str(tmp_path))
+    completed = subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120, check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result["lazy"] is True
+    assert result["files"] == []
+    assert result["output"] == "a b"
+    assert result["built"] is True
+
+
+def test_charclass_source_has_no_invalid_escapes():
+    """
+    runtime/charclass.py 的文档含 \\p{P}、\\s 等写法：须为原始字符串，
+    导入与指纹计算（ast.parse）时不产生无效转义警告
+    """
+    with open(os.path.join(ROOT, "runtime", "charclass.py"), encoding="utf-8") as f:
+        source = f.read()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compile(source, "charclass.py", "exec")
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+阶段触发条件（runtime/guards.py）：跳过的阶段必须是恒等变换
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.guards import Guard, guard_stats, reset_guard_stats
+
+
+COMBOS = [
+    ("USA", "magicdata", ()),
+    ("ARE", "dataocean", ()),
+    ("IDN", "magicdata", ("num2words",)),
+    ("PHL", None, ()),
+]
+
+EXTRA = ["", "plain words only", "[LAUGHTER] + # tag", "٣ ١٢", "(1) 2+3 http://x.com @me"]
+
+
+@pytest.mark.parametrize("language, dataset, requires", COMBOS)
+def test_guards_do_not_change_outputs(language, dataset, requires, monkeypatch):
+    for name in requires:
+        pytest.importorskip(name)
+
+    normalizer = get_normalizer(language, dataset)
+    texts = build_corpus(language, dataset, size=200) + EXTRA
+
+    reset_guard_stats()
+    guarded = [normalizer(text) for text in texts]
+    stats = normalizer.guard_stats()
+    assert any(counts["skips"] > 0 for counts in guard_stats().values())
+
+    # 所有 guard 恒为 True：每个阶段与函数都完整执行，结果必须相同
+    monkeypatch.setattr(Guard, "__call__", lambda self, text: True)
+    assert [normalizer(text) for text in texts] == guarded
+    assert stats == {} or all(counts["calls"] == len(texts) for counts in stats.values())
+
+
+def test_guard_triggers():
+    guard = Guard(chars="[#", pattern=r"\d", literals=("http",))
+
+    assert guard("a [tag]")
+    assert guard("room 7")
+    assert guard("see http x")
+    assert not guard("plain words")
+    assert (guard.calls, guard.skips) == (4, 1)
+
+    with pytest.raises(ValueError):
+        Guard()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+多语种清单规范化（runtime/manifest.py）：代价估算与输出
+
+运行：python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from main import get_normalizer, normalize_manifest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_manifest_matches_serial():
+    rows = [
+        {"language": "USA", "dataset": "magicdata", "text": "[LAUGHTER] Hello, World!"},
+        {"language": "are", "dataset": "", "text": "[LAUGHTER] أنااا ٢٠٢٤ #اه + hello"},
+        {"language": "CHN", "text": "你好，世界！"},
+        {"language": "USA", "dataset": "magicdata", "text": "Price is $20"},
+        {"text": "缺少语言字段"},
+    ] * 10
+    result = normalize_manifest(rows, jobs=2, chunksize=3)
+
+    for index, row in enumerate(rows):
+        if "language" not in row:
+            assert result[index] is None and index in result.failures
+            continue
+        normalizer = get_normalizer(row["language"], row.get("dataset") or None)
+        assert result[index] == normalizer(row["text"])
+    assert len(result.failures) == 10
+
+
+def test_worker_crash_is_contained(crashing_language):
+    """
+    worker 异常退出只影响导致退出的块，其他组与其他块正常完成，进程池随后可用
+    （代价估算在当前进程中执行前若干行，导致退出的行放在其后）
+    """
+    rows = [{"language": crashing_language, "text": f"row {i}"} for i in range(60)]
+    rows[50]["text"] = "CRASH now"
+    rows += [{"language": "USA", "text": f"Hello, row {i}!"} for i in range(30)]
+
+    result = normalize_manifest(rows, jobs=2, chunksize=5)
+
+    failed = sorted(result.failures)
+    assert 50 in failed and len(failed) <= 5
+    assert failed == list(range(failed[0], failed[0] + len(failed)))
+    assert all("BrokenProcessPool" in message for message in result.failures.values())
+    usa = get_normalizer("USA")
+    for index, row in enumerate(rows):
+        if index in result.failures:
+            continue
+        if row["language"] == "USA":
+            assert result[index] == usa(row["text"])
+        else:
+            assert result[index] == row["text"].upper()
+
+    again = normalize_manifest(rows[:40], jobs=2, chunksize=5)
+    assert not again.failures
+
+
+def test_calibration_excludes_lazy_loading():
+    """
+    冷启动时 VNM/magicdata 首次调用要导入 underthesea，代价估算不能因此被放大
+    """
+    pytest.importorskip("underthesea")
+    pytest.importorskip("num2words")
+
+    code = (
+        "import json\n"
+        "from main import normalize_manifest\n"
+        "text = 'Hôm nay trời đẹp quá, có 3 người'\n"
+        "rows = [{'language': 'VNM', 'dataset': 'magicdata', 'text': text}] * 200\n"
+        "rows += [{'language': 'VNM', 'dataset': None, 'text': text}] * 200\n"
+        "result = normalize_manifest(rows, jobs=2)\n"
+        "print(json.dumps(result.groups))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+        timeout=120, check=True,
+    )
+    cold, warm = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # 同样的文本，两组代价应在同一量级（未排除加载时相差数百倍）
+    assert cold["cost"] < warm["cost"] * 5
+    assert cold["chunks"] <= warm["chunks"] * 2
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+大文件按字节区间并行规范化（runtime/partition.py）：区间对齐到行尾，输出与流式 / 逐行一致
+
+运行：python -m pytest tests
+"""
+
+import io
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.cli import normalize_stream
+from runtime.partition import normalize_file, partition_file
+
+
+def _kaldi_lines():
+    # 多字节字符使均分点落在行中间甚至字符中间；含 CRLF、空行、纯空白行与无法解码的行
+    texts = build_corpus("ARE", "dataocean", size=60)
+    lines = [f"utt{i:03d} {text}".encode("utf-8") for i, text in enumerate(texts)]
+    lines[5] += b"\r"
+    lines[10] = b""
+    lines[11] = b"   "
+    lines[20] = b"utt020 \xff\xfe broken"
+    return texts, lines
+
+
+@pytest.fixture
+def kaldi_file(tmp_path):
+    texts, lines = _kaldi_lines()
+    path = tmp_path / "text"
+    # 最后一行没有换行符
+    path.write_bytes(b"\n".join(lines))
+    return str(path), texts, lines
+
+
+def test_partition_boundaries_fall_after_newlines(kaldi_file):
+    path, _, _ = kaldi_file
+    data = open(path, "rb").read()
+    parts = 7
+
+    # 均分点确实落在行中间，需要向后对齐
+    assert any(data[len(data) * i // parts - 1:len(data) * i // parts] != b"\n" for i in range(1, parts))
+
+    ranges = partition_file(path, parts)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1:end] == b"\n"
+
+    assert partition_file(path, 10_000)[-1][1] == len(data)
+
+
+@pytest.mark.parametrize("jobs, parts", [(1, 1), (1, 7), (2, 3), (2, 50)])
+def test_normalize_file_matches_stream_and_normalizer(kaldi_file, tmp_path, jobs, parts):
+    path, texts, lines = kaldi_file
+    output = str(tmp_path / "text.norm")
+
+    report = normalize_file(path, output, "ARE", "dataocean", fmt="kaldi", jobs=jobs, parts=parts)
+    data = open(output, "rb").read()
+
+    sink = io.BytesIO()
+    normalize_stream(
+        io.BytesIO(open(path, "rb").read()), sink, "ARE", "dataocean", fmt="kaldi", jobs=1,
+        quiet=True,
+    )
+    assert data == sink.getvalue()
+
+    normalizer = get_normalizer("ARE", "dataocean")
+    out_lines = data.decode("utf-8", "replace").split("\n")[:-1]
+    assert len(out_lines) == len(lines)
+    for index, line in enumerate(out_lines):
+        if index in (10, 11, 20):
+            continue
+        uttid = f"utt{index:03d}"
+        output_text = normalizer(texts[index])
+        assert line == (f"{uttid} {output_text}" if output_text else uttid)
+
+    # 失败行号为全文件行号（从 1 开始）：纯空白行缺少 uttid，第 21 行无法解码
+    assert report["lines"] == len(lines)
+    assert sorted(report["failures"], key=int) == ["12", "21"]
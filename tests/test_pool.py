@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+批量规范化（runtime/pool.py）：与逐条调用一致、指纹按需计算
+
+运行：python -m pytest tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark.corpora import build_corpus
+from main import get_normalizer
+from runtime.pool import normalize_batch
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMBOS = [("USA", "magicdata"), ("ARE", "dataocean"), ("CHN", None), ("PHL", None)]
+
+# 语料之外的边界输入：空串、纯空白、非 str
+EXTRA = ["", "   ", "\t\n", "[LAUGHTER]", "+ # *", None, 123]
+
+
+def _serial(normalizer, texts):
+    outputs = []
+    for text in texts:
+        try:
+            outputs.append(normalizer(text))
+        except Exception:
+            outputs.append(None)
+    return outputs
+
+
+@pytest.mark.parametrize("language, dataset", COMBOS)
+@pytest.mark.parametrize("backend", ["process", "thread"])
+@pytest.mark.parametrize("mode", ["row", "concat", "vectorize"])
+def test_batch_matches_serial(language, dataset, backend, mode):
+    if mode == "vectorize":
+        pytest.importorskip("numpy")
+
+    texts = build_corpus(language, dataset, size=60) + EXTRA
+    expected = _serial(get_normalizer(language, dataset), texts)
+
+    result = normalize_batch(
+        texts, language, dataset, jobs=2, chunksize=7, backend=backend,
+        concat=mode == "concat", vectorize=mode == "vectorize",
+    )
+    assert list(result) == expected
+    # 只有非 str 输入失败
+    assert sorted(result.failures) == [len(texts) - 2, len(texts) - 1]
+
+
+def test_fingerprint_is_lazy_without_disk_cache(tmp_path):
+    """
+    不用磁盘缓存时指纹在首次访问 BatchResult.fingerprint 时才计算
+    """
+    texts = build_corpus("USA", "magicdata", size=20)
+    result = normalize_batch(texts, "USA", "magicdata", jobs=1)
+    assert result._fingerprint is None
+    assert result.fingerprint == get_normalizer("USA", "magicdata").fingerprint()
+
+    cached = normalize_batch(
+        texts, "USA", "magicdata", jobs=1, disk_cache=str(tmp_path / "cache.sqlite"),
+    )
+    assert cached.fingerprint == get_normalizer("USA", "magicdata").fingerprint()
+    assert list(cached) == list(result)
+
+
+@pytest.mark.parametrize("language", ["MAR", "ARE", "IDN", "PHL"])
+def test_fingerprint_covers_runtime_imports(language):
+    """
+    阶段模块依赖的 runtime 模块（guards、tables 等）都计入指纹
+    """
+    try:
+        normalizer = get_normalizer(language)
+    except ImportError as exc:
+        pytest.skip(str(exc))
+
+    sources = set(normalizer._source_modules())
+    for stage in normalizer.stages:
+        if stage.name == "final_clean":
+            continue
+        for value in vars(sys.modules[stage.name]).values():
+            module = getattr(value, "__module__", None)
+            if isinstance(module, str) and module.startswith("runtime."):
+                assert module in sources, f"{stage.name} 依赖 {module}"
+
+
+def test_batch_without_disk_cache_skips_fingerprint_imports():
+    """
+    不用磁盘缓存时主进程不为计算指纹导入 underthesea
+    """
+    pytest.importorskip("underthesea")
+
+    code = (
+        "import sys\n"
+        "from main import normalize_batch\n"
+        "normalize_batch([], 'VNM')\n"
+        "print('underthesea' in sys.modules)\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert completed.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_concurrent_callers_with_different_jobs():
+    """
+    不同 jobs 的调用方并发使用常驻进程池：替换进程池不能取消另一方在途的任务
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = build_corpus("USA", "magicdata", size=400)
+    expected = _serial(get_normalizer("USA", "magicdata"), texts)
+
+    def run(jobs):
+        results = []
+        for _ in range(5):
+            result = normalize_batch(texts, "USA", "magicdata", jobs=jobs, chunksize=10)
+            results.append((list(result), result.failures))
+        return results
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        runs = list(executor.map(run, [2, 3]))
+
+    for results in runs:
+        for outputs, failures in results:
+            assert outputs == expected
+            assert not failures
+
+
+def test_worker_crash_is_contained(crashing_language):
+    texts = [f"row {i}" for i in range(40)]
+    texts[13] = "CRASH now"
+
+    result = normalize_batch(texts, crashing_language, jobs=2, chunksize=5)
+
+    # 只有导致退出的块（第 10–14 行）记为失败，其余块重试后正常完成
+    assert sorted(result.failures) == list(range(10, 15))
+    assert all("BrokenProcessPool" in message for message in result.failures.values())
+    assert [result[i] for i in range(40) if i not in result.failures] == [
+        texts[i].upper() for i in range(40) if i not in result.failures
+    ]
+
+    # 进程池已重建，之后的调用不受影响
+    again = normalize_batch(texts[:10], crashing_language, jobs=2, chunksize=5)
+    assert list(again) == [text.upper() for text in texts[:10]]
+    assert not again.failures
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+按文字自动路由语言（runtime/routing.py）：混合文字的判定与路由后的输出
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+import runtime.routing as routing
+from main import get_normalizer
+from runtime.routing import detect_scripts, normalize_routed, route_texts
+
+
+# (文本, 主要文字)：多数为混合文字，按字符数多者判定；假名与汉字合并比较
+MIXED = [
+    ("Hello 你好世界", "latin"),
+    ("こんにちは 世界", "kana"),
+    ("東京 タワー", "kana"),
+    ("你好 ok", "han"),  # 并列时 CJK 优先于拉丁文
+    ("Hello مرحبا بكم", "arabic"),
+    ("안녕 hi", "hangul"),
+    ("สวัสดี ครับ abc", "thai"),
+    ("123 !!! ...", None),
+    ("", None),
+    (None, None),
+]
+
+
+def test_detect_mixed_scripts():
+    texts = [text for text, _ in MIXED]
+    assert detect_scripts(texts) == [script for _, script in MIXED]
+
+
+def test_regex_fallback_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    texts = [text for text, _ in MIXED] * 3
+    vectorized = detect_scripts(texts)
+
+    monkeypatch.setattr(routing, "np", None)
+    assert detect_scripts(texts) == vectorized
+
+
+def test_route_table_and_default():
+    texts = ["مرحبا بكم", "Hello", "123"]
+    assert route_texts(texts) == ["SAU", "USA", None]
+    assert route_texts(texts, routes={"arabic": "EGY"}, default="USA") == ["EGY", "USA", "USA"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_normalize_routed_matches_normalizers(jobs):
+    texts = [text for text, _ in MIXED if text is not None] * 4
+
+    result = normalize_routed(texts, routes={"arabic": "EGY"}, jobs=jobs, chunksize=3)
+
+    languages = route_texts(texts, routes={"arabic": "EGY"})
+    for index, (text, language) in enumerate(zip(texts, languages)):
+        if language is None:
+            assert result[index] is None
+            assert index in result.failures
+        else:
+            assert result[index] == get_normalizer(language)(text)
+    assert len(result.failures) == languages.count(None)
+    assert {group["language"] for group in result.groups} == {
+        language for language in languages if language is not None
+    }
+
+    # 指定 default 后无法识别的行也被规范化
+    routed = normalize_routed(texts, default="USA", jobs=jobs)
+    assert not routed.failures
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+规范化服务（runtime/server.py）：worker 异常退出后继续服务
+
+运行：python -m pytest tests
+"""
+
+import asyncio
+import os
+import signal
+
+import pytest
+
+from main import get_normalizer
+from runtime import pool as pool_module
+from runtime.server import NormalizeServer
+
+
+TEXTS = ["Hello, World!", "[LAUGHTER] ok +", "Price is $20"]
+
+
+@pytest.fixture
+def fresh_pool():
+    pool_module.shutdown_pool()
+    yield
+    pool_module.shutdown_pool()
+
+
+def _kill_worker() -> None:
+    pool = pool_module._POOL
+    pid = next(iter(pool._processes))
+    os.kill(pid, signal.SIGKILL)
+
+
+def test_server_survives_worker_crash(fresh_pool):
+    normalizer = get_normalizer("USA", "magicdata")
+    expected = [normalizer(text) for text in TEXTS]
+
+    async def scenario():
+        server = NormalizeServer(jobs=2, max_delay=0.001)
+        await server.start(port=0)
+        try:
+            outputs, failures = await server.normalize("USA", "magicdata", TEXTS)
+            assert outputs == expected and not failures
+
+            for round_ in range(1, 3):
+                _kill_worker()
+                await asyncio.sleep(0.2)
+                outputs, failures = await server.normalize("USA", "magicdata", TEXTS)
+                assert outputs == expected and not failures
+                assert server.stats()["pool_rebuilds"] == round_
+        finally:
+            await server.shutdown(timeout=5)
+
+    asyncio.run(scenario())
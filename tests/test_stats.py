@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+阶段统计（runtime/stats.py）
+
+运行：python -m pytest tests
+"""
+
+import pytest
+
+from main import clear_registry, get_normalizer
+
+
+@pytest.mark.parametrize(
+    "language, requires, text",
+    [
+        ("IDN", ("num2words",), "Harganya Rp 50.000 dan beratnya 2.5 kg"),
+        ("VNM", ("underthesea", "num2words"), "Hôm nay có 3 người, Sale 50%"),
+    ],
+)
+def test_detail_stats_on_lazy_modules(language, requires, text):
+    """
+    detail 模式包装模块私有函数时不能破坏延迟加载（_ensure_loaded 无参数）
+    """
+    for name in requires:
+        pytest.importorskip(name)
+
+    clear_registry()
+    normalizer = get_normalizer(language)
+    expected = normalizer(text)
+
+    normalizer.enable_stats(detail=True)
+    try:
+        assert normalizer(text) == expected
+        stats = normalizer.stats()
+    finally:
+        normalizer.disable_stats()
+
+    assert stats[f"language.{language}"]["calls"] == 1
+    assert f"language.{language}._ensure_loaded" not in stats
+    assert any(name.startswith(f"language.{language}._") for name in stats)
+    # 关闭后模块函数全部还原
+    assert normalizer(text) == expected
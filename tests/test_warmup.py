@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+预热（runtime/warmup.py）：预热后的结果与未预热时一致，fork 出的 worker 沿用已加载的流水线
+
+运行：python -m pytest tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from main import get_normalizer
+from runtime.warmup import available_languages, warmup
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXTS = [
+    "Hello world 123 [LAUGHTER] + #erm",
+    "Price is $20, see https://example.com",
+    "",
+    "   ",
+]
+
+
+def test_warmup_then_batch_matches_cold_normalizer():
+    """
+    新进程中预热（含 gc.freeze）后批量执行；结果与本进程中逐条调用一致
+    """
+    code = (
+        "import json, sys\n"
+        "from main import normalize_batch, warmup\n"
+        "texts = json.loads(sys.argv[1])\n"
+        "report = warmup(['USA', 'PHL'], [None, 'magicdata'])\n"
+        "outputs = {f'{l}/{d}': list(normalize_batch(texts, l, d, jobs=2, chunksize=1))\n"
+        "           for l, d in report['combos']}\n"
+        "print(json.dumps({'combos': report['combos'], 'frozen': report['frozen'],\n"
+        "                  'outputs': outputs}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code, json.dumps(TEXTS)],
+        cwd=ROOT, capture_output=True, text=True, timeout=120, check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert [tuple(combo) for combo in result["combos"]] == [
+        ("USA", None), ("USA", "magicdata"), ("PHL", None), ("PHL", "magicdata"),
+    ]
+    assert result["frozen"] > 0
+    for combo, outputs in result["outputs"].items():
+        language, dataset = combo.split("/")
+        normalizer = get_normalizer(language, None if dataset == "None" else dataset)
+        assert outputs == [normalizer(text) for text in TEXTS]
+
+
+def test_warmup_errors():
+    # 显式指定的语言加载失败时直接抛出
+    with pytest.raises(ImportError):
+        warmup(["XXX"], freeze=False)
+
+    report = warmup(["USA"], ["magicdata"], freeze=False)
+    assert report["combos"] == [("USA", "magicdata")]
+    assert report["errors"] == {}
+    assert "USA" in available_languages()